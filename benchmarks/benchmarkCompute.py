@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarkCompute
+
+standalone benchmark runner timing all compute* entry points on deterministic synthetic audio;
+results can be stored as JSON baseline and compared with a previous run
+
+  usage:
+      python benchmarks/benchmarkCompute.py --save baseline.json
+      python benchmarks/benchmarkCompute.py --compare baseline.json
+      python benchmarks/benchmarkCompute.py --filter "computeFeature/Spectral.*" --durations 1 --samplerates 22050
+"""
+
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# run against the working tree rather than an installed package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pyACA
+
+
+# supported pitch trackers and novelty functions (see computePitch and computeNoveltyFunction)
+cPitchTrackers = ['SpectralAcf', 'SpectralHps', 'TimeAcf', 'TimeAmdf', 'TimeAuditory', 'TimeZeroCrossings']
+cNoveltyNames = ['Flux', 'Hainsworth', 'Laroche']
+
+
+## generates a deterministic test signal: a sequence of decaying harmonic chords with some noise
+#
+#    @param fDuration: length in seconds
+#    @param f_s: sample rate
+#
+#    @return x: audio signal
+def generateSignal(fDuration, f_s):
+
+    rng = np.random.default_rng(42)
+
+    iNumSamples = int(fDuration * f_s)
+    iNoteLength = int(0.5 * f_s)
+    afRoots = 220 * 2**(np.array([0, 5, 7, 0, 9, 2]) / 12)
+
+    t = np.arange(0, iNoteLength) / f_s
+    afEnv = np.exp(-3 * t)
+
+    x = np.zeros(iNumSamples)
+    for n, i_start in enumerate(range(0, iNumSamples, iNoteLength)):
+        i_stop = min(iNumSamples, i_start + iNoteLength)
+        fRoot = afRoots[n % afRoots.size]
+
+        # major triad with three harmonics per tone
+        afNote = np.zeros(iNoteLength)
+        for fInterval in [1, 2**(4 / 12), 2**(7 / 12)]:
+            for k in range(1, 4):
+                afNote += np.sin(2 * np.pi * k * fRoot * fInterval * t) / k
+        x[i_start:i_stop] = (afEnv * afNote)[:i_stop - i_start]
+
+    x += 0.01 * rng.standard_normal(iNumSamples)
+
+    return x / np.max(np.abs(x))
+
+
+## returns a dict of all benchmark cases as name: function(x, f_s)
+def getCases():
+
+    cases = dict()
+    cases["computeSpectrogram"] = lambda x, f_s: pyACA.computeSpectrogram(x, f_s)
+    cases["computeMelSpectrogram"] = lambda x, f_s: pyACA.computeMelSpectrogram(x, f_s)
+    for cName in pyACA.getFeatureList('all'):
+        cases["computeFeature/" + cName] = lambda x, f_s, cName=cName: pyACA.computeFeature(cName, x, f_s)
+    for cName in cPitchTrackers:
+        cases["computePitch/" + cName] = lambda x, f_s, cName=cName: pyACA.computePitch(cName, x, f_s)
+    for cName in cNoveltyNames:
+        cases["computeNoveltyFunction/" + cName] = lambda x, f_s, cName=cName: pyACA.computeNoveltyFunction(cName, x, f_s)
+    cases["computeBeatHisto"] = lambda x, f_s: pyACA.computeBeatHisto(x, f_s)
+    cases["computeKey"] = lambda x, f_s: pyACA.computeKey(x, f_s)
+    cases["computeChords"] = lambda x, f_s: pyACA.computeChords(x, f_s)
+    cases["computeFingerprint"] = lambda x, f_s: pyACA.computeFingerprint(x, f_s)
+
+    return cases
+
+
+## times a function call, the minimum over several runs after one warm-up run
+#
+#    @param hFunc: function without arguments
+#    @param iNumRepetitions: number of timed runs
+#
+#    @return fTime: minimum run time in seconds
+def timeCase(hFunc, iNumRepetitions):
+
+    hFunc()
+
+    fTime = np.inf
+    for _ in range(0, iNumRepetitions):
+        fStart = time.perf_counter()
+        hFunc()
+        fTime = min(fTime, time.perf_counter() - fStart)
+
+    return fTime
+
+
+## times `import pyACA` in a fresh interpreter, the minimum over several runs
+#
+#    @param iNumRepetitions: number of timed runs
+#
+#    @return fTime: minimum import time in seconds
+def timeImport(iNumRepetitions):
+
+    cRoot = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    cScript = "import time; fStart = time.perf_counter(); import pyACA; print(time.perf_counter() - fStart)"
+
+    fTime = np.inf
+    for _ in range(0, iNumRepetitions):
+        cOutput = subprocess.run([sys.executable, "-c", cScript], cwd=cRoot, capture_output=True, text=True, check=True).stdout
+        fTime = min(fTime, float(cOutput))
+
+    return fTime
+
+
+## runs all benchmark cases matching a regular expression for all durations and sample rates
+#
+#    @param afDurations: list of signal lengths in seconds
+#    @param aiSampleRates: list of sample rates
+#    @param iNumRepetitions: number of timed runs per case
+#    @param cFilter: regular expression selecting the cases (default: None, all cases)
+#
+#    @return dict with meta data and results as name: time in seconds
+def runBenchmarks(afDurations, aiSampleRates, iNumRepetitions=3, cFilter=None):
+
+    import scipy
+
+    cases = getCases()
+    results = dict()
+
+    if not cFilter or re.search(cFilter, "importPyACA"):
+        results["importPyACA"] = timeImport(iNumRepetitions)
+        print("%-60s %10.4f s" % ("importPyACA", results["importPyACA"]))
+
+    for f_s in aiSampleRates:
+        for fDuration in afDurations:
+            x = generateSignal(fDuration, f_s)
+
+            for cName, hFunc in cases.items():
+                if cFilter and not re.search(cFilter, cName):
+                    continue
+
+                cKey = "%s/%dHz/%gs" % (cName, f_s, fDuration)
+                results[cKey] = timeCase(lambda: hFunc(x, f_s), iNumRepetitions)
+                print("%-60s %10.4f s" % (cKey, results[cKey]))
+
+    meta = {"date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "repetitions": iNumRepetitions}
+
+    return {"meta": meta, "results": results}
+
+
+## prints a comparison of two benchmark runs
+#
+#    @param baseline: previous run as returned by runBenchmarks
+#    @param current: current run as returned by runBenchmarks
+#    @param fThreshold: relative change reported as regression or improvement (default: 0.1)
+#
+#    @return iNumRegressions: number of cases slower than the threshold
+def compareBenchmarks(baseline, current, fThreshold=0.1):
+
+    iNumRegressions = 0
+
+    print("\n%-60s %10s %10s %8s" % ("case", "baseline", "current", "ratio"))
+    for cKey, fTime in current["results"].items():
+        if cKey not in baseline["results"]:
+            print("%-60s %10s %10.4f %8s" % (cKey, "-", fTime, "new"))
+            continue
+
+        fRatio = fTime / baseline["results"][cKey]
+        cLabel = ""
+        if fRatio > 1 + fThreshold:
+            cLabel = "  slower"
+            iNumRegressions += 1
+        elif fRatio < 1 - fThreshold:
+            cLabel = "  faster"
+
+        print("%-60s %10.4f %10.4f %8.2f%s" % (cKey, baseline["results"][cKey], fTime, fRatio, cLabel))
+
+    print("\n%d of %d cases slower by more than %d%%" % (iNumRegressions, len(current["results"]), 100 * fThreshold))
+
+    return iNumRegressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # add command line args and parse them
+    parser = argparse.ArgumentParser(description='Benchmark the pyACA compute functions')
+    parser.add_argument('--durations', metavar='float', type=float, nargs='+', default=[1, 10],
+                        help='signal lengths in seconds')
+    parser.add_argument('--samplerates', metavar='int', type=int, nargs='+', default=[22050, 44100],
+                        help='sample rates in Hz')
+    parser.add_argument('--repetitions', metavar='int', type=int, default=3,
+                        help='number of timed runs per case')
+    parser.add_argument('--filter', metavar='regex', required=False,
+                        help='only run cases matching the regular expression')
+    parser.add_argument('--save', metavar='path', required=False,
+                        help='store the results as JSON')
+    parser.add_argument('--compare', metavar='path', required=False,
+                        help='JSON file of a previous run to compare with')
+    parser.add_argument('--threshold', metavar='float', type=float, default=0.1,
+                        help='relative change reported as regression')
+
+    # retrieve command line args
+    args = parser.parse_args()
+
+    current = runBenchmarks(args.durations, args.samplerates, args.repetitions, args.filter)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        sys.exit(1 if compareBenchmarks(baseline, current, args.threshold) else 0)
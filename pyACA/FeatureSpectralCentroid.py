@@ -1,29 +1,16 @@
 # -*- coding: utf-8 -*-
 
-import numpy as np
+from pyACA.ToolSpectralMoments import ToolSpectralMoments
 
 
 ## computes the spectral centroid from the (squared) magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vsc: spectral centroid (in Hz)
 def FeatureSpectralCentroid(X, f_s):
 
-    isSpectrum = X.ndim == 1
-
     # X = X**2 removed for consistency with book
 
-    norm = X.sum(axis=0, keepdims=True)
-    norm[norm == 0] = 1
-
-    vsc = np.dot(np.arange(0, X.shape[0]), X) / norm
-
-    # convert from index to Hz
-    vsc = vsc / (X.shape[0] - 1) * f_s / 2
-
-    # if input is a spectrum, output scaler else if spectrogram, output 1d array
-    vsc = np.squeeze(vsc) if isSpectrum else np.squeeze(vsc, axis=0)
-
-    return vsc
+    return ToolSpectralMoments(X, f_s, "SpectralCentroid")
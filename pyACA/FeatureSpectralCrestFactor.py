@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the spectral crest from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vtsc: spectral crest
+@ToolMultiChannelSpectral
 def FeatureSpectralCrestFactor(X, f_s):
 
     norm = X.sum(axis=0, keepdims=True)
@@ -1,20 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the spectral decrease from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vsd: spectral decrease
+@ToolMultiChannelSpectral
 def FeatureSpectralDecrease(X, f_s):
 
     # compute index vector
     kinv = np.arange(0, X.shape[0])
     kinv[0] = 1
-    kinv = 1 / kinv
+    kinv = (1 / kinv).astype(np.result_type(X.dtype, np.float32))
 
     norm = X[1:].sum(axis=0, keepdims=True)
     norm[norm == 0] = 1
@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the spectral flatness from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vtf: spectral flatness
+@ToolMultiChannelSpectral
 def FeatureSpectralFlatness(X, f_s):
 
     norm = X.mean(axis=0, keepdims=True)
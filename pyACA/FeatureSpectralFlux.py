@@ -5,7 +5,7 @@ import numpy as np
 
 ## computes the spectral flux from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vsf: spectral flux
@@ -16,11 +16,11 @@ def FeatureSpectralFlux(X, f_s):
         X = np.expand_dims(X, axis=1)
 
     # difference spectrum (set first diff to zero)
-    X = np.c_[X[:, 0], X]
+    X = np.concatenate((X[..., :1], X), axis=-1)
 
-    afDeltaX = np.diff(X, 1, axis=1)
+    afDeltaX = np.diff(X, 1, axis=-1)
 
-    # flux
-    vsf = np.sqrt((afDeltaX**2).sum(axis=0)) / X.shape[0]
+    # flux (per channel for multi-channel spectrograms)
+    vsf = np.sqrt((afDeltaX**2).sum(axis=-2)) / X.shape[-2]
 
     return np.squeeze(vsf) if isSpectrum else vsf
@@ -2,39 +2,51 @@
 
 import numpy as np
 from .ToolMfccFb import ToolMfccFb
+from pyACA.ToolAllocOutput import ToolGetChunkLength
+from pyACA.ToolCache import ToolCache
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the MFCCs from the magnitude spectrum (see Slaney)
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #    @param iNumCoeffs: number of coefficients to compute (default: 13)
+#    @param fLogFloor: offset added to the mel spectrum before the logarithm (default: 1e-20)
+#    @param H: filterbank (dimension Bands X FFTLength), dense or sparse (default: None, ToolMfccFb)
 #
 #    @return v_mfcc: mel frequency cepstral coefficients
-def FeatureSpectralMfccs(X, f_s, iNumCoeffs=13):
+@ToolMultiChannelSpectral
+def FeatureSpectralMfccs(X, f_s, iNumCoeffs=13, fLogFloor=1e-20, H=None):
 
     isSpectrum = X.ndim == 1
     if isSpectrum:
         X = np.expand_dims(X, axis=1)
 
     # allocate memory
-    v_mfcc = np.zeros([iNumCoeffs, X.shape[1]])
+    v_mfcc = np.zeros([iNumCoeffs, X.shape[1]], dtype=np.result_type(X.dtype, np.float32))
 
     # generate filter matrix
-    H = ToolMfccFb(X.shape[0], f_s)
+    if H is None:
+        H = ToolMfccFb(X.shape[0], f_s, True)
     T = generateDctMatrix(H.shape[0], iNumCoeffs)
 
-    for n in range(0, X.shape[1]):
+    # process the observations in chunks to bound the size of the mel spectrum
+    iNumObsPerChunk = ToolGetChunkLength(X.shape[0])
+    for n in range(0, X.shape[1], iNumObsPerChunk):
         # compute the mel spectrum
-        X_Mel = np.log10(np.dot(H, X[:, n]) + 1e-20)
+        X_Mel = np.asarray(H @ X[:, n:n + iNumObsPerChunk])
+        X_Mel += fLogFloor
+        np.log10(X_Mel, out=X_Mel)
 
         # calculate the mfccs
-        v_mfcc[:, n] = np.dot(T, X_Mel)
+        v_mfcc[:, n:n + iNumObsPerChunk] = T @ X_Mel
 
     return np.squeeze(v_mfcc) if isSpectrum else v_mfcc
 
 
 # see function mfcc.m from Slaneys Auditory Toolbox
+@ToolCache()
 def generateDctMatrix(iNumBands, iNumCepstralCoeffs):
     T = np.cos(np.outer(np.arange(0, iNumCepstralCoeffs), (2 * np.arange(0, iNumBands) + 1)) * np.pi / 2 / iNumBands)
 
@@ -13,24 +13,28 @@ computes the pitch chroma from the magnitude spectrum
 import numpy as np
 import math
 
+from pyACA.ToolCache import ToolCache
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
+
 
 ## computes the pitch chroma from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return v_pc: pitch chroma
+@ToolMultiChannelSpectral
 def FeatureSpectralPitchChroma(X, f_s):
 
     isSpectrum = X.ndim == 1
     if isSpectrum:
         X = np.expand_dims(X, axis=1)
 
-    # generate filter matrix
-    H = generatePcFilters(X.shape[0], f_s)
+    # generate filter matrix (sparse)
+    H = generatePcFilters(X.shape[0], f_s, True)
 
     # compute pitch chroma
-    v_pc = np.dot(H, X**2)
+    v_pc = (H @ X**2).astype(np.result_type(X.dtype, np.float32), copy=False)
 
     # norm pitch chroma to a sum of 1 but avoid div by zero
     norm = v_pc.sum(axis=0, keepdims=True)
@@ -40,7 +44,9 @@ def FeatureSpectralPitchChroma(X, f_s):
     return np.squeeze(v_pc) if isSpectrum else v_pc
 
 
-def generatePcFilters(iSpecLength, f_s):
+@ToolCache()
+def generatePcFilters(iSpecLength, f_s, bSparse=False):
+    from scipy.sparse import csr_matrix
 
     # initialization at C4
     f_mid = 261.63
@@ -63,4 +69,7 @@ def generatePcFilters(iSpecLength, f_s):
         # increment to next semi-tone
         f_mid = f_mid * 2**(1 / iNumPitchesPerOctave)
 
+    if bSparse:
+        H = csr_matrix(H)
+
     return H
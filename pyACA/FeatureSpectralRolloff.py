@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the spectral rolloff from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #    @param kappa: cutoff ratio (default: 0.85)
 #
 #    @return vsr: spectral rolloff (in Hz)
+@ToolMultiChannelSpectral
 def FeatureSpectralRolloff(X, f_s, kappa=0.85):
 
     norm = X.sum(axis=0, keepdims=True)
@@ -20,6 +22,6 @@ def FeatureSpectralRolloff(X, f_s, kappa=0.85):
     vsr = np.argmax(X >= kappa, axis=0)
 
     # convert from index to Hz
-    vsr = vsr / (X.shape[0] - 1) * f_s / 2
+    vsr = (vsr / (X.shape[0] - 1) * f_s / 2).astype(X.dtype)
 
     return vsr
@@ -2,21 +2,23 @@
 
 import numpy as np
 from .FeatureSpectralCentroid import FeatureSpectralCentroid
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
 
 
 ## computes the spectral slope from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vssl: spectral slope
+@ToolMultiChannelSpectral
 def FeatureSpectralSlope(X, f_s):
 
     # compute mean
     vsc = FeatureSpectralCentroid(X, f_s) * 2 / f_s * (X.shape[0] - 1)
 
     # compute index vector
-    kmu = np.arange(0, X.shape[0]) - (X.shape[0]+1) / 2
+    kmu = (np.arange(0, X.shape[0]) - (X.shape[0]+1) / 2).astype(vsc.dtype)
 
     # compute slope
     X = X - vsc
@@ -1,38 +1,16 @@
 # -*- coding: utf-8 -*-
 
-import numpy as np
-from .FeatureSpectralCentroid import FeatureSpectralCentroid
+from pyACA.ToolSpectralMoments import ToolSpectralMoments
 
 
 ## computes the spectral spread from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #
 #    @return vss: spectral spread
 def FeatureSpectralSpread(X, f_s):
 
-    isSpectrum = X.ndim == 1
-    if isSpectrum:
-        X = np.expand_dims(X, axis=1)
-
-    # get spectral centroid as index
-    vsc = FeatureSpectralCentroid(X, f_s) * 2 / f_s * (X.shape[0] - 1)
-
     # X = X**2 removed for consistency with book
 
-    norm = X.sum(axis=0)
-    norm[norm == 0] = 1
-
-    # compute spread
-    vss = np.zeros(X.shape[1])
-    indices = np.arange(0, X.shape[0])
-    for n in range(0, X.shape[1]):
-        vss[n] = np.dot((indices - vsc[n])**2, X[:, n]) / norm[n]
-
-    vss = np.sqrt(vss)
-
-    # convert from index to Hz
-    vss = vss / (X.shape[0] - 1) * f_s / 2
-
-    return np.squeeze(vss) if isSpectrum else vss
+    return ToolSpectralMoments(X, f_s, "SpectralSpread")
@@ -1,16 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from scipy.signal import find_peaks
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
+from pyACA.ToolPeakMask import ToolPeakMask
 
 
 ## computes the tonal power ratio from the magnitude spectrum
 #
-#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param X: spectrogram (dimension FFTLength X Observations, or Channels X FFTLength X Observations)
 #    @param f_s: sample rate of audio data
 #    @param G_T: energy threshold
 #
 #    @return vtpr: tonal power ratio
+@ToolMultiChannelSpectral
 def FeatureSpectralTonalPowerRatio(X, f_s, G_T=5e-4):
 
     isSpectrum = X.ndim == 1
@@ -20,19 +22,13 @@ def FeatureSpectralTonalPowerRatio(X, f_s, G_T=5e-4):
     X = X**2
 
     fSum = X.sum(axis=0)
-    vtpr = np.zeros(fSum.shape)
+    vtpr = np.zeros(fSum.shape, dtype=np.result_type(fSum.dtype, np.float32))
 
-    for n in range(0, X.shape[1]):
-        if fSum[n] < G_T:
-            continue
+    # find local maxima above the threshold in all observations and sum their power
+    fPeakSum = np.einsum('ij,ij->j', ToolPeakMask(X, G_T), X)
 
-        # find local maxima above the threshold
-        afPeaks = find_peaks(X[:, n], height=G_T)
-
-        if not afPeaks[0].size:
-            continue
-
-        # calculate ratio
-        vtpr[n] = X[afPeaks[0], n].sum() / fSum[n]
+    # calculate ratio for observations above the threshold
+    bValid = fSum >= G_T
+    vtpr[bValid] = fPeakSum[bValid] / fSum[bValid]
 
     return np.squeeze(vtpr) if isSpectrum else vtpr
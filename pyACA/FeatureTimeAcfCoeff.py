@@ -2,6 +2,8 @@
 
 import numpy as np
 import pyACA
+from pyACA.ToolAcf import ToolAcf
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
 
 
 ## computes the ACF coefficients of a time domain signal
@@ -11,33 +13,33 @@ import pyACA
 #    @param iHopLength: hop length in samples
 #    @param f_s: sample rate of audio data
 #    @param eta: index (or vector of indices) of coeff result
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param x_b: blocks of x as returned by ToolBlockAudio, e.g. shared with other features (default: None, x is blocked here)
 #
-#    @return vacf: autocorrelation coefficient
+#    @return vacf: autocorrelation coefficient, (channels x ... x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimeAcfCoeff(x, iBlockLength, iHopLength, f_s, eta=19):
+def FeatureTimeAcfCoeff(x, iBlockLength, iHopLength, f_s, eta=19, dtype=None, x_b=None):
 
     # create blocks
-    xBlocks, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if x_b is None:
+        xBlocks, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True, dtype=dtype)
+    else:
+        xBlocks, t = x_b, ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
 
     # number of results
-    iNumOfBlocks = xBlocks.shape[0]
+    iNumOfBlocks = xBlocks.shape[-2]
     if np.isscalar(eta):
         iNumOfResultsPerBlock = 1
     else:
         iNumOfResultsPerBlock = eta.size
 
-    # allocate memory
-    vacf = np.zeros([iNumOfResultsPerBlock, iNumOfBlocks])
+    # the coefficient eta is the ACF at lag eta + 1
+    aiLags = np.abs(np.atleast_1d(eta) + 1)
 
-    for n, block in enumerate(xBlocks):
-        # calculate the acf
-        if not block.sum():
-            vacf[np.arange(0, iNumOfResultsPerBlock), n] = np.zeros(iNumOfResultsPerBlock)
-            continue
-        else:
-            afCorr = np.correlate(block, block, "full") / np.dot(block, block)
+    # calculate the acf of all blocks (of all channels) up to the largest lag, blocks with zero sum are skipped
+    afCorr = ToolAcf(xBlocks, np.max(aiLags))
+    afCorr[xBlocks.sum(axis=-1) == 0] = 0
 
-        # find the coefficients specified in eta
-        vacf[np.arange(0, iNumOfResultsPerBlock), n] = afCorr[iBlockLength + eta]
+    vacf = np.ascontiguousarray(np.moveaxis(afCorr[..., aiLags], -1, -2), dtype=xBlocks.dtype)
 
     return vacf, t
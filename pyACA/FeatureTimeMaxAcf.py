@@ -2,6 +2,8 @@
 
 import numpy as np
 import pyACA
+from pyACA.ToolAcf import ToolAcfMaxima
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
 
 
 ## finds the maximum of the ACF of an audio signal
@@ -12,40 +14,22 @@ import pyACA
 #    @param f_s: sample rate of audio data
 #    @param f_max: maximum frequency to look at (default: 2000)
 #    @param fMinThresh: minimum threshold for avoidance of main lobe (default: 0.35)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param x_b: blocks of x as returned by ToolBlockAudio, e.g. shared with other features (default: None, x is blocked here)
 #
-#    @return vta: autocorrelation maximum
+#    @return vta: autocorrelation maximum, (channels x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimeMaxAcf(x, iBlockLength, iHopLength, f_s, f_max=2000, fMinThresh=0.35):
+def FeatureTimeMaxAcf(x, iBlockLength, iHopLength, f_s, f_max=2000, fMinThresh=0.35, dtype=None, x_b=None):
 
     # create blocks
-    x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if x_b is None:
+        x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True, dtype=dtype)
+    else:
+        t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
 
-    # number of results
-    iNumOfBlocks = x_b.shape[0]
+    eta_min = np.floor(f_s / f_max).astype(int)
 
-    # allocate memory
-    vacf = np.zeros(iNumOfBlocks)
+    # maximum of the acf of each block (of all channels) after the main lobe
+    vacf, aiLag, bValid = ToolAcfMaxima(x_b, eta_min, fMinThresh)
 
-    for n, block in enumerate(x_b):
-        eta_min = np.floor(f_s / f_max).astype(int)
-
-        # calculate the acf if nonzero
-        if not block.sum():
-            continue
-        else:
-            afCorr = np.correlate(block, block, "full") / np.dot(block, block)
-
-        afCorr = afCorr[np.arange(iBlockLength, afCorr.size)]
-
-        # update eta_min to avoid main lobe
-        eta_tmp = np.argmax(afCorr < fMinThresh)
-        eta_min = np.max([eta_min, eta_tmp])
-
-        afDeltaCorr = np.diff(afCorr)
-        eta_tmp = np.argmax(afDeltaCorr > 0)
-        eta_min = np.max([eta_min, eta_tmp])
-
-        # find the coefficients specified in eta
-        vacf[n] = np.max(np.abs(afCorr[np.arange(eta_min + 1, afCorr.size)]))
-
-    return vacf, t
+    return vacf.astype(x_b.dtype, copy=False), t
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-import pyACA
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
+from pyACA.ToolBlockStatistics import ToolBlockMax
+from pyACA.ToolPeakMeter import ToolPeakMeter
+from pyACA.ToolPeakMeter import ToolPpmFilter
 
 
 ## computes the peak envelope of a time domain signal
@@ -10,33 +13,33 @@ import pyACA
 #    @param iBlockLength: block length in samples
 #    @param iHopLength: hop length in samples
 #    @param f_s: sample rate of audio data
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
 #
-#    @return vppm: peak envelope (1: max, 2: PPM)
+#    @return vppm: peak envelope (1: max, 2: PPM), (channels x 2 x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimePeakEnvelope(x, iBlockLength, iHopLength, f_s):
+def FeatureTimePeakEnvelope(x, iBlockLength, iHopLength, f_s, dtype=None):
 
-    # create blocks
-    xBlocks, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if dtype is None:
+        dtype = np.result_type(x.dtype, np.float64)
 
-    # number of results
-    iNumOfBlocks = xBlocks.shape[0]
+    # time stamps and number of results
+    t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
+    iNumOfBlocks = t.shape[0]
 
-    alpha = 1 - np.array([np.exp(-2.2 / (f_s * 0.01)), np.exp(-2.2 / (f_s * 1.5))])
+    # the signal covered by the blocks (including zero-padding), all channels with the samples along the last axis
+    afAudio = np.zeros((*x.shape[1:], (iNumOfBlocks - 1) * iHopLength + iBlockLength if iNumOfBlocks else 0), dtype=dtype)
+    iLength = min(x.shape[0], afAudio.shape[-1])
+    afAudio[..., :iLength] = np.abs(x.T[..., :iLength])
 
     # allocate memory
-    vppm = np.zeros([2, iNumOfBlocks])
-    v_tmp = np.zeros(iBlockLength)
+    vppm = np.zeros([*x.shape[1:], 2, iNumOfBlocks], dtype=dtype)
 
-    for n, block in enumerate(xBlocks):
-        x_block = np.abs(block)
+    # detect the maximum per block (all channels at once)
+    vppm[..., 0, :] = ToolBlockMax(afAudio.T, iBlockLength, iHopLength, iNumOfBlocks)
 
-        # detect the maximum per block
-        vppm[0, n] = np.max(x_block)
-
-        # calculate the PPM value - take into account block overlaps
-        # and discard concerns wrt efficiency
-        v_tmp = ppm(x_block, v_tmp[iHopLength - 1], alpha)
-        vppm[1, n] = np.max(v_tmp)
+    # calculate the PPM value once over the signal (the recursion runs per channel) and take the maximum per block
+    afPpm = ToolPeakMeter(f_s, iNumChannels=x.shape[1] if x.ndim > 1 else 1).process(afAudio.T)
+    vppm[..., 1, :] = ToolBlockMax(afPpm, iBlockLength, iHopLength, iNumOfBlocks)
 
     # convert to dB
     epsilon = 1e-5  # -100dB
@@ -49,20 +52,4 @@ def FeatureTimePeakEnvelope(x, iBlockLength, iHopLength, f_s):
 
 def ppm(x, filterbuf, alpha):
 
-    # initialization
-    ppmout = np.zeros(x.shape[0])
-
-    alpha_AT = alpha[0]
-    alpha_RT = alpha[1]
-
-    for i in range(0, x.shape[0]):
-        if filterbuf > x[i]:
-            # release state
-            ppmout[i] = (1 - alpha_RT) * filterbuf
-        else:
-            # attack state
-            ppmout[i] = alpha_AT * x[i] + (1 - alpha_AT) * filterbuf
-
-        filterbuf = ppmout[i]
-
-    return ppmout
+    return ToolPpmFilter(np.asarray(x), filterbuf, alpha)[0]
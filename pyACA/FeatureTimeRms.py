@@ -15,7 +15,9 @@ computes the RMS of a time domain signal
 """
 
 import numpy as np
-import pyACA
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
+from pyACA.ToolBlockStatistics import ToolBlockMax
+from pyACA.ToolBlockStatistics import ToolBlockSum
 
 
 ## computes the RMS of a time domain signal
@@ -24,33 +26,33 @@ import pyACA
 #    @param iBlockLength: block length in samples
 #    @param iHopLength: hop length in samples
 #    @param f_s: sample rate of audio data
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
 #
-#    @return vrms:rms value (row 1: block-based rms, row 2: single pole approx)
+#    @return vrms:rms value (row 1: block-based rms, row 2: single pole approx), (channels x 2 x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimeRms(x, iBlockLength, iHopLength, f_s):
+def FeatureTimeRms(x, iBlockLength, iHopLength, f_s, dtype=None):
 
-    T_i = .3 
-    alpha = 1 - np.exp(-2.2/f_s/T_i)
+    alpha = getAlphaSP(f_s)
 
-    # create blocks
-    x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if dtype is None:
+        dtype = np.result_type(x.dtype, np.float64)
 
-    # number of results
-    iNumOfBlocks = x_b.shape[0]
+    # time stamps and number of results
+    t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
+    iNumOfBlocks = t.shape[0]
+
+    # power of all channels with the samples along the last axis
+    afPower = np.square(np.asarray(x, dtype=dtype).T, order="C")
 
     # single pole implementation
-    v_sp = filterSP(x**2, alpha)
+    v_sp = filterSP(afPower, alpha)
 
     # allocate memory
-    vrms = np.zeros([2, iNumOfBlocks])
-
-    for n, block in enumerate(x_b):
-        i_start = n * iHopLength
-        i_stop = np.min([len(x), i_start + iBlockLength])
+    vrms = np.zeros([*x.shape[1:], 2, iNumOfBlocks], dtype=dtype)
 
-        # calculate the rms
-        vrms[0, n] = np.sqrt(np.dot(block, block) / block.size)
-        vrms[1, n] = np.max(np.sqrt(v_sp[i_start:i_stop]))
+    # calculate the rms from the energy per block (with zero-padding) and the maximum of the smoothed power, all channels at once
+    vrms[..., 0, :] = np.sqrt(ToolBlockSum(afPower.T, iBlockLength, iHopLength, iNumOfBlocks) / iBlockLength)
+    vrms[..., 1, :] = np.sqrt(ToolBlockMax(v_sp.T, iBlockLength, iHopLength, iNumOfBlocks))
 
     # convert to dB
     epsilon = 1e-5  # -100dB
@@ -61,12 +63,31 @@ def FeatureTimeRms(x, iBlockLength, iHopLength, f_s):
     return vrms, t
 
 
-def filterSP(x, alpha):
-    
-    xf = np.zeros(x.shape)
-    xf[0] = alpha * x[0]
+## coefficient of the single pole approximation of FeatureTimeRms
+#
+#    @param f_s: sample rate of audio data
+#    @param T_i: integration time in seconds (default: 0.3)
+#
+#    @return alpha: filter coefficient of filterSP
+def getAlphaSP(f_s, T_i=.3):
+    return 1 - np.exp(-2.2/f_s/T_i)
+
+
+## single pole lowpass filter y(i) = alpha * x(i) + (1 - alpha) * y(i-1)
+#
+#    @param x: input signal (dimension samples, or channels x samples)
+#    @param alpha: filter coefficient
+#    @param fState: previous output y(-1) (per channel), e.g. the last output of the previous chunk (default: 0)
+#
+#    @return xf: filtered signal
+def filterSP(x, alpha, fState=0):
+    from scipy.signal import lfilter
+
+    if x.shape[-1] == 0:
+        return np.zeros(x.shape, dtype=x.dtype)
+
+    # all channels are filtered along the sample axis
+    zi = np.broadcast_to((1 - alpha) * np.asarray(fState, dtype=float)[..., np.newaxis], (*x.shape[:-1], 1))
+    xf, zf = lfilter([alpha], [1, alpha - 1], x, axis=-1, zi=zi)
 
-    for i in range(1, len(x)):
-        xf[i] = alpha * x[i] + (1 - alpha) * xf[i-1]
-    
-    return xf
+    return xf.astype(x.dtype, copy=False)
@@ -15,7 +15,8 @@ computes the standard deviation of a time domain signal
 """
 
 import numpy as np
-import pyACA
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
+from pyACA.ToolBlockStatistics import ToolBlockStd
 
 
 ## computes the standard deviation of a time domain signal
@@ -24,22 +25,25 @@ import pyACA
 #    @param iBlockLength: block length in samples
 #    @param iHopLength: hop length in samples
 #    @param f_s: sample rate of audio data
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param x_b: blocks of x as returned by ToolBlockAudio, e.g. shared with other features (default: None, x is blocked here)
 #
-#    @return vstd: standard deviation
+#    @return vstd: standard deviation, (channels x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimeStd(x, iBlockLength, iHopLength, f_s):
+def FeatureTimeStd(x, iBlockLength, iHopLength, f_s, dtype=None, x_b=None):
 
-    # create blocks
-    xBlocks, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if dtype is None:
+        dtype = np.result_type(x.dtype if x_b is None else x_b.dtype, np.float64)
 
-    # number of results
-    iNumOfBlocks = xBlocks.shape[0]
+    # time stamps and number of results
+    t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
+    iNumOfBlocks = t.shape[0]
 
-    # allocate memory
-    vstd = np.zeros(iNumOfBlocks)
+    # standard deviation of the given blocks
+    if x_b is not None:
+        return np.std(np.asarray(x_b, dtype=dtype), axis=-1), t
 
-    for n, block in enumerate(xBlocks):
-        # calculate the rms
-        vstd[n] = np.std(block)
+    # calculate the standard deviation per block from sliding sums
+    vstd = ToolBlockStd(np.asarray(x, dtype=dtype), iBlockLength, iHopLength, iNumOfBlocks).astype(dtype, copy=False)
 
     return vstd, t
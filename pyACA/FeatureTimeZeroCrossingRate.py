@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-import pyACA
+from pyACA.ToolBlockAudio import ToolBlockTimeStamps
+from pyACA.ToolBlockStatistics import ToolBlockSum
 
 
 ## computes the zero crossing rate of a time domain signal
@@ -10,22 +11,35 @@ import pyACA
 #    @param iBlockLength: block length in samples
 #    @param iHopLength: hop length in samples
 #    @param f_s: sample rate of audio data
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param x_b: blocks of x as returned by ToolBlockAudio, e.g. shared with other features (default: None, x is blocked here)
 #
-#    @return vzc: zero crossing rate
+#    @return vzc: zero crossing rate, (channels x blocks) for multi-channel input
 #    @return t: time stamp
-def FeatureTimeZeroCrossingRate(x, iBlockLength, iHopLength, f_s):
+def FeatureTimeZeroCrossingRate(x, iBlockLength, iHopLength, f_s, dtype=None, x_b=None):
 
-    # create blocks
-    xBlocks, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    if dtype is None:
+        dtype = np.result_type(x.dtype if x_b is None else x_b.dtype, np.float64)
 
-    # number of results
-    iNumOfBlocks = xBlocks.shape[0]
+    # time stamps and number of results
+    t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
+    iNumOfBlocks = t.shape[0]
 
-    # allocate memory
-    vzc = np.zeros(iNumOfBlocks)
+    if iBlockLength < 2:
+        return np.full([*x.shape[1:], iNumOfBlocks] if x_b is None else x_b.shape[:-1], np.nan, dtype=dtype), t
 
-    for n, block in enumerate(xBlocks):
-        # calculate the zero crossing rate
-        vzc[n] = 0.5 * np.mean(np.abs(np.diff(np.sign(block))))
+    # sign changes within the given blocks (the zero-padding is part of the blocks)
+    if x_b is not None:
+        vzc = 0.5 * np.abs(np.diff(np.sign(np.asarray(x_b, dtype=dtype)), axis=-1)).sum(axis=-1) / (iBlockLength - 1)
+        return vzc.astype(dtype, copy=False), t
 
-    return vzc, t
+    # sign changes between neighboring samples, including the change into the zero-padding (in the computation type)
+    x = np.asarray(x, dtype=dtype).T
+    afSignChanges = np.zeros([*x.shape[:-1], x.shape[-1] + 1], dtype=dtype)
+    np.sign(x, out=afSignChanges[..., :-1])
+    afSignChanges = np.abs(np.diff(afSignChanges, axis=-1))
+
+    # calculate the zero crossing rate from the sign changes within each block (all channels at once)
+    vzc = 0.5 * ToolBlockSum(afSignChanges.T, iBlockLength - 1, iHopLength, iNumOfBlocks) / (iBlockLength - 1)
+
+    return vzc.astype(dtype, copy=False), t
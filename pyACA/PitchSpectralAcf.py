@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from scipy.signal import find_peaks
+
+from pyACA.ToolAllocOutput import ToolGetChunkLength
+from pyACA.ToolAcf import ToolAcf
+from pyACA.ToolPeakMask import ToolPeakMask
 
 
 ## computes f0 via the maximum of the spectral autocorrelation function
@@ -16,28 +19,41 @@ def PitchSpectralAcf(X, f_s):
     f_min = 300
     f_0 = np.zeros(X.shape[1])
 
-    # use spectral symmetry for robustness
-    X[0, :] = np.max(X)
-    X = np.concatenate((np.flipud(X[1:,:]), X[:-1,:]), axis=0)
+    # use spectral symmetry for robustness (the maximum is taken over all observations)
+    fMax = np.max(X) if X.size else 0
+
+    # (the double length spectrum has X.shape[0] * 2 - 2 bins)
+    eta_min = int(round(f_min / f_s * (2 * X.shape[0] - 4))) - 1
 
-    # compute the ACF
-    for n in range(0, X.shape[1]):
+    # process chunks of observations to bound the memory of the ACF matrix
+    iNumObsPerChunk = ToolGetChunkLength(2 * X.shape[0])
+    for i_start in range(0, X.shape[1], iNumObsPerChunk):
+        i_stop = min(X.shape[1], i_start + iNumObsPerChunk)
+        f_0[i_start:i_stop] = computeF0_I(X[:, i_start:i_stop], fMax, eta_min, f_s)
+
+    return f_0
 
-        if X[:, n].sum() < 1e-20:
-            continue
 
-        eta_min = int(round(f_min / f_s * (X.shape[0] - 2))) - 1
+def computeF0_I(X, fMax, iEtaMin, f_s):
+
+    f_0 = np.zeros(X.shape[1])
+
+    X = np.concatenate((np.flipud(X[1:, :]), X[:-1, :]), axis=0)
+    X[X.shape[0] // 2, :] = fMax
 
-        afCorr = np.correlate(X[:, n], X[:, n], "full") / np.dot(X[:, n], X[:, n])
-        afCorr = afCorr[np.arange(X.shape[0], afCorr.size)]
+    # compute the ACF of all observations (lags 1...)
+    afCorr = ToolAcf(X.T)[:, 1:]
 
-        # find the highest local maximum
-        iPeaks = find_peaks(afCorr, height=0)
-        if iPeaks[0].size:
-            eta_min = np.max([eta_min, iPeaks[0][0] - 1])
-        f_0[n] = np.argmax(afCorr[np.arange(eta_min, afCorr.size)]) + 1
+    # the search starts at the lag of f_min or before the first local maximum
+    eta_min = np.full(X.shape[1], iEtaMin)
+    bPeaks = ToolPeakMask(afCorr.T, 0)
+    bHasPeak = bPeaks.any(axis=0)
+    eta_min[bHasPeak] = np.maximum(eta_min[bHasPeak], np.argmax(bPeaks[:, bHasPeak], axis=0) - 1)
 
-        # find max index and convert to Hz (note: X has double length)
-        f_0[n] = (f_0[n] + eta_min) / (X.shape[0] - 2) * f_s
+    # find max index and convert to Hz (note: X has double length), skip silent observations
+    bSearch = np.arange(0, afCorr.shape[1]) >= eta_min[:, np.newaxis]
+    iMax = np.argmax(np.where(bSearch, afCorr, -np.inf), axis=1)
+    bValid = X.sum(axis=0) >= 1e-20
+    f_0[bValid] = (iMax[bValid] + 1) / (X.shape[0] - 2) * f_s
 
     return f_0
@@ -2,6 +2,7 @@
 
 import numpy as np
 import math
+from pyACA.ToolAcf import ToolAcfMaxima
 from pyACA.ToolBlockAudio import ToolBlockAudio
 
 
@@ -21,35 +22,17 @@ def PitchTimeAcf(x, iBlockLength, iHopLength, f_s):
     fMinThresh = .35
 
     # block audio data
-    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True)
     iNumOfBlocks = x_b.shape[0]
 
     # allocate memory
     f_0 = np.zeros(iNumOfBlocks)
 
-    for n, block in enumerate(x_b):
-        eta_min = np.floor(f_s / f_max).astype(int)
+    # lag of the acf maximum of each block after the main lobe
+    eta_min = np.floor(f_s / f_max).astype(int)
+    afMax, aiLag, bValid = ToolAcfMaxima(x_b, eta_min, fMinThresh)
 
-        # calculate the acf if non zero
-        if not block.sum():
-            continue
-        else:
-            afCorr = np.correlate(block, block, "full") / np.dot(block, block)
-
-        afCorr = afCorr[np.arange(iBlockLength, afCorr.size)]
-
-        # update eta_min to avoid main lobe
-        eta_tmp = np.argmax(afCorr < fMinThresh)
-        eta_min = np.max([eta_min, eta_tmp])
-
-        afDeltaCorr = np.diff(afCorr)
-        eta_tmp = np.argmax(afDeltaCorr > 0)
-        eta_min = np.max([eta_min, eta_tmp])
-
-        # find the coefficients specified in eta
-        f_0[n] = np.argmax(afCorr[np.arange(eta_min + 1, afCorr.size)]) + 1
-
-        # convert to Hz
-        f_0[n] = f_s / (f_0[n] + eta_min + 1)
+    # convert to Hz
+    f_0[bValid] = f_s / aiLag[bValid]
 
     return f_0, t
@@ -35,7 +35,7 @@ def PitchTimeAmdf(x, iBlockLength, iHopLength, f_s):
     f_min = 50
 
     # block audio data
-    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True)
     iNumOfBlocks = x_b.shape[0]
 
     # allocate memory
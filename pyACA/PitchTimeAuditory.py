@@ -2,8 +2,6 @@
 
 import numpy as np
 import math
-from scipy.signal import filtfilt
-from scipy.signal import find_peaks
 
 from .ToolGammatoneFb import ToolGammatoneFb
 
@@ -18,6 +16,8 @@ from .ToolGammatoneFb import ToolGammatoneFb
 #    @return f_0: fundamental frequency (in Hz)
 #    @return t: time stamp
 def PitchTimeAuditory(x, iBlockLength, iHopLength, f_s):
+    from scipy.signal import filtfilt
+    from scipy.signal import find_peaks
 
     # initialize
     iNumOfBlocks = math.ceil(x.size / iHopLength)
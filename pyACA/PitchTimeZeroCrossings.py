@@ -17,7 +17,7 @@ from pyACA.ToolBlockAudio import ToolBlockAudio
 def PitchTimeZeroCrossings(x, iBlockLength, iHopLength, f_s):
 
     # block audio data
-    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True)
     iNumOfBlocks = x_b.shape[0]
 
     # initialize
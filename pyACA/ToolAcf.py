@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from pyACA.ToolAllocOutput import ToolGetChunkLength
+
+
+## helper function: computes the autocorrelation functions of all blocks at once
+# few lags are computed directly, otherwise via the zero-padded FFT of the block matrix
+#
+#    @param x_b: blocks (dimension ... x iBlockLength)
+#    @param iMaxLag: largest lag to compute (default: None, iBlockLength - 1)
+#    @param bNormalize: normalize each ACF by its value at lag 0, zero blocks result in zeros (default: True)
+#
+#    @return r: autocorrelation functions for the lags 0...iMaxLag (dimension ... x iMaxLag+1)
+def ToolAcf(x_b, iMaxLag=None, bNormalize=True):
+
+    x_b = np.asarray(x_b)
+    iBlockLength = x_b.shape[-1]
+    if iMaxLag is None:
+        iMaxLag = iBlockLength - 1
+    iMaxLag = min(int(iMaxLag), iBlockLength - 1)
+
+    dtype = np.result_type(x_b.dtype, np.float32)
+    r = np.zeros([*x_b.shape[:-1], iMaxLag + 1], dtype=dtype)
+
+    # the padding avoids circular overlap for all requested lags
+    iFftLength = 1 << int(np.ceil(np.log2(max(iBlockLength + iMaxLag, 1))))
+
+    if iMaxLag + 1 <= 2 * np.log2(iFftLength):
+        for eta in range(0, iMaxLag + 1):
+            r[..., eta] = np.einsum('...i,...i->...', x_b[..., :iBlockLength - eta], x_b[..., eta:])
+    else:
+        # fold leading dimensions and process chunks of blocks to bound the memory of the spectra
+        x_flat = x_b.reshape(-1, iBlockLength)
+        r_flat = r.reshape(-1, iMaxLag + 1)
+        iNumBlocksPerChunk = ToolGetChunkLength(iFftLength)
+        for i_start in range(0, x_flat.shape[0], iNumBlocksPerChunk):
+            X = np.fft.rfft(x_flat[i_start:i_start + iNumBlocksPerChunk], iFftLength, axis=-1)
+            r_flat[i_start:i_start + iNumBlocksPerChunk] = np.fft.irfft(X.real**2 + X.imag**2, iFftLength, axis=-1)[:, :iMaxLag + 1]
+
+        # the energy is computed directly for an exact normalization
+        r[..., 0] = np.einsum('...i,...i->...', x_b, x_b)
+
+        # lags beyond the nonzero support of a block (e.g., zero-padding) are exactly zero, and values
+        # at the level of the FFT rounding noise are set to zero so that they cannot produce spurious extrema
+        bNonZero = x_b != 0
+        iSupport = iBlockLength - np.argmax(bNonZero[..., ::-1], axis=-1) - np.argmax(bNonZero, axis=-1)
+        r[np.arange(0, iMaxLag + 1) >= iSupport[..., np.newaxis]] = 0
+        r[np.abs(r) <= 1e-13 * r[..., :1]] = 0
+
+    if bNormalize:
+        afNorm = r[..., :1].copy()
+        afNorm[afNorm == 0] = 1
+        r /= afNorm
+
+    return r
+
+
+## helper function: finds the maximum of the ACF of each block after the main lobe, e.g., for FeatureTimeMaxAcf and PitchTimeAcf
+# the search starts after iEtaMin, the first lag below fMinThresh, and the first increase of the ACF;
+# leading (channel) dimensions of x_b are processed in the same chunks
+#
+#    @param x_b: blocks (dimension ... x iNumBlocks x iBlockLength)
+#    @param iEtaMin: smallest lag index of the search
+#    @param fMinThresh: threshold of the normalized ACF marking the end of the main lobe
+#
+#    @return afMax: absolute maximum per block, 0 if no maximum was found (dimension ... x iNumBlocks)
+#    @return aiLag: lag of the (signed) maximum per block
+#    @return bValid: whether a maximum was found per block
+def ToolAcfMaxima(x_b, iEtaMin, fMinThresh):
+
+    [iNumBlocks, iBlockLength] = x_b.shape[-2:]
+
+    afMax = np.zeros(x_b.shape[:-1], dtype=np.result_type(x_b.dtype, np.float32))
+    aiLag = np.zeros(x_b.shape[:-1], dtype=int)
+
+    # blocks with zero sum are skipped (as before the vectorization)
+    bValid = x_b.sum(axis=-1) != 0
+    if iBlockLength < 3:
+        return afMax, aiLag, np.zeros(x_b.shape[:-1], dtype=bool)
+
+    iNumBlocksPerChunk = ToolGetChunkLength(iBlockLength * np.prod(x_b.shape[:-2], dtype=int))
+    for i_start in range(0, iNumBlocks, iNumBlocksPerChunk):
+        i_stop = min(iNumBlocks, i_start + iNumBlocksPerChunk)
+
+        # lags 1...iBlockLength-1
+        afCorr = ToolAcf(x_b[..., i_start:i_stop, :])[..., 1:]
+
+        # update eta_min to avoid main lobe
+        eta_min = np.maximum(iEtaMin, np.argmax(afCorr < fMinThresh, axis=-1))
+        eta_min = np.maximum(eta_min, np.argmax(np.diff(afCorr, axis=-1) > 0, axis=-1))
+
+        bSearch = np.arange(0, afCorr.shape[-1]) >= eta_min[..., np.newaxis] + 1
+        bValid[..., i_start:i_stop] &= eta_min + 1 < afCorr.shape[-1]
+
+        afMax[..., i_start:i_stop] = np.max(np.where(bSearch, np.abs(afCorr), -np.inf), axis=-1)
+        aiLag[..., i_start:i_stop] = np.argmax(np.where(bSearch, afCorr, -np.inf), axis=-1) + 1
+
+    afMax[~bValid] = 0
+
+    return afMax, aiLag, bValid
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+
+
+## helper function: allocates an output array, either in memory or as memory-mapped .npy file
+#
+#    @param out: output target, None (in memory), path of a .npy file or existing array/np.memmap of the output dimension
+#    @param aiShape: output dimension
+#    @param dtype: output data type (ignored for existing arrays)
+#
+#    @return X: zero-initialized array (np.memmap for file targets)
+def ToolAllocOutput(out, aiShape, dtype):
+
+    aiShape = tuple(int(i) for i in aiShape)
+
+    if out is None:
+        return np.zeros(aiShape, dtype=dtype)
+
+    if isinstance(out, (str, os.PathLike)):
+        return np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=aiShape)
+
+    assert(out.shape == aiShape), "parameter error: invalid output dimension"
+
+    return out
+
+
+## helper function: writes modified pages of a memory-mapped output back to disk
+#
+#    @param X: output array as returned by ToolAllocOutput
+def ToolFlushOutput(X):
+
+    if isinstance(X, np.memmap):
+        X.flush()
+
+
+## helper function: number of frames per chunk for computations processing the frames chunk by chunk
+# keeps the temporary arrays of a chunk at about 2^20 values
+#
+#    @param iFrameLength: number of values per frame, e.g., the block length times the number of channels
+#
+#    @return iNumFramesPerChunk: number of frames per chunk (at least 1)
+def ToolGetChunkLength(iFrameLength):
+    return max(1, 2**20 // int(iFrameLength))
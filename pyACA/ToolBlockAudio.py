@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from pyACA.ToolProfiler import ToolProfile
+
 
 ## helper function: blocks an audio signal into overlapping blocks
 #
@@ -9,17 +11,166 @@ import numpy as np
 #    @param iBlockLength: internal block length 
 #    @param iHopLength: internal hop length 
 #    @param f_s: sample rate of audio data
+#    @param bView: return a read-only strided view instead of a copy (default: False)
+#    @param dtype: data type of the blocks, e.g. np.float32 (default: None, at least float64)
 #
-#    @return x_b: 2D np.array containing the blocked data of shape (iNumOfBlocks x iBlockLength)
+#    @return x_b: 2D np.array containing the blocked data of shape (iNumOfBlocks x iBlockLength), (channels x iNumOfBlocks x iBlockLength) for multi-channel input
 #    @return t: time stamp
-def ToolBlockAudio(x, iBlockLength, iHopLength, f_s):
+@ToolProfile
+def ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=False, dtype=None):
 
-    iNumBlocks = np.ceil(x.shape[0] / iHopLength).astype(int)
+    if dtype is None:
+        dtype = np.result_type(x.dtype, np.float64)
 
     # time stamp vector
-    t = np.arange(0, iNumBlocks) * iHopLength / f_s + iBlockLength / (2*f_s)
+    t = ToolBlockTimeStamps(x.shape[0], iBlockLength, iHopLength, f_s)
+    iNumBlocks = t.shape[0]
 
     # pad with block length zeros just to make sure it runs for weird inputs, too
-    afAudioPadded = np.concatenate((x, np.zeros([iBlockLength+iHopLength, ])), axis=0)
+    afAudioPadded = np.concatenate((x, np.zeros([iBlockLength+iHopLength, *x.shape[1:]])), axis=0, dtype=dtype)
+
+    # overlapping blocks are strided views into the padded signal, no per-block copies
+    x_b = np.lib.stride_tricks.sliding_window_view(afAudioPadded.T, iBlockLength, axis=-1)[..., ::iHopLength, :][..., :iNumBlocks, :]
+
+    return (x_b if bView else x_b.copy()), t
+
+
+## helper function: computes the time stamps of the blocks of ToolBlockAudio without blocking the audio
+#
+#    @param iNumSamples: number of samples of the signal
+#    @param iBlockLength: internal block length 
+#    @param iHopLength: internal hop length 
+#    @param f_s: sample rate of audio data
+#
+#    @return t: time stamp per block
+def ToolBlockTimeStamps(iNumSamples, iBlockLength, iHopLength, f_s):
+
+    iNumBlocks = int(np.ceil(iNumSamples / iHopLength))
+
+    return np.arange(0, iNumBlocks) * iHopLength / f_s + iBlockLength / (2*f_s)
+
+
+## helper function: lazily iterates over the overlapping blocks of an audio signal
+#
+#    @param x: array with floating point audio data (dimension samples x channels)
+#    @param iBlockLength: internal block length 
+#    @param iHopLength: internal hop length 
+#    @param f_s: sample rate of audio data
+#
+#    @return x_block: read-only block of length iBlockLength in the data type of x (zero-padded at the end of the signal), (channels x iBlockLength) for multi-channel input
+#    @return t: time stamp of the block
+def ToolBlockAudioIter(x, iBlockLength, iHopLength, f_s):
+
+    iNumBlocks = np.ceil(x.shape[0] / iHopLength).astype(int)
+
+    for n in range(0, iNumBlocks):
+        i_start = n * iHopLength
+
+        x_block = x[i_start:i_start + iBlockLength]
+        if x_block.shape[0] < iBlockLength:
+            x_block = np.concatenate((x_block, np.zeros([iBlockLength - x_block.shape[0], *x.shape[1:]], dtype=x.dtype)), axis=0)
+        else:
+            x_block = x_block.view()
+        x_block.flags.writeable = False
+
+        # channels first as in ToolBlockAudio
+        yield x_block.T, i_start / f_s + iBlockLength / (2*f_s)
+
+
+## helper class: ring buffer that blocks a stream of audio chunks into overlapping blocks
+# only one block of audio history is kept; the blocks are identical to ToolBlockAudio
+# the number of channels and the data type are set by the first chunk after a reset
+#
+#    @param iBlockLength: internal block length 
+#    @param iHopLength: internal hop length 
+#    @param dtype: data type of the blocks, e.g. np.float32 (default: None, at least float64)
+class ToolBlockBuffer:
+
+    def __init__(self, iBlockLength, iHopLength, dtype=None):
+
+        self.iBlockLength = int(iBlockLength)
+        self.iHopLength = int(iHopLength)
+        self.dtype = dtype
+
+        self.reset()
+
+    ## resets the buffer state
+    def reset(self):
+
+        # channels x iBlockLength, allocated by the first chunk
+        self.afBuffer = None
+        self.iWriteIdx = 0
+        self.iNumValid = 0
+        self.iNumSkip = 0
+
+        self.iNumSamples = 0
+        self.iNumBlocks = 0
+
+    ## adds a chunk of audio to the buffer
+    #
+    #    @param x: array with floating point audio data (dimension samples x channels)
+    #
+    #    @return x_b: np.array containing the completed blocks of shape (iNumNewBlocks x iBlockLength), (channels x iNumNewBlocks x iBlockLength) for multi-channel input
+    def push(self, x):
+
+        x = np.asarray(x).T
+        if self.afBuffer is None:
+            self.afBuffer = np.zeros([*x.shape[:-1], self.iBlockLength], dtype=np.result_type(x.dtype, np.float64) if self.dtype is None else self.dtype)
+        assert(x.shape[:-1] == self.afBuffer.shape[:-1]), "parameter error: invalid number of channels"
+
+        x_b = []
+        i = 0
+        iNumSamples = x.shape[-1]
+
+        while i < iNumSamples:
+            # samples between blocks if the hop is longer than the block
+            if self.iNumSkip > 0:
+                k = min(self.iNumSkip, iNumSamples - i)
+                self.iNumSkip -= k
+                i += k
+                continue
+
+            # write into the ring buffer up to the end of the block or the buffer
+            k = min(self.iBlockLength - self.iNumValid, self.iBlockLength - self.iWriteIdx, iNumSamples - i)
+            self.afBuffer[..., self.iWriteIdx:self.iWriteIdx + k] = x[..., i:i + k]
+            self.iWriteIdx = (self.iWriteIdx + k) % self.iBlockLength
+            self.iNumValid += k
+            i += k
+
+            if self.iNumValid == self.iBlockLength:
+                # the oldest sample is at the write position
+                x_b.append(np.roll(self.afBuffer, -self.iWriteIdx, axis=-1))
+
+                # discard one hop of history
+                self.iNumValid = max(0, self.iBlockLength - self.iHopLength)
+                self.iNumSkip = max(0, self.iHopLength - self.iBlockLength)
+
+        self.iNumSamples += iNumSamples
+        self.iNumBlocks += len(x_b)
+
+        return np.stack(x_b, axis=-2) if x_b else self.allocEmpty_I()
+
+    ## zero-pads the end of the stream and returns the remaining blocks, then resets the buffer
+    #
+    #    @return x_b: np.array containing the remaining blocks of shape (iNumNewBlocks x iBlockLength), (channels x iNumNewBlocks x iBlockLength) for multi-channel input
+    def flush(self):
+
+        iNumRemaining = int(np.ceil(self.iNumSamples / self.iHopLength)) - self.iNumBlocks
+
+        x_b = self.allocEmpty_I()
+        if iNumRemaining > 0:
+            # the buffered samples start at the next block, the remaining blocks are blocked from them and the zero-padding
+            afTail = np.zeros([*self.afBuffer.shape[:-1], (iNumRemaining - 1) * self.iHopLength + self.iBlockLength], dtype=self.afBuffer.dtype)
+            afTail[..., :self.iNumValid] = np.roll(self.afBuffer, -self.iWriteIdx, axis=-1)[..., self.iBlockLength - self.iNumValid:]
+            x_b = np.lib.stride_tricks.sliding_window_view(afTail, self.iBlockLength, axis=-1)[..., ::self.iHopLength, :].copy()
+
+        self.reset()
+
+        return x_b
+
+    def allocEmpty_I(self):
+
+        if self.afBuffer is None:
+            return np.zeros([0, self.iBlockLength], dtype=np.float64 if self.dtype is None else self.dtype)
 
-    return np.vstack([np.array(afAudioPadded[n*iHopLength:n*iHopLength+iBlockLength]) for n in range(iNumBlocks)]), t
+        return np.zeros([*self.afBuffer.shape[:-1], 0, self.iBlockLength], dtype=self.afBuffer.dtype)
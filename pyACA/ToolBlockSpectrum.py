@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyACA.ToolAllocOutput import ToolAllocOutput
+from pyACA.ToolAllocOutput import ToolFlushOutput
+from pyACA.ToolAllocOutput import ToolGetChunkLength
+from pyACA.ToolProfiler import ToolProfileInherit
+from pyACA.ToolProfiler import ToolProfileSpan
+
+
+## helper function: computes the spectra of a block matrix, e.g., of blocks shared with other computations
+# the windowed fft is computed for chunks of blocks (and all channels at once) to keep the windowed copy small
+#
+#    @param x_b: block matrix (dimension (channels x) iNumBlocks x iBlockLength) as returned by ToolBlockAudio
+#    @param afWindow: FFT window of length iBlockLength
+#    @param bMagnitude: return magnitude instead of complex spectrum (default: True)
+#    @param out: output target, path of a .npy file or np.memmap, written chunk by chunk (default: None, in memory)
+#    @param iNumThreads: number of threads transforming chunks of blocks concurrently, the result is identical for all values (default: 1)
+#
+#    @return X: spectrum (dimension (channels x) iSpecLength x iNumBlocks)
+def ToolBlockSpectrum(x_b, afWindow, bMagnitude=True, out=None, iNumThreads=1):
+
+    # allocate memory
+    iNumBlocks = x_b.shape[-2]
+    iSpecDim = np.int_([*x_b.shape[:-2], (x_b.shape[-1] // 2 + 1), iNumBlocks])
+    X = ToolAllocOutput(out, iSpecDim, getSpecType_I(x_b.dtype, bMagnitude))
+
+    iNumBlocksPerChunk = ToolGetChunkLength(x_b.shape[-1] * np.prod(x_b.shape[:-2], dtype=int))
+
+    def computeChunk_I(i_start):
+        i_stop = min(iNumBlocks, i_start + iNumBlocksPerChunk)
+        computeSpectra_I(X[..., i_start:i_stop], x_b[..., i_start:i_stop, :], afWindow, bMagnitude)
+        ToolFlushOutput(X)
+
+    with ToolProfileSpan("fft", iNumBlocks):
+        if iNumThreads > 1:
+            # numpy releases the GIL in the fft; chunks write to disjoint parts of X
+            with ThreadPoolExecutor(max_workers=iNumThreads) as executor:
+                list(executor.map(ToolProfileInherit(computeChunk_I), range(0, iNumBlocks, iNumBlocksPerChunk)))
+        else:
+            for i_start in range(0, iNumBlocks, iNumBlocksPerChunk):
+                computeChunk_I(i_start)
+
+    return X
+
+
+## helper function: generator computing the spectra of a block matrix chunk by chunk, for callers that only need a few frames at a time
+# the yielded spectra share one buffer that is overwritten by the next chunk
+#
+#    @param x_b: block matrix (dimension (channels x) iNumBlocks x iBlockLength) as returned by ToolBlockAudio
+#    @param afWindow: FFT window of length iBlockLength
+#    @param bMagnitude: return magnitude instead of complex spectrum (default: True)
+#
+#    @return i_start: index of the first block of the chunk
+#    @return X: spectra of the chunk (dimension (channels x) iSpecLength x iNumBlocksInChunk)
+def ToolBlockSpectrumChunks(x_b, afWindow, bMagnitude=True):
+
+    iNumBlocks = x_b.shape[-2]
+    iNumBlocksPerChunk = ToolGetChunkLength(x_b.shape[-1] * np.prod(x_b.shape[:-2], dtype=int))
+    X = np.zeros([*x_b.shape[:-2], x_b.shape[-1] // 2 + 1, min(iNumBlocksPerChunk, iNumBlocks)], dtype=getSpecType_I(x_b.dtype, bMagnitude))
+
+    for i_start in range(0, iNumBlocks, iNumBlocksPerChunk):
+        i_stop = min(iNumBlocks, i_start + iNumBlocksPerChunk)
+        yield i_start, computeSpectra_I(X[..., :i_stop - i_start], x_b[..., i_start:i_stop, :], afWindow, bMagnitude)
+
+
+## windowed fft of a block matrix, written directly into the (iSpecLength x iNumBlocks) output X
+# leading (channel) dimensions of x_b and X are processed in the same batch
+def computeSpectra_I(X, x_b, afWindow, bMagnitude):
+
+    norm = 2 / x_b.shape[-1]
+
+    # real fft of all windowed blocks at once (removes redundant spectrum parts)
+    tmp = np.swapaxes(np.fft.rfft(x_b * afWindow, axis=-1) * norm, -1, -2)
+
+    if bMagnitude:
+        np.abs(tmp, out=X)
+    else:
+        X[:] = tmp
+
+    # let's be pedantic about normalization
+    X[..., [0, -1], :] = X[..., [0, -1], :] / np.sqrt(2)
+
+    return X
+
+
+def getSpecType_I(dtype, bMagnitude):
+    return dtype if bMagnitude else np.result_type(dtype, np.complex64)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+## helper function: computes the sum of each overlapping block of a signal in O(N), independent of the overlap
+# the blocks match ToolBlockAudio, i.e., the signal is zero-padded at the end
+#
+#    @param x: signal (dimension samples, or samples x channels)
+#    @param iBlockLength: block length in samples
+#    @param iHopLength: hop length in samples
+#    @param iNumBlocks: number of blocks (default: None, number of blocks of ToolBlockAudio)
+#
+#    @return v: sum per block (dimension blocks, or channels x blocks)
+def ToolBlockSum(x, iBlockLength, iHopLength, iNumBlocks=None):
+
+    return blockSum_I(toChannelsFirst_I(x), iBlockLength, iHopLength, iNumBlocks)
+
+
+## helper function: computes the maximum of each overlapping block of a signal in O(N), independent of the overlap
+# (van Herk/Gil-Werman); the blocks only contain the signal, not the zero-padding of ToolBlockAudio
+#
+#    @param x: signal (dimension samples, or samples x channels)
+#    @param iBlockLength: block length in samples
+#    @param iHopLength: hop length in samples
+#    @param iNumBlocks: number of blocks (default: None, number of blocks of ToolBlockAudio)
+#
+#    @return v: maximum per block (dimension blocks, or channels x blocks)
+def ToolBlockMax(x, iBlockLength, iHopLength, iNumBlocks=None):
+
+    return blockMax_I(toChannelsFirst_I(x), iBlockLength, iHopLength, iNumBlocks)
+
+
+## helper function: computes the standard deviation of each overlapping block of a signal in O(N), independent of the overlap
+# the blocks match ToolBlockAudio, i.e., the signal is zero-padded at the end
+#
+#    @param x: signal (dimension samples, or samples x channels)
+#    @param iBlockLength: block length in samples
+#    @param iHopLength: hop length in samples
+#    @param iNumBlocks: number of blocks (default: None, number of blocks of ToolBlockAudio)
+#
+#    @return v: standard deviation per block (dimension blocks, or channels x blocks)
+def ToolBlockStd(x, iBlockLength, iHopLength, iNumBlocks=None):
+
+    x = toChannelsFirst_I(x)
+    if iNumBlocks is None:
+        iNumBlocks = int(np.ceil(x.shape[-1] / iHopLength))
+
+    # the zero-padded signal, shifted by its mean to reduce cancellation in the variance
+    afPadded = np.zeros((*x.shape[:-1], (iNumBlocks - 1) * iHopLength + iBlockLength if iNumBlocks else 0), dtype=np.result_type(x.dtype, np.float32))
+    iLength = min(x.shape[-1], afPadded.shape[-1])
+    afPadded[..., :iLength] = x[..., :iLength]
+    if afPadded.size:
+        afPadded -= np.mean(afPadded, axis=-1, keepdims=True)
+
+    vmean = blockSum_I(afPadded, iBlockLength, iHopLength, iNumBlocks) / iBlockLength
+    vvar = blockSum_I(afPadded**2, iBlockLength, iHopLength, iNumBlocks) / iBlockLength - vmean**2
+
+    # recompute blocks whose mean is large compared to their deviation explicitly
+    for idx in zip(*np.nonzero(vmean**2 > 1e4 * vvar)):
+        vvar[idx] = np.var(afPadded[(*idx[:-1], slice(idx[-1] * iHopLength, idx[-1] * iHopLength + iBlockLength))])
+
+    return np.sqrt(np.maximum(vvar, 0))
+
+
+# the channels are processed at once with the samples along the last axis (a view, the segments are copied anyway)
+def toChannelsFirst_I(x):
+
+    x = np.asarray(x)
+
+    return np.moveaxis(x, 0, -1) if x.ndim > 1 else x
+
+
+# block sums of a signal with the samples along the last axis
+def blockSum_I(x, iBlockLength, iHopLength, iNumBlocks):
+
+    [P, R, a, b] = reduceSegments_I(np.add, x, iBlockLength, iHopLength, iNumBlocks, 0)
+
+    # a block aligned with a segment is the complete suffix of that segment
+    return R[..., a] + np.where(a % iBlockLength != 0, P[..., b], 0)
+
+
+# block maxima of a signal with the samples along the last axis
+def blockMax_I(x, iBlockLength, iHopLength, iNumBlocks):
+
+    [P, R, a, b] = reduceSegments_I(np.maximum, x, iBlockLength, iHopLength, iNumBlocks, -np.inf)
+
+    return np.maximum(R[..., a], P[..., b])
+
+
+# splits the signal (samples along the last axis) into segments of the block length, every block overlaps at
+# most two segments: its result combines the suffix reduction of the first with the prefix reduction of the second segment
+def reduceSegments_I(hUfunc, x, iBlockLength, iHopLength, iNumBlocks, fPad):
+
+    if iNumBlocks is None:
+        iNumBlocks = int(np.ceil(x.shape[-1] / iHopLength))
+
+    # first sample of each block and the last sample it covers
+    a = np.arange(0, iNumBlocks) * iHopLength
+    b = a + iBlockLength - 1
+
+    iNumSegments = int(np.ceil((b[-1] + 1) / iBlockLength)) if iNumBlocks > 0 else 0
+    afPadded = np.full((*x.shape[:-1], iNumSegments * iBlockLength), fPad, dtype=np.result_type(x.dtype, np.float32))
+    iLength = min(x.shape[-1], afPadded.shape[-1])
+    afPadded[..., :iLength] = x[..., :iLength]
+
+    segments = afPadded.reshape(*x.shape[:-1], iNumSegments, iBlockLength)
+    P = hUfunc.accumulate(segments, axis=-1).reshape(afPadded.shape)
+    R = hUfunc.accumulate(segments[..., ::-1], axis=-1)[..., ::-1].reshape(afPadded.shape)
+
+    return P, R, a, b
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import functools
+
+import numpy as np
+
+
+# registry of all memoized functions (for statistics and clearing)
+cachedFuncs = dict()
+
+
+## helper function: decorator memoizing functions that return arrays (windows, filterbanks, ...)
+# uses a bounded, thread-safe LRU cache keyed by the function parameters;
+# the cached arrays are shared between all callers and therefore returned read-only unless bCopy is set
+#
+#    @param iMaxSize: maximum number of cached results per function (default: 32)
+#    @param bCopy: return writeable copies of the cached arrays, e.g. for public functions (default: False)
+#
+#    @return decorator: function decorator
+def ToolCache(iMaxSize=32, bCopy=False):
+
+    def decorator(hFunc):
+
+        @functools.lru_cache(maxsize=iMaxSize)
+        def hCachedFunc(*args, **kwargs):
+            return setReadOnly_I(hFunc(*args, **kwargs))
+
+        # numpy scalars are converted so that e.g. np.int_(4096) and 4096 share one entry
+        @functools.wraps(hFunc)
+        def hWrapper(*args, **kwargs):
+            result = hCachedFunc(*[toKey_I(arg) for arg in args], **{k: toKey_I(arg) for k, arg in kwargs.items()})
+            return copy_I(result) if bCopy else result
+
+        hWrapper.cache_info = hCachedFunc.cache_info
+        hWrapper.cache_clear = hCachedFunc.cache_clear
+        cachedFuncs[hFunc.__module__ + "." + hFunc.__qualname__] = hWrapper
+
+        return hWrapper
+
+    return decorator
+
+
+## helper function: returns the hit/miss statistics of all memoized functions
+#
+#    @return info: dict with function names as keys and named tuples (hits, misses, maxsize, currsize) as values
+def ToolCacheInfo():
+
+    return {cName: hFunc.cache_info() for cName, hFunc in cachedFuncs.items()}
+
+
+## helper function: clears the caches of all memoized functions
+def ToolCacheClear():
+
+    for hFunc in cachedFuncs.values():
+        hFunc.cache_clear()
+
+
+def toKey_I(arg):
+
+    return arg.item() if isinstance(arg, np.generic) else arg
+
+
+def copy_I(result):
+
+    if isinstance(result, tuple):
+        return tuple(copy_I(r) for r in result)
+
+    # arrays and sparse matrices
+    return result.copy() if hasattr(result, "copy") else result
+
+
+def setReadOnly_I(result):
+
+    if isinstance(result, tuple):
+        return tuple(setReadOnly_I(r) for r in result)
+
+    if isinstance(result, np.ndarray):
+        result.flags.writeable = False
+
+    # sparse matrices
+    if hasattr(result, "indptr"):
+        for afArray in (result.data, result.indices, result.indptr):
+            afArray.flags.writeable = False
+
+    return result
@@ -13,6 +13,9 @@ helper function: compute periodic von-Hann window
 
 import numpy as np
 
+from pyACA.ToolCache import ToolCache
 
+
+@ToolCache(bCopy=True)
 def ToolComputeHann(iWindowLength):
     return 0.5 - (0.5 * np.cos(2 * np.pi / iWindowLength * np.arange(iWindowLength)))
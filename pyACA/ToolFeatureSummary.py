@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+## helper class: accumulates summary statistics of a feature chunk by chunk without storing the frames
+# mean and standard deviation are updated with the parallel variant of Welford's algorithm (Chan et al.),
+# quantiles are estimated with a logarithmic histogram (DDSketch) with bounded relative error;
+# summaries of consecutive parts of a file, e.g., from parallel workers, or of different files can be merged;
+# frames with non-finite values (NaN, inf) are dropped and only counted
+#
+#    @param fRelativeAccuracy: relative accuracy of the quantiles (default: 0.01)
+#    @param afQuantiles: quantiles of the summary (default: [0.1, 0.5, 0.9])
+#    @param fMinValue: smaller magnitudes are counted as zero by the quantile sketch (default: 1e-12)
+class ToolFeatureSummary:
+
+    def __init__(self, fRelativeAccuracy=0.01, afQuantiles=(0.1, 0.5, 0.9), fMinValue=1e-12):
+
+        assert(0 < fRelativeAccuracy < 1), "parameter error: invalid relative accuracy"
+
+        self.fRelativeAccuracy = fRelativeAccuracy
+        self.afQuantiles = np.asarray(afQuantiles, dtype=float)
+        self.fMinValue = fMinValue
+
+        # bucket k of the sketch covers the magnitudes (gamma^(k-1), gamma^k]
+        self.fGamma = (1 + fRelativeAccuracy) / (1 - fRelativeAccuracy)
+
+        self.reset()
+
+    ## resets all statistics
+    def reset(self):
+
+        self.iNumDims = None
+        self.iNumFrames = 0
+        self.iNumDropped = 0
+
+        self.afMean = None
+        self.afM2 = None
+        self.afMin = None
+        self.afMax = None
+
+        # statistics of the differences between consecutive frames
+        self.iNumDeltas = 0
+        self.afDeltaMean = None
+        self.afDeltaM2 = None
+        self.afFirst = None
+        self.afLast = None
+
+        # quantile sketch per dimension: bucket counts of positive and negative values, and number of zeros
+        self.sketches = None
+
+    ## adds the next frames of the feature
+    #
+    #    @param v: feature values (dimension Frames, or Dimensions X Frames)
+    def update(self, v):
+
+        v = np.asarray(v, dtype=float)
+        if v.ndim == 1:
+            v = np.expand_dims(v, axis=0)
+
+        # drop frames with non-finite values, they would invalidate the moments and the sketch
+        bFinite = np.all(np.isfinite(v), axis=0)
+        if not np.all(bFinite):
+            self.iNumDropped += int(np.count_nonzero(~bFinite))
+            v = v[:, bFinite]
+
+        if not v.shape[1]:
+            return
+
+        if self.iNumDims is None:
+            self.init_I(v.shape[0])
+        assert(v.shape[0] == self.iNumDims), "parameter error: invalid feature dimension"
+
+        # moments and extrema of the chunk, merged into the running statistics
+        afMean = v.mean(axis=1)
+        [self.iNumFrames, self.afMean, self.afM2] = mergeMoments_I(self.iNumFrames, self.afMean, self.afM2, v.shape[1], afMean, ((v - afMean[:, np.newaxis])**2).sum(axis=1))
+        self.afMin = np.minimum(self.afMin, v.min(axis=1))
+        self.afMax = np.maximum(self.afMax, v.max(axis=1))
+
+        # differences between consecutive frames, including the step from the previous chunk
+        afDelta = np.diff(v if self.afLast is None else np.concatenate((self.afLast[:, np.newaxis], v), axis=1), axis=1)
+        if afDelta.shape[1]:
+            afMean = afDelta.mean(axis=1)
+            [self.iNumDeltas, self.afDeltaMean, self.afDeltaM2] = mergeMoments_I(self.iNumDeltas, self.afDeltaMean, self.afDeltaM2, afDelta.shape[1], afMean, ((afDelta - afMean[:, np.newaxis])**2).sum(axis=1))
+
+        if self.afFirst is None:
+            self.afFirst = v[:, 0].copy()
+        self.afLast = v[:, -1].copy()
+
+        # quantile sketch
+        for d in range(0, self.iNumDims):
+            addToSketch_I(self.sketches[d], v[d], self.fGamma, self.fMinValue)
+
+    ## merges the summary of the following part of the same stream, or of another file, into this summary
+    # for consecutive parts, the difference between the last frame of this and the first frame of the other summary is added to the delta statistics
+    # for other files, later updates continue after the last frame of this summary
+    #
+    #    @param other: ToolFeatureSummary with the same accuracy
+    #    @param bConsecutive: other directly follows this summary in the same stream (default: True), False for other files
+    def merge(self, other, bConsecutive=True):
+
+        assert(self.fGamma == other.fGamma and self.fMinValue == other.fMinValue), "parameter error: incompatible summaries"
+
+        self.iNumDropped += other.iNumDropped
+        if not other.iNumFrames:
+            return
+        if not self.iNumFrames:
+            self.init_I(other.iNumDims)
+        assert(other.iNumDims == self.iNumDims), "parameter error: invalid feature dimension"
+
+        # delta at the boundary of both parts
+        [self.iNumDeltas, self.afDeltaMean, self.afDeltaM2] = mergeMoments_I(self.iNumDeltas, self.afDeltaMean, self.afDeltaM2, other.iNumDeltas, other.afDeltaMean, other.afDeltaM2)
+        if bConsecutive and self.afLast is not None:
+            afDelta = other.afFirst - self.afLast
+            [self.iNumDeltas, self.afDeltaMean, self.afDeltaM2] = mergeMoments_I(self.iNumDeltas, self.afDeltaMean, self.afDeltaM2, 1, afDelta, np.zeros(self.iNumDims))
+
+        [self.iNumFrames, self.afMean, self.afM2] = mergeMoments_I(self.iNumFrames, self.afMean, self.afM2, other.iNumFrames, other.afMean, other.afM2)
+        self.afMin = np.minimum(self.afMin, other.afMin)
+        self.afMax = np.maximum(self.afMax, other.afMax)
+
+        # frames of another file neither continue nor precede the frames of this stream
+        if bConsecutive:
+            if self.afFirst is None:
+                self.afFirst = other.afFirst.copy()
+            self.afLast = other.afLast.copy()
+
+        for d in range(0, self.iNumDims):
+            for cSign in ("positive", "negative"):
+                for k, iCount in other.sketches[d][cSign].items():
+                    self.sketches[d][cSign][k] = self.sketches[d][cSign].get(k, 0) + iCount
+            self.sketches[d]["zero"] += other.sketches[d]["zero"]
+
+    ## returns the estimated quantiles
+    #
+    #    @param afQuantiles: quantiles between 0 and 1 (default: None, the quantiles of the summary)
+    #
+    #    @return Q: quantiles (dimension Dimensions X Quantiles)
+    def getQuantiles(self, afQuantiles=None):
+
+        if afQuantiles is None:
+            afQuantiles = self.afQuantiles
+        afQuantiles = np.atleast_1d(afQuantiles)
+
+        Q = np.full([self.iNumDims or 0, afQuantiles.shape[0]], np.nan)
+        for d in range(0, Q.shape[0]):
+            Q[d] = getQuantiles_I(self.sketches[d], afQuantiles, self.fGamma)
+
+        return Q
+
+    ## returns the summary statistics
+    #
+    #    @return summary: dict with mean, std, min, max, quantiles (Dimensions X Quantiles), delta_mean, delta_std, and the numbers of frames and of dropped frames
+    def getSummary(self):
+
+        iNumDims = self.iNumDims or 0
+        afNan = np.full(iNumDims, np.nan)
+
+        return {"mean": self.afMean if self.iNumFrames else afNan,
+                "std": np.sqrt(self.afM2 / self.iNumFrames) if self.iNumFrames else afNan,
+                "min": self.afMin if self.iNumFrames else afNan,
+                "max": self.afMax if self.iNumFrames else afNan,
+                "quantiles": self.getQuantiles(),
+                "delta_mean": self.afDeltaMean if self.iNumDeltas else afNan,
+                "delta_std": np.sqrt(self.afDeltaM2 / self.iNumDeltas) if self.iNumDeltas else afNan,
+                "iNumFrames": self.iNumFrames,
+                "iNumDropped": self.iNumDropped}
+
+    ## returns the summary as one feature vector, e.g., as a column of the feature matrix of ToolSimpleKnn or ToolGmm
+    #
+    #    @return v: mean, std, min, max, quantiles, delta mean, and delta std of all dimensions (dimension Dimensions * (6 + Quantiles))
+    def getFeatureVector(self):
+
+        summary = self.getSummary()
+
+        return np.concatenate((summary["mean"], summary["std"], summary["min"], summary["max"], summary["quantiles"].T.ravel(), summary["delta_mean"], summary["delta_std"]))
+
+    def init_I(self, iNumDims):
+
+        self.iNumDims = iNumDims
+
+        self.afMean = np.zeros(iNumDims)
+        self.afM2 = np.zeros(iNumDims)
+        self.afMin = np.full(iNumDims, np.inf)
+        self.afMax = np.full(iNumDims, -np.inf)
+        self.afDeltaMean = np.zeros(iNumDims)
+        self.afDeltaM2 = np.zeros(iNumDims)
+
+        self.sketches = [{"positive": dict(), "negative": dict(), "zero": 0} for d in range(0, iNumDims)]
+
+
+# combines the count, mean, and sum of squared deviations of two sets (Chan et al.)
+def mergeMoments_I(iNumA, afMeanA, afM2A, iNumB, afMeanB, afM2B):
+
+    iNum = iNumA + iNumB
+    if not iNumB:
+        return iNumA, afMeanA, afM2A
+
+    afDelta = afMeanB - afMeanA
+    afMean = afMeanA + afDelta * (iNumB / iNum)
+    afM2 = afM2A + afM2B + afDelta**2 * (iNumA * iNumB / iNum)
+
+    return iNum, afMean, afM2
+
+
+def addToSketch_I(sketch, v, fGamma, fMinValue):
+
+    bZero = np.abs(v) <= fMinValue
+    sketch["zero"] += int(np.count_nonzero(bZero))
+
+    for cSign, afValues in (("positive", v[v > fMinValue]), ("negative", -v[v < -fMinValue])):
+        if not afValues.size:
+            continue
+        aiKeys, aiCounts = np.unique(np.ceil(np.log(afValues) / np.log(fGamma)).astype(int), return_counts=True)
+        for k, iCount in zip(aiKeys.tolist(), aiCounts.tolist()):
+            sketch[cSign][k] = sketch[cSign].get(k, 0) + iCount
+
+
+def getQuantiles_I(sketch, afQuantiles, fGamma):
+
+    afResult = np.full(afQuantiles.shape[0], np.nan)
+
+    # buckets in ascending order of their values: negative (decreasing magnitude), zero, positive
+    aiNegKeys = sorted(sketch["negative"], reverse=True)
+    aiPosKeys = sorted(sketch["positive"])
+    afValues = np.concatenate((-getBucketValue_I(np.array(aiNegKeys, dtype=float), fGamma), [0], getBucketValue_I(np.array(aiPosKeys, dtype=float), fGamma)))
+    aiCounts = np.concatenate(([sketch["negative"][k] for k in aiNegKeys], [sketch["zero"]], [sketch["positive"][k] for k in aiPosKeys])).astype(int)
+
+    # the ranks refer to the values in the sketch
+    iNumValues = int(aiCounts.sum())
+    if not iNumValues:
+        return afResult
+
+    # the bucket containing the value at the rank of each quantile
+    aiRanks = np.floor(np.clip(afQuantiles, 0, 1) * (iNumValues - 1)).astype(int)
+    afResult[:] = afValues[np.searchsorted(np.cumsum(aiCounts), aiRanks, side="right")]
+
+    return afResult
+
+
+# the value with the smallest relative error for all magnitudes of bucket k
+def getBucketValue_I(aiKeys, fGamma):
+    return 2 * fGamma**aiKeys / (fGamma + 1)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from scipy.signal import lfilter
 
 
 ## helper function: splits the audio signal into multiple bands via a Gammatone filterbank
@@ -14,6 +13,7 @@ from scipy.signal import lfilter
 #
 #    @return X: multi-band signal
 def ToolGammatoneFb(x, f_s, iNumBands=20, f_low=100):
+    from scipy.signal import lfilter
 
     # initialization
     fEarQ = 9.26449
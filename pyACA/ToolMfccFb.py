@@ -2,15 +2,20 @@
 
 import numpy as np
 
+from pyACA.ToolCache import ToolCache
+
 
 ## helper function: computes transfer functions of MFCC filter bands 
 # see function from Slaneys Auditory Toolbox (Matlab)
 #
 #    @param iFftLength: length of FFT
 #    @param f_s: sample rate of audio data
+#    @param bSparse: return a sparse (CSR) matrix instead of a dense array (default: False)
 #
 #    @return H: matrix with transfer functions
-def ToolMfccFb(iFftLength, f_s):
+@ToolCache(bCopy=True)
+def ToolMfccFb(iFftLength, f_s, bSparse=False):
+    from scipy.sparse import csr_matrix
 
     # initialization
     f_start = 133.3333
@@ -52,4 +57,7 @@ def ToolMfccFb(iFftLength, f_s):
         i_u = np.max([0, np.argmin(f_k < f_u[c]) - 1])
         H[c, np.arange(i_l, i_u + 1)] = afFilterMax[c] * (f_u[c] - f_k[np.arange(i_l, i_u + 1)]) / (f_u[c] - f_c[c])
 
+    if bSparse:
+        H = csr_matrix(H)
+
     return H
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import functools
+
+import numpy as np
+
+
+## helper function: decorator extending a spectral feature to multi-channel spectrograms
+# the channels are folded into the observation axis so that all channels are computed in one call;
+# only valid for features computed independently per observation
+#
+#    @param hFeatureFunc: feature function with the interface (X, f_s, ...)
+#
+#    @return hWrapper: feature function additionally accepting X with dimension (channels x FFTLength x Observations)
+#                      and returning (channels x ... x Observations)
+def ToolMultiChannelSpectral(hFeatureFunc):
+
+    @functools.wraps(hFeatureFunc)
+    def hWrapper(X, f_s, *args, **kwargs):
+
+        if X.ndim < 3:
+            return hFeatureFunc(X, f_s, *args, **kwargs)
+
+        [iNumChannels, iNumBins, iNumObs] = X.shape
+
+        # (channels x bins x obs) -> (bins x channels * obs)
+        v = hFeatureFunc(np.transpose(X, (1, 0, 2)).reshape(iNumBins, -1), f_s, *args, **kwargs)
+
+        # (... x channels * obs) -> (channels x ... x obs)
+        v = v.reshape(*v.shape[:-1], iNumChannels, iNumObs)
+
+        return np.ascontiguousarray(np.moveaxis(v, -2, 0))
+
+    return hWrapper
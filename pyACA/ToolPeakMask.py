@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+## helper function: marks the local maxima along the first axis of all columns at once
+# identical to scipy.signal.find_peaks(x, height=fMinHeight) per column: a peak is a sample larger than
+# its left neighbor followed by a smaller sample, flat peaks (plateaus) are marked at their middle
+# (rounded down), and the first and last sample are never peaks
+#
+#    @param X: data (dimension Length, or Length X Observations)
+#    @param fMinHeight: minimum height of the peaks (default: None, no threshold)
+#
+#    @return bPeaks: boolean mask of the peaks (same dimension as X)
+def ToolPeakMask(X, fMinHeight=None):
+
+    X = np.asarray(X)
+    isVector = X.ndim == 1
+    if isVector:
+        X = np.expand_dims(X, axis=1)
+
+    iLength = X.shape[0]
+    bPeaks = np.zeros(X.shape, dtype=bool)
+    if iLength < 3:
+        return bPeaks[:, 0] if isVector else bPeaks
+
+    bUp = X[1:] > X[:-1]
+    bDown = X[1:] < X[:-1]
+
+    # samples 1...iLength-2 rising from their left neighbor
+    bCandidate = bUp[:-1]
+    if fMinHeight is not None:
+        bCandidate &= X[1:-1] >= fMinHeight
+
+    # strict peaks are followed by a decrease
+    bPeaks[1:-1] = bCandidate & bDown[1:]
+
+    # plateaus start with an equal right neighbor, this is rare for real-valued data
+    bPlateau = bCandidate & ~(bUp[1:] | bDown[1:])
+    aiCols = np.flatnonzero(bPlateau.any(axis=0))
+    if aiCols.size:
+        # index of the next change (rise or decrease) at or after each difference (iLength - 1 if there is none)
+        bChange = bUp[:, aiCols] | bDown[:, aiCols]
+        aiNext = np.where(bChange, np.arange(0, iLength - 1)[:, np.newaxis], iLength - 1)
+        aiNext = np.minimum.accumulate(aiNext[::-1], axis=0)[::-1]
+
+        # the plateau i...i_ahead is a peak if it ends with a decrease
+        [aiLeft, aiCol] = np.nonzero(bPlateau[:, aiCols])
+        i_ahead = aiNext[aiLeft + 1, aiCol]
+        bIsPeak = i_ahead < iLength - 1
+        bIsPeak[bIsPeak] = bDown[i_ahead[bIsPeak], aiCols[aiCol[bIsPeak]]]
+
+        # mark the middle of each plateau
+        bPeaks[(aiLeft[bIsPeak] + 1 + i_ahead[bIsPeak]) // 2, aiCols[aiCol[bIsPeak]]] = True
+
+    return bPeaks[:, 0] if isVector else bPeaks
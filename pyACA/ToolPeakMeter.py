@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+## helper class: peak program meter (PPM) with attack and release ballistics
+# the filter state is kept between calls, so a signal can be processed chunk by chunk,
+# e.g., for live monitoring; the result is independent of the chunk sizes
+#
+#    @param f_s: sample rate of audio data
+#    @param fAttackTime: attack time in seconds (default: 0.01)
+#    @param fReleaseTime: release time in seconds (default: 1.5)
+#    @param iNumChannels: number of channels, chunks are (samples x channels) if larger than 1 (default: 1)
+class ToolPeakMeter:
+
+    def __init__(self, f_s, fAttackTime=0.01, fReleaseTime=1.5, iNumChannels=1):
+
+        self.alpha = 1 - np.array([np.exp(-2.2 / (f_s * fAttackTime)), np.exp(-2.2 / (f_s * fReleaseTime))])
+        self.iNumChannels = iNumChannels
+
+        self.reset()
+
+    ## resets the filter state to zero
+    def reset(self):
+
+        self.afState = np.zeros(self.iNumChannels)
+
+    ## processes the next chunk of audio
+    #
+    #    @param x: audio chunk (dimension samples, or samples x channels)
+    #
+    #    @return v_ppm: peak envelope per sample (linear, same dimension as x)
+    def process(self, x):
+
+        x = np.asarray(x)
+        if x.ndim == 1:
+            [v_ppm, self.afState[0]] = ToolPpmFilter(np.abs(x), self.afState[0], self.alpha)
+            return v_ppm
+
+        assert(x.shape[1] == self.iNumChannels), "parameter error: invalid number of channels"
+
+        # channels first, so that each channel is written contiguously
+        v_ppm = np.zeros(x.shape[::-1], dtype=np.result_type(x.dtype, np.float32))
+        for c in range(0, self.iNumChannels):
+            [v_ppm[c], self.afState[c]] = ToolPpmFilter(np.abs(x[:, c]), self.afState[c], self.alpha)
+
+        return v_ppm.T
+
+
+## helper function: PPM recursion with attack and release ballistics over a (rectified) signal
+# the switch between attack and release depends on the previous output, so this recursion runs
+# sample by sample; it operates on python floats, which is much faster than indexing numpy arrays
+#
+#    @param x: rectified signal (dimension samples)
+#    @param fState: previous output, e.g., the last output of the previous chunk
+#    @param alpha: attack and release coefficients
+#
+#    @return v_ppm: peak envelope per sample (linear)
+#    @return fState: last output
+def ToolPpmFilter(x, fState, alpha):
+
+    fAlphaAttack = float(alpha[0])
+    fAlphaRelease = float(alpha[1])
+    fState = float(fState)
+
+    afOut = x.tolist()
+    for i, fIn in enumerate(afOut):
+        if fState > fIn:
+            # release state
+            fState = (1 - fAlphaRelease) * fState
+        else:
+            # attack state
+            fState = fAlphaAttack * fIn + (1 - fAlphaAttack) * fState
+        afOut[i] = fState
+
+    return np.array(afOut, dtype=np.result_type(x.dtype, np.float32)), fState
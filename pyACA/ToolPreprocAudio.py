@@ -4,20 +4,27 @@ import numpy as np
 
 from pyACA.ToolDownmix import ToolDownmix
 from pyACA.ToolNormalizeAudio import ToolNormalizeAudio
+from pyACA.ToolProfiler import ToolProfile
 
 
 ## helper function: pre-processes an audio signal 
 #
 #    @param x: array with floating point audio data (dimension samples x channels)
 #    @param bNormalize: flag to switch off normalization (default: True)
+#    @param dtype: data type of the output, e.g. np.float32 (default: None, unchanged)
+#    @param bDownmix: flag to switch off downmixing and keep all channels (default: True)
 #
 #    @return x_pp: pre-processed signal
-def ToolPreprocAudio(x, bNormalize=True):
+@ToolProfile
+def ToolPreprocAudio(x, bNormalize=True, dtype=None, bDownmix=True):
+
+    if dtype is not None:
+        x = np.asarray(x, dtype=dtype)
 
     # pre-processing: downmixing
-    x_pp = ToolDownmix(x)
+    x_pp = ToolDownmix(x) if bDownmix else x
     
-    # pre-processing: normalization
+    # pre-processing: normalization (one gain for all channels to keep the balance)
     if bNormalize:
         x_pp = ToolNormalizeAudio(x_pp)
  
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import inspect
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+
+# currently active profilers, spans are only measured if this is not empty
+activeProfilers = []
+
+# stack of open spans per thread
+spanStack = threading.local()
+
+
+## helper class: opt-in profiler measuring the stages of the compute functions
+# usage:
+#    with pyACA.ToolProfiler() as prof:
+#        pyACA.computeChords(x, f_s)
+#    prof.report()
+#
+#    @param bMemory: track the peak of allocated bytes per stage with tracemalloc, slows down the computation (default: False)
+class ToolProfiler:
+
+    def __init__(self, bMemory=False):
+
+        self.bMemory = bMemory
+        self.results = dict()
+        self.lock = threading.Lock()
+        self.bStartedTracing = False
+
+    def __enter__(self):
+
+        if self.bMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.bStartedTracing = True
+
+        activeProfilers.append(self)
+
+        return self
+
+    def __exit__(self, *args):
+
+        activeProfilers.remove(self)
+
+        if self.bStartedTracing:
+            tracemalloc.stop()
+            self.bStartedTracing = False
+
+    ## returns the measurements per stage
+    #
+    #    @return dict with the stage path (e.g., 'computeChords/computeFeature/computeSpectrogram/fft') as key and a dict of
+    #            iNumCalls, fTime (seconds), iBytes (peak allocation, None without bMemory), iNumFrames, fRealTimeFactor (None if the audio duration is unknown)
+    def getResults(self):
+
+        with self.lock:
+            results = {cPath: dict(result) for cPath, result in self.results.items()}
+
+        for result in results.values():
+            result["fRealTimeFactor"] = result["fTime"] / result["fDuration"] if result["fDuration"] else None
+            del result["fDuration"]
+
+        return results
+
+    ## prints the measurements per stage as indented table
+    def report(self):
+
+        print("%-56s %6s %10s %8s %12s %10s" % ("stage", "calls", "time/s", "rtf", "MB", "frames"))
+        for cPath, result in self.getResults().items():
+            iDepth = cPath.count("/")
+            cName = "  " * iDepth + cPath.split("/")[-1]
+            cRtf = "%8.4f" % result["fRealTimeFactor"] if result["fRealTimeFactor"] is not None else "%8s" % "-"
+            cBytes = "%12.2f" % (result["iBytes"] / 2**20) if result["iBytes"] is not None else "%12s" % "-"
+            cFrames = "%10d" % result["iNumFrames"] if result["iNumFrames"] else "%10s" % "-"
+            print("%-56s %6d %10.4f %s %s %s" % (cName, result["iNumCalls"], result["fTime"], cRtf, cBytes, cFrames))
+
+    def open_I(self, cPath):
+
+        # register on entry so that the stages are reported in call order
+        with self.lock:
+            self.results.setdefault(cPath, {"iNumCalls": 0, "fTime": 0., "iBytes": None, "iNumFrames": 0, "fDuration": 0.})
+
+    def record_I(self, cPath, fTime, iBytes, iNumFrames, fDuration):
+
+        with self.lock:
+            result = self.results[cPath]
+            result["iNumCalls"] += 1
+            result["fTime"] += fTime
+            result["iNumFrames"] += iNumFrames
+            result["fDuration"] += fDuration
+            if iBytes is not None:
+                result["iBytes"] = iBytes if result["iBytes"] is None else max(result["iBytes"], iBytes)
+
+
+## helper function: named span around a processing stage, does nothing if no profiler is active
+#
+#    @param cName: name of the stage
+#    @param iNumFrames: number of frames (blocks) processed in this stage (default: 0)
+#    @param fDuration: duration of the processed audio in seconds, inherited from the enclosing stage if None (default: None)
+#
+#    @return context manager
+def ToolProfileSpan(cName, iNumFrames=0, fDuration=None):
+
+    if not activeProfilers:
+        return nullSpan
+
+    return Span_I(cName, iNumFrames, fDuration)
+
+
+## helper function: decorator measuring each call of a function as span of the same name
+# the audio duration is taken from the arguments x and f_s if the function has them
+#
+#    @param hFunc: function to measure
+#
+#    @return hWrapper: measured function
+def ToolProfile(hFunc):
+
+    signature = inspect.signature(hFunc)
+    bHasAudio = "x" in signature.parameters and "f_s" in signature.parameters
+
+    @functools.wraps(hFunc)
+    def hWrapper(*args, **kwargs):
+
+        if not activeProfilers:
+            return hFunc(*args, **kwargs)
+
+        fDuration = None
+        if bHasAudio:
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            x = arguments.get("x")
+            f_s = arguments.get("f_s")
+            if hasattr(x, "shape") and x.ndim and np.isscalar(f_s) and f_s > 0:
+                fDuration = x.shape[0] / f_s
+
+        with Span_I(hFunc.__name__, 0, fDuration):
+            return hFunc(*args, **kwargs)
+
+    return hWrapper
+
+
+## helper function: binds a function to the span open in the calling thread
+# spans are tracked per thread, so spans opened in worker threads (e.g., of a ThreadPoolExecutor) are nested in this span
+# only if the function is wrapped before it is handed to the workers; the memory of worker spans is not tracked
+#
+#    @param hFunc: function to be called in worker threads
+#
+#    @return hWrapper: function running hFunc below the current span
+def ToolProfileInherit(hFunc):
+
+    stack = getattr(spanStack, "stack", None)
+    if not activeProfilers or not stack:
+        return hFunc
+
+    parent = ParentSpan_I(stack[-1].cPath, stack[-1].fDuration)
+
+    @functools.wraps(hFunc)
+    def hWrapper(*args, **kwargs):
+
+        stack = getattr(spanStack, "stack", None)
+        if stack is None:
+            stack = spanStack.stack = []
+
+        stack.append(parent)
+        try:
+            return hFunc(*args, **kwargs)
+        finally:
+            stack.pop()
+
+    return hWrapper
+
+
+# placeholder for a span of another thread at the bottom of a worker's span stack
+class ParentSpan_I:
+
+    def __init__(self, cPath, fDuration):
+
+        self.cPath = cPath
+        self.fDuration = fDuration
+        self.bMemory = False
+
+
+class NullSpan_I:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+nullSpan = NullSpan_I()
+
+
+class Span_I:
+
+    def __init__(self, cName, iNumFrames, fDuration):
+
+        self.cName = cName
+        self.iNumFrames = iNumFrames
+        self.fDuration = fDuration
+
+    def __enter__(self):
+
+        stack = getattr(spanStack, "stack", None)
+        if stack is None:
+            stack = spanStack.stack = []
+
+        if stack:
+            parent = stack[-1]
+            self.cPath = parent.cPath + "/" + self.cName
+            if self.fDuration is None:
+                self.fDuration = parent.fDuration
+        else:
+            self.cPath = self.cName
+
+        # track the peak allocation of this span separately from the enclosing span (not below a span of another thread)
+        self.bMemory = tracemalloc.is_tracing() and (not stack or stack[-1].bMemory)
+        if self.bMemory:
+            iCurrent, iPeak = tracemalloc.get_traced_memory()
+            if stack and stack[-1].bMemory:
+                stack[-1].iPeak = max(stack[-1].iPeak, iPeak)
+            tracemalloc.reset_peak()
+            self.iStart = iCurrent
+            self.iPeak = 0
+
+        self.profilers = list(activeProfilers)
+        for profiler in self.profilers:
+            profiler.open_I(self.cPath)
+
+        stack.append(self)
+        self.fStart = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *args):
+
+        fTime = time.perf_counter() - self.fStart
+
+        stack = spanStack.stack
+        stack.pop()
+
+        iBytes = None
+        if self.bMemory and tracemalloc.is_tracing():
+            iCurrent, iPeak = tracemalloc.get_traced_memory()
+            iPeak = max(self.iPeak, iPeak)
+            iBytes = iPeak - self.iStart
+            if stack and stack[-1].bMemory:
+                stack[-1].iPeak = max(stack[-1].iPeak, iPeak)
+
+        # spans without known audio duration do not contribute to the real-time factor
+        fDuration = self.fDuration if self.fDuration is not None else 0.
+
+        for profiler in self.profilers:
+            profiler.record_I(self.cPath, fTime, iBytes, self.iNumFrames, fDuration)
+
+        return False
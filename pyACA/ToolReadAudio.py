@@ -1,32 +1,165 @@
 # -*- coding: utf-8 -*-
 
-from scipy.io.wavfile import read as wavread
+import os
+import struct
+
+import numpy as np
 
 
 ## helper function: read audio from wav
 #
 #    @param cAudioFilePath: path to audio file
+#    @param dtype: floating point data type of the output, e.g. np.float32 (default: None, float32 for float files, float64 otherwise)
 #
 #    @return f_s: sample rate
 #    @return x: array with floating point audio data (dimension samples x channels)
-def ToolReadAudio(cAudioFilePath):
+def ToolReadAudio(cAudioFilePath, dtype=None):
+    from scipy.io.wavfile import read as wavread
     [f_s, x] = wavread(cAudioFilePath)
 
-    if x.dtype == 'float32':
-        x = x
+    return f_s, scaleAudio_I(x, dtype)
+
+
+## helper function: read audio from wav in chunks of fixed length without loading the whole file
+# the data is memory mapped; formats that cannot be mapped (e.g., 24 bit) are read chunk by chunk from the file
+#
+#    @param cAudioFilePath: path to audio file
+#    @param iChunkLength: number of samples per chunk (default: 1048576), the last chunk may be shorter
+#    @param dtype: floating point data type of the output, e.g. np.float32 (default: None, float32 for float files, float64 otherwise)
+#
+#    @return generator yielding arrays with floating point audio data (dimension samples x channels)
+def ToolReadAudioChunks(cAudioFilePath, iChunkLength=1048576, dtype=None):
+    from scipy.io.wavfile import read as wavread
+    try:
+        # memory map the data, only the header is read
+        [f_s, x] = wavread(cAudioFilePath, mmap=True)
+    except ValueError:
+        yield from readChunks_I(cAudioFilePath, iChunkLength, dtype)
+        return
+
+    for i in range(0, x.shape[0], iChunkLength):
+        yield scaleAudio_I(x[i:i + iChunkLength], dtype)
+
+
+## helper function: read the properties of a wav file without reading the audio data
+# only the RIFF header is parsed
+#
+#    @param cAudioFilePath: path to audio file
+#
+#    @return f_s: sample rate
+#    @return iNumChannels: number of channels
+#    @return iNumSamples: number of samples per channel
+def ToolReadAudioInfo(cAudioFilePath):
+    [f_s, iNumChannels, iNumSamples] = readHeader_I(cAudioFilePath)[:3]
+
+    return f_s, iNumChannels, iNumSamples
+
+
+# parses the RIFF header up to the start of the data chunk
+def readHeader_I(cAudioFilePath):
+
+    with open(cAudioFilePath, 'rb') as hFile:
+        cRiff = hFile.read(4)
+        if cRiff not in (b'RIFF', b'RIFX'):
+            raise ValueError("file format not supported: no RIFF header")
+        cEndian = '<' if cRiff == b'RIFF' else '>'
+        hFile.read(4)
+        if hFile.read(4) != b'WAVE':
+            raise ValueError("file format not supported: no WAVE file")
+
+        fmt = None
+        while True:
+            cId = hFile.read(4)
+            cSize = hFile.read(4)
+            if len(cSize) < 4:
+                raise ValueError("file format not supported: no data chunk")
+            iSize = struct.unpack(cEndian + 'I', cSize)[0]
+
+            if cId == b'fmt ':
+                fmt = hFile.read(iSize)
+                hFile.seek(iSize % 2, 1)
+            elif cId == b'data':
+                break
+            else:
+                # chunks are padded to an even number of bytes
+                hFile.seek(iSize + iSize % 2, 1)
+
+        if fmt is None or len(fmt) < 16:
+            raise ValueError("file format not supported: no fmt chunk before the data")
+        iDataOffset = hFile.tell()
+
+    [iFormat, iNumChannels, f_s, iBytesPerSec, iBlockAlign, iBitsPerSample] = struct.unpack(cEndian + 'HHIIHH', fmt[:16])
+    if iFormat == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE: the format is the start of the sub format GUID
+        iFormat = struct.unpack(cEndian + 'H', fmt[24:26])[0]
+    if not iNumChannels or iBlockAlign % iNumChannels:
+        raise ValueError("file format not supported: invalid block alignment")
+
+    # the size in the header may be a placeholder for files written by streaming applications
+    iDataSize = min(iSize, os.path.getsize(cAudioFilePath) - iDataOffset)
+
+    return f_s, iNumChannels, iDataSize // iBlockAlign, iDataOffset, iFormat, iBlockAlign // iNumChannels, cEndian
+
+
+# reads the data chunk incrementally, for sample formats that cannot be memory mapped
+def readChunks_I(cAudioFilePath, iChunkLength, dtype):
+
+    [f_s, iNumChannels, iNumSamples, iDataOffset, iFormat, iBytes, cEndian] = readHeader_I(cAudioFilePath)
+
+    # sample type as stored in the file, None for integers with an odd number of bytes
+    if iFormat == 1 and iBytes == 1:
+        sampleType = np.dtype('u1')
+    elif iFormat == 1 and iBytes in (2, 4, 8):
+        sampleType = np.dtype(cEndian + 'i' + str(iBytes))
+    elif iFormat == 1 and 1 < iBytes < 8:
+        sampleType = None
+    elif iFormat == 3 and iBytes in (4, 8):
+        sampleType = np.dtype(cEndian + 'f' + str(iBytes))
     else:
-        # change range to [-1,1)
-        if x.dtype == 'uint8':
-            nbits = 8
-        elif x.dtype == 'int16':
-            nbits = 16
-        elif x.dtype == 'int32':
-            nbits = 32
+        raise ValueError("file format not supported: format " + str(iFormat) + " with " + str(iBytes) + " bytes per sample")
+
+    with open(cAudioFilePath, 'rb') as hFile:
+        hFile.seek(iDataOffset)
+        for i in range(0, iNumSamples, iChunkLength):
+            iLength = min(iChunkLength, iNumSamples - i)
+            if sampleType is not None:
+                x = np.fromfile(hFile, dtype=sampleType, count=iLength * iNumChannels)
+            else:
+                x = unpackSamples_I(np.fromfile(hFile, dtype=np.uint8, count=iLength * iNumChannels * iBytes), iBytes, cEndian)
+
+            # mono data is one-dimensional as in ToolReadAudio
+            yield scaleAudio_I(x if iNumChannels == 1 else x.reshape(-1, iNumChannels), dtype)
+
+
+# converts integer samples with an odd number of bytes (e.g., 24 bit) to left-justified int32 or int64 as scipy does
+def unpackSamples_I(acBytes, iBytes, cEndian):
+
+    iNumBytesOut = 4 if iBytes < 4 else 8
+    acOut = np.zeros([acBytes.shape[0] // iBytes, iNumBytesOut], dtype=np.uint8)
+    acBytes = acBytes.reshape(-1, iBytes)
+    if cEndian == '<':
+        acOut[:, iNumBytesOut - iBytes:] = acBytes
+    else:
+        acOut[:, :iBytes] = acBytes
+
+    return acOut.view(cEndian + 'i' + str(iNumBytesOut)).ravel()
+
+
+def scaleAudio_I(x, dtype):
+    if x.dtype == 'float32':
+        return np.array(x, dtype=np.float32 if dtype is None else dtype)
+    if x.dtype.kind == 'f':
+        return np.array(x, dtype=np.float64 if dtype is None else dtype)
+
+    # change range to [-1,1)
+    nbits = 8 * x.dtype.itemsize
 
-        x = x / float(2**(nbits - 1))
+    # convert directly to the target type and scale in place to avoid a float64 copy
+    afOut = x.astype(np.float64 if dtype is None else dtype)
+    afOut /= 2**(nbits - 1)
 
     # special case of unsigned format
     if x.dtype == 'uint8':
-        x = x - 1.
+        afOut -= 1.
 
-    return f_s, x
+    return afOut
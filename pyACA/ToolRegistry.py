@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+ToolRegistry
+
+static descriptors of all features, pitch trackers and novelty functions;
+the implementing modules are only imported when a function is requested
+"""
+
+import importlib
+
+
+## descriptors per type and name:
+#    cDomain: 'spectral' (input magnitude spectrogram) or 'temporal' (input audio signal)
+#    iNumDims: output dimension per block with the default parameters
+#    cIntermediates: intermediate representations used by the implementation ('magnitude', 'power', 'blocks', 'signal');
+#                    temporal features (type 'Feature') using 'blocks' are computed from shared blocks through their parameter x_b
+#    defaults: default values of all optional parameters, including the computation type dtype and the shared blocks x_b
+registry = {
+    "Feature": {
+        "SpectralCentroid": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralCrestFactor": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralDecrease": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralFlatness": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralFlux": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralKurtosis": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralMfccs": {"cDomain": "spectral", "iNumDims": 13, "cIntermediates": ("magnitude",), "defaults": {"iNumCoeffs": 13, "fLogFloor": 1e-20, "H": None}},
+        "SpectralPitchChroma": {"cDomain": "spectral", "iNumDims": 12, "cIntermediates": ("power",), "defaults": {}},
+        "SpectralRolloff": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {"kappa": 0.85}},
+        "SpectralSkewness": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {"UseBookDefinition": False}},
+        "SpectralSlope": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralSpread": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralTonalPowerRatio": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("power",), "defaults": {"G_T": 5e-4}},
+        "TimeAcfCoeff": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("blocks",), "defaults": {"eta": 19, "dtype": None, "x_b": None}},
+        "TimeMaxAcf": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("blocks",), "defaults": {"f_max": 2000, "fMinThresh": 0.35, "dtype": None, "x_b": None}},
+        "TimePeakEnvelope": {"cDomain": "temporal", "iNumDims": 2, "cIntermediates": ("signal",), "defaults": {"dtype": None}},
+        "TimeRms": {"cDomain": "temporal", "iNumDims": 2, "cIntermediates": ("signal",), "defaults": {"dtype": None}},
+        "TimeStd": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("signal",), "defaults": {"dtype": None, "x_b": None}},
+        "TimeZeroCrossingRate": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("signal",), "defaults": {"dtype": None, "x_b": None}},
+    },
+    "Pitch": {
+        "SpectralAcf": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "SpectralHps": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "TimeAcf": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("blocks",), "defaults": {}},
+        "TimeAmdf": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("blocks",), "defaults": {}},
+        "TimeAuditory": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("signal",), "defaults": {}},
+        "TimeZeroCrossings": {"cDomain": "temporal", "iNumDims": 1, "cIntermediates": ("blocks",), "defaults": {}},
+    },
+    "Novelty": {
+        "Flux": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "Hainsworth": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+        "Laroche": {"cDomain": "spectral", "iNumDims": 1, "cIntermediates": ("magnitude",), "defaults": {}},
+    },
+}
+
+# resolved functions as (type, name): function
+functions = dict()
+
+
+## helper function: returns the descriptor of a feature, pitch tracker, or novelty function
+#
+#    @param cName: name without type prefix, e.g. 'SpectralCentroid'
+#    @param cType: 'Feature', 'Pitch', or 'Novelty' (default: 'Feature')
+#
+#    @return descriptor: dict with cName, cType, cDomain, iNumDims, cIntermediates, and defaults
+def ToolGetDescriptor(cName, cType="Feature"):
+
+    assert(cType in registry), "parameter error: invalid type " + str(cType)
+    assert(cName in registry[cType]), "parameter error: unknown " + cType.lower() + " " + str(cName)
+
+    descriptor = dict(registry[cType][cName], cName=cName, cType=cType)
+    descriptor["defaults"] = dict(descriptor["defaults"])
+
+    return descriptor
+
+
+## helper function: returns the function implementing a feature, pitch tracker, or novelty function
+#
+#    @param cName: name without type prefix, e.g. 'SpectralCentroid'
+#    @param cType: 'Feature', 'Pitch', or 'Novelty' (default: 'Feature')
+#
+#    @return hFunc: function, e.g. FeatureSpectralCentroid
+def ToolGetFunction(cName, cType="Feature"):
+
+    hFunc = functions.get((cType, cName))
+    if hFunc is None:
+        assert(cType in registry and cName in registry[cType]), "parameter error: unknown " + str(cType).lower() + " " + str(cName)
+        hFunc = getattr(importlib.import_module("pyACA." + cType + cName), cType + cName)
+        functions[(cType, cName)] = hFunc
+
+    return hFunc
+
+
+## helper function: groups names by their intermediate representations, e.g., to share them in a batch
+#
+#    @param cNames: list of names without type prefix
+#    @param cType: 'Feature', 'Pitch', or 'Novelty' (default: 'Feature')
+#
+#    @return groups: dict with the tuple of intermediates as key and the list of names as value (in input order)
+def ToolGroupByIntermediate(cNames, cType="Feature"):
+
+    groups = dict()
+    for cName in cNames:
+        groups.setdefault(ToolGetDescriptor(cName, cType)["cIntermediates"], []).append(cName)
+
+    return groups
+
@@ -1,9 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from scipy.signal import butter
-from scipy.signal import filtfilt
-from scipy.interpolate import interp1d
+from pyACA.ToolProfiler import ToolProfile
 
 
 ## helper function: downmixes an audio signal into one channel
@@ -14,7 +12,11 @@ from scipy.interpolate import interp1d
 #
 #    @return x_out: resampled audio signal
 #    @return t_out: corresponding time vector
+@ToolProfile
 def ToolResample(x, fs_out, fs_in):
+    from scipy.signal import butter
+    from scipy.signal import filtfilt
+    from scipy.interpolate import interp1d
 
     if fs_out > fs_in:
         omega_cutoff = fs_in / fs_out
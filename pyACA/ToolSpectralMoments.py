@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from pyACA.ToolCache import ToolCache
+from pyACA.ToolMultiChannel import ToolMultiChannelSpectral
+
+
+# features derived from the spectral moments with their row in the output of ToolSpectralMoments
+cMomentFeatures = {"SpectralCentroid": 0, "SpectralSpread": 1, "SpectralSkewness": 2, "SpectralKurtosis": 3}
+
+
+## helper function: computes the first four spectral moments of all observations in one pass over the spectrogram
+# the raw moments are matrix products of X with a power basis of the bin index; observations where
+# deriving the central moments from the raw moments would lose precision are recomputed with explicit centering
+#
+#    @param X: spectrogram (dimension FFTLength X Observations)
+#    @param f_s: sample rate of audio data
+#    @param cFeatureName: name of a moment feature, e.g. 'SpectralCentroid', to return only its row (default: None, all moments)
+#
+#    @return M: moments (dimension 4 X Observations), rows: centroid (in Hz), spread (in Hz), skewness, kurtosis (excess)
+@ToolMultiChannelSpectral
+def ToolSpectralMoments(X, f_s, cFeatureName=None):
+
+    isSpectrum = X.ndim == 1
+    if isSpectrum:
+        X = np.expand_dims(X, axis=1)
+
+    iNumBins = X.shape[0]
+
+    # raw moments (index and centered and scaled index powers) in double precision
+    B = generateMomentBasis_I(iNumBins)
+    R = B @ X.astype(np.float64, copy=False)
+
+    norm = R[0]
+    norm[norm == 0] = 1
+    R[1:] /= norm
+
+    # centroid as index, central moments of the scaled index
+    vsc = R[1]
+    fCenter, fScale = getBasisCenter_I(iNumBins)
+    a = (vsc - fCenter) / fScale
+    mu2 = R[2] - a**2
+    mu3 = R[3] - 3 * a * R[2] + 2 * a**3
+    mu4 = R[4] - 4 * a * R[3] + 6 * a**2 * R[2] - 3 * a**4
+
+    # recompute narrow distributions far from the basis center explicitly
+    bExact = (R[2] > 1e4 * mu2) | (R[4] > 1e4 * mu4)
+    if bExact.any():
+        D = (np.arange(0, iNumBins, dtype=np.float64)[:, np.newaxis] - vsc[bExact]) / fScale
+        P = X[:, bExact] / norm[bExact] * D**2
+        mu2[bExact] = P.sum(axis=0)
+        P *= D
+        mu3[bExact] = P.sum(axis=0)
+        P *= D
+        mu4[bExact] = P.sum(axis=0)
+
+    vss = np.sqrt(np.maximum(mu2, 0))
+    std = vss.copy()
+    std[std == 0] = 1
+
+    # convert from index to Hz
+    fBinToHz = f_s / 2 / (iNumBins - 1) if iNumBins > 1 else 0
+    M = np.stack([vsc * fBinToHz, vss * fScale * fBinToHz, mu3 / std**3, mu4 / std**4 - 3])
+    M = M.astype(np.result_type(X.dtype, np.float32), copy=False)
+
+    if cFeatureName is not None:
+        M = M[cMomentFeatures[cFeatureName]]
+
+    if isSpectrum:
+        return M[:, 0] if M.ndim > 1 else M[0]
+
+    return M
+
+
+@ToolCache()
+def generateMomentBasis_I(iNumBins):
+
+    k = np.arange(0, iNumBins, dtype=np.float64)
+    fCenter, fScale = getBasisCenter_I(iNumBins)
+    u = (k - fCenter) / fScale
+
+    return np.stack([np.ones(iNumBins), k, u**2, u**3, u**4])
+
+
+def getBasisCenter_I(iNumBins):
+
+    fCenter = (iNumBins - 1) / 2
+
+    return fCenter, max(fCenter, 1)
+
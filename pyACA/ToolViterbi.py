@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from pyACA.ToolProfiler import ToolProfile
+
 
 ## helper function: viterbi algorithm
 #
@@ -12,6 +14,7 @@ import numpy as np
 #
 #    @return p: path with matrix row indices (length: observations)
 #    @return P_res probability matrix
+@ToolProfile
 def ToolViterbi(P_E, P_T, p_s, bUseLogLikelihood=False):
 
     if not bUseLogLikelihood:
@@ -1,78 +1,162 @@
 #
 name = "pyACA"
-from .computeBeatHisto import computeBeatHisto
-from .computeChords import computeChords
-from .computeFeature import computeFeature
-from .computeFingerprint import computeFingerprint
-from .computeKey import computeKey
-from .computeSpectrogram import computeSpectrogram
-from .computeMelSpectrogram import computeMelSpectrogram
-from .computeNoveltyFunction import computeNoveltyFunction
-from .computePitch import computePitch
-
-from .computeBeatHisto import computeBeatHistoCl
-from .computeChords import computeChordsCl
-from .computeFeature import computeFeatureCl
-from .computeFingerprint import computeFingerprintCl
-from .computeKey import computeKeyCl
-from .computeMelSpectrogram import computeMelSpectrogramCl
-from .computeNoveltyFunction import computeNoveltyFunctionCl
-from .computePitch import computePitchCl
-from .computeSpectrogram import computeSpectrogramCl
-
-from .FeatureSpectralCentroid import FeatureSpectralCentroid
-from .FeatureSpectralCrestFactor import FeatureSpectralCrestFactor
-from .FeatureSpectralDecrease import FeatureSpectralDecrease
-from .FeatureSpectralFlatness import FeatureSpectralFlatness
-from .FeatureSpectralFlux import FeatureSpectralFlux
-from .FeatureSpectralKurtosis import FeatureSpectralKurtosis
-from .FeatureSpectralMfccs import FeatureSpectralMfccs
-from .FeatureSpectralPitchChroma import FeatureSpectralPitchChroma
-from .FeatureSpectralRolloff import FeatureSpectralRolloff
-from .FeatureSpectralSkewness import FeatureSpectralSkewness
-from .FeatureSpectralSlope import FeatureSpectralSlope
-from .FeatureSpectralSpread import FeatureSpectralSpread
-from .FeatureSpectralTonalPowerRatio import FeatureSpectralTonalPowerRatio
-from .FeatureTimeAcfCoeff import FeatureTimeAcfCoeff
-from .FeatureTimeMaxAcf import FeatureTimeMaxAcf
-from .FeatureTimePeakEnvelope import FeatureTimePeakEnvelope
-from .FeatureTimeRms import FeatureTimeRms
-from .FeatureTimeStd import FeatureTimeStd
-from .FeatureTimeZeroCrossingRate import FeatureTimeZeroCrossingRate
-
-from .getFeatureList import getFeatureList
-
-from .NoveltyFlux import NoveltyFlux
-from .NoveltyHainsworth import NoveltyHainsworth
-from .NoveltyLaroche import NoveltyLaroche
-
-from .PitchSpectralAcf import PitchSpectralAcf
-from .PitchSpectralHps import PitchSpectralHps
-from .PitchTimeAcf import PitchTimeAcf
-from .PitchTimeAmdf import PitchTimeAmdf
-from .PitchTimeAuditory import PitchTimeAuditory
-from .PitchTimeZeroCrossings import PitchTimeZeroCrossings
-
-from .ToolBlockAudio import ToolBlockAudio
-from .ToolComputeHann import ToolComputeHann
-from .ToolDownmix import ToolDownmix
-from .ToolFreq2Bark import ToolFreq2Bark
-from .ToolGmm import ToolGmm
-from .ToolLooCrossVal import ToolLooCrossVal
-from .ToolBin2Freq import ToolBin2Freq
-from .ToolFreq2Bin import ToolFreq2Bin
-from .ToolFreq2Mel import ToolFreq2Mel
-from .ToolFreq2Midi import ToolFreq2Midi
-from .ToolInstFreq import ToolInstFreq
-from .ToolMel2Freq import ToolMel2Freq
-from .ToolMidi2Freq import ToolMidi2Freq
-from .ToolNormalizeAudio import ToolNormalizeAudio
-from .ToolPca import ToolPca
-from .ToolReadAudio import ToolReadAudio
-from .ToolResample import ToolResample
-from .ToolSeqFeatureSel import ToolSeqFeatureSel
-from .ToolSimpleDtw import ToolSimpleDtw
-from .ToolSimpleKmeans import ToolSimpleKmeans
-from .ToolSimpleKnn import ToolSimpleKnn
-from .ToolSimpleNmf import ToolSimpleNmf
-from .ToolViterbi import ToolViterbi
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+# public functions and classes with the submodule defining them
+# the submodules are imported on first access only (PEP 562), so that `import pyACA` stays fast
+cExports = {
+    "computeBatch": "computeBatch",
+    "computeBeatHisto": "computeBeatHisto",
+    "computeChords": "computeChords",
+    "computeFeature": "computeFeature",
+    "computeFeatures": "computeFeature",
+    "StreamingFeatures": "computeFeature",
+    "computeFingerprint": "computeFingerprint",
+    "computeKey": "computeKey",
+    "computeSpectrogram": "computeSpectrogram",
+    "StreamingSpectrogram": "computeSpectrogram",
+    "computeMelSpectrogram": "computeMelSpectrogram",
+    "computeNoveltyFunction": "computeNoveltyFunction",
+    "computePitch": "computePitch",
+
+    "computeBatchCl": "computeBatch",
+    "computeBeatHistoCl": "computeBeatHisto",
+    "computeChordsCl": "computeChords",
+    "computeFeatureCl": "computeFeature",
+    "computeFeaturesCl": "computeFeature",
+    "computeFingerprintCl": "computeFingerprint",
+    "computeKeyCl": "computeKey",
+    "computeMelSpectrogramCl": "computeMelSpectrogram",
+    "computeNoveltyFunctionCl": "computeNoveltyFunction",
+    "computePitchCl": "computePitch",
+    "computeSpectrogramCl": "computeSpectrogram",
+
+    "FeatureSpectralCentroid": "FeatureSpectralCentroid",
+    "FeatureSpectralCrestFactor": "FeatureSpectralCrestFactor",
+    "FeatureSpectralDecrease": "FeatureSpectralDecrease",
+    "FeatureSpectralFlatness": "FeatureSpectralFlatness",
+    "FeatureSpectralFlux": "FeatureSpectralFlux",
+    "FeatureSpectralKurtosis": "FeatureSpectralKurtosis",
+    "FeatureSpectralMfccs": "FeatureSpectralMfccs",
+    "FeatureSpectralPitchChroma": "FeatureSpectralPitchChroma",
+    "FeatureSpectralRolloff": "FeatureSpectralRolloff",
+    "FeatureSpectralSkewness": "FeatureSpectralSkewness",
+    "FeatureSpectralSlope": "FeatureSpectralSlope",
+    "FeatureSpectralSpread": "FeatureSpectralSpread",
+    "FeatureSpectralTonalPowerRatio": "FeatureSpectralTonalPowerRatio",
+    "FeatureTimeAcfCoeff": "FeatureTimeAcfCoeff",
+    "FeatureTimeMaxAcf": "FeatureTimeMaxAcf",
+    "FeatureTimePeakEnvelope": "FeatureTimePeakEnvelope",
+    "FeatureTimeRms": "FeatureTimeRms",
+    "FeatureTimeStd": "FeatureTimeStd",
+    "FeatureTimeZeroCrossingRate": "FeatureTimeZeroCrossingRate",
+
+    "getFeatureList": "getFeatureList",
+
+    "NoveltyFlux": "NoveltyFlux",
+    "NoveltyHainsworth": "NoveltyHainsworth",
+    "NoveltyLaroche": "NoveltyLaroche",
+
+    "PitchSpectralAcf": "PitchSpectralAcf",
+    "PitchSpectralHps": "PitchSpectralHps",
+    "PitchTimeAcf": "PitchTimeAcf",
+    "PitchTimeAmdf": "PitchTimeAmdf",
+    "PitchTimeAuditory": "PitchTimeAuditory",
+    "PitchTimeZeroCrossings": "PitchTimeZeroCrossings",
+
+    "ToolAcf": "ToolAcf",
+    "ToolAcfMaxima": "ToolAcf",
+    "ToolAllocOutput": "ToolAllocOutput",
+    "ToolFlushOutput": "ToolAllocOutput",
+    "ToolGetChunkLength": "ToolAllocOutput",
+    "ToolBlockAudio": "ToolBlockAudio",
+    "ToolBlockAudioIter": "ToolBlockAudio",
+    "ToolBlockBuffer": "ToolBlockAudio",
+    "ToolBlockTimeStamps": "ToolBlockAudio",
+    "ToolBlockMax": "ToolBlockStatistics",
+    "ToolBlockSpectrum": "ToolBlockSpectrum",
+    "ToolBlockSpectrumChunks": "ToolBlockSpectrum",
+    "ToolBlockStd": "ToolBlockStatistics",
+    "ToolBlockSum": "ToolBlockStatistics",
+    "ToolCache": "ToolCache",
+    "ToolCacheClear": "ToolCache",
+    "ToolCacheInfo": "ToolCache",
+    "ToolComputeHann": "ToolComputeHann",
+    "ToolDownmix": "ToolDownmix",
+    "ToolFeatureSummary": "ToolFeatureSummary",
+    "ToolFreq2Bark": "ToolFreq2Bark",
+    "ToolGmm": "ToolGmm",
+    "ToolLooCrossVal": "ToolLooCrossVal",
+    "ToolBin2Freq": "ToolBin2Freq",
+    "ToolFreq2Bin": "ToolFreq2Bin",
+    "ToolFreq2Mel": "ToolFreq2Mel",
+    "ToolFreq2Midi": "ToolFreq2Midi",
+    "ToolInstFreq": "ToolInstFreq",
+    "ToolMel2Freq": "ToolMel2Freq",
+    "ToolMidi2Freq": "ToolMidi2Freq",
+    "ToolMultiChannelSpectral": "ToolMultiChannel",
+    "ToolNormalizeAudio": "ToolNormalizeAudio",
+    "ToolPca": "ToolPca",
+    "ToolPeakMask": "ToolPeakMask",
+    "ToolPeakMeter": "ToolPeakMeter",
+    "ToolPpmFilter": "ToolPeakMeter",
+    "ToolProfile": "ToolProfiler",
+    "ToolProfileInherit": "ToolProfiler",
+    "ToolProfileSpan": "ToolProfiler",
+    "ToolProfiler": "ToolProfiler",
+    "ToolReadAudio": "ToolReadAudio",
+    "ToolReadAudioChunks": "ToolReadAudio",
+    "ToolReadAudioInfo": "ToolReadAudio",
+    "ToolGetDescriptor": "ToolRegistry",
+    "ToolGetFunction": "ToolRegistry",
+    "ToolGroupByIntermediate": "ToolRegistry",
+    "ToolResample": "ToolResample",
+    "ToolSeqFeatureSel": "ToolSeqFeatureSel",
+    "ToolSimpleDtw": "ToolSimpleDtw",
+    "ToolSpectralMoments": "ToolSpectralMoments",
+    "ToolSimpleKmeans": "ToolSimpleKmeans",
+    "ToolSimpleKnn": "ToolSimpleKnn",
+    "ToolSimpleNmf": "ToolSimpleNmf",
+    "ToolViterbi": "ToolViterbi"
+}
+
+# names bound by `from pyACA import *`
+__all__ = sorted(cExports)
+
+
+def __getattr__(cName):
+
+    if cName not in cExports:
+        # submodules without exported function (e.g., pyACA.ToolMfccFb) are accessible, too
+        if cName.startswith("__") or importlib.util.find_spec("." + cName, __name__) is None:
+            raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(cName))
+        return importlib.import_module("." + cName, __name__)
+
+    value = getattr(importlib.import_module("." + cExports[cName], __name__), cName)
+    globals()[cName] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(cExports))
+
+
+## the import system binds each imported submodule as attribute of the package,
+# which would hide the function of the same name (e.g., pyACA.computeFeature)
+class LazyPackage_I(types.ModuleType):
+
+    def __setattr__(self, cName, value):
+
+        if isinstance(value, types.ModuleType) and cExports.get(cName) == cName:
+            value = getattr(value, cName)
+
+        super().__setattr__(cName, value)
+
+
+sys.modules[__name__].__class__ = LazyPackage_I
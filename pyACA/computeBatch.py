@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+computeBatch
+
+runs one of the compute functions on a list of audio files in a pool of worker processes
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import pyACA
+from pyACA.ToolReadAudio import ToolReadAudio
+
+
+## runs a compute function on many audio files in parallel
+# every worker reads its audio files itself, so only paths and results are passed between processes;
+# results are yielded as soon as they are available, i.e., not necessarily in the order of cPaths
+#
+#    @param cPaths: iterable of paths to audio files
+#    @param task: name of a compute function, e.g. 'computeKey', or a picklable function with the arguments x and f_s
+#    @param iNumJobs: number of worker processes (default: None, number of cores), 1 processes all files in the calling process
+#    @param iChunkSize: number of files sent to a worker at once (default: 1)
+#    @param **kwargs: additional keyword arguments of the task, e.g. cFeatureName='SpectralCentroid' for 'computeFeature'
+#
+#    @return generator yielding (cPath, result, error) per file, with result None and the error message (repr of the exception) as error if the file failed
+def computeBatch(cPaths, task, iNumJobs=None, iChunkSize=1, **kwargs):
+
+    # resolve the task here, so that an invalid task fails at the call and not in every worker
+    if isinstance(task, str):
+        assert(task in pyACA.cExports), "parameter error: unknown task " + task
+        task = getattr(pyACA, task)
+    assert(callable(task)), "parameter error: task is not callable"
+    assert(iChunkSize >= 1), "parameter error: invalid chunk size"
+
+    if iNumJobs is None:
+        iNumJobs = os.cpu_count()
+
+    return runBatch_I(generateChunks_I(cPaths, iChunkSize), task, iNumJobs, kwargs)
+
+
+def runBatch_I(cChunks, hTask, iNumJobs, kwargs):
+
+    if iNumJobs == 1:
+        for cChunk in cChunks:
+            yield from processChunk_I(cChunk, hTask, kwargs)
+        return
+
+    # keep only a few chunks per worker in flight so that long path lists are not submitted at once
+    iMaxPending = 4 * iNumJobs
+
+    with ProcessPoolExecutor(max_workers=iNumJobs) as executor:
+        pending = dict()
+        for cChunk in cChunks:
+            try:
+                pending[executor.submit(processChunk_I, cChunk, hTask, kwargs)] = cChunk
+            except Exception as error:
+                # e.g., BrokenProcessPool after a worker died
+                yield from getChunkErrors_I(cChunk, error)
+                continue
+
+            if len(pending) >= iMaxPending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collectResults_I(done, pending)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collectResults_I(done, pending)
+
+
+# yields the results of the finished chunks and removes them from the pending chunks
+def collectResults_I(done, pending):
+
+    for future in done:
+        cChunk = pending.pop(future)
+        try:
+            cResults = future.result()
+        except Exception as error:
+            # the chunk could not be processed at all, e.g., a worker died or the arguments are not picklable
+            cResults = getChunkErrors_I(cChunk, error)
+        yield from cResults
+
+
+def getChunkErrors_I(cChunk, error):
+    return [(cPath, None, repr(error)) for cPath in cChunk]
+
+
+def generateChunks_I(cPaths, iChunkSize):
+
+    cChunk = []
+    for cPath in cPaths:
+        cChunk.append(cPath)
+        if len(cChunk) == iChunkSize:
+            yield cChunk
+            cChunk = []
+
+    if cChunk:
+        yield cChunk
+
+
+def processChunk_I(cChunk, hTask, kwargs):
+
+    cResults = []
+    for cPath in cChunk:
+        try:
+            [f_s, x] = ToolReadAudio(cPath)
+            cResults.append((cPath, hTask(x=x, f_s=f_s, **kwargs), None))
+        except Exception as error:
+            # the exception itself is not necessarily picklable
+            cResults.append((cPath, None, repr(error)))
+
+    return cResults
+
+
+#######################################################
+# main
+def computeBatchCl(cPaths, cTask, iNumJobs=None):
+
+    for cPath, result, error in computeBatch(cPaths, cTask, iNumJobs):
+        if error is not None:
+            print(cPath, ": failed (", error, ")")
+        else:
+            print(cPath, ": ", result)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # add command line args and parse them
+    parser = argparse.ArgumentParser(description='Run a compute function on multiple wav files')
+    parser.add_argument('--infiles', metavar='path', nargs='+', required=True,
+                        help='paths to input audio files')
+    parser.add_argument('--task', metavar='string', required=False, default='computeKey',
+                        help='name of the compute function, e.g. computeKey')
+    parser.add_argument('--numjobs', metavar='int', type=int, required=False,
+                        help='number of worker processes')
+
+    # retrieve command line args
+    args = parser.parse_args()
+
+    # call the function
+    computeBatchCl(args.infiles, args.task, args.numjobs)
@@ -7,6 +7,7 @@ from pyACA.computeNoveltyFunction import computeNoveltyFunction
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolReadAudio import ToolReadAudio
+from pyACA.ToolProfiler import ToolProfile
 
 
 ## computes a simple beat histogram
@@ -20,6 +21,7 @@ from pyACA.ToolReadAudio import ToolReadAudio
 #
 #    @return T: beat histogram
 #    @return Bpm: BPM axis ticks
+@ToolProfile
 def computeBeatHisto(x, f_s, cMethod='FFT', afWindow=None, iBlockLength=1024, iHopLength=8):
     # compute window function for FFT
     if afWindow is None:
@@ -48,7 +50,7 @@ def computeBeatHisto(x, f_s, cMethod='FFT', afWindow=None, iBlockLength=1024, iH
         afWindow[np.arange(0, iHistoLength)] = ToolComputeHann(iHistoLength)
         f_s = f_s / iHopLength
         if len(d) < 2 * iHistoLength:
-            d = [d, np.zeros([1, 2 * iHistoLength - len(d)])]
+            d = np.concatenate((d, np.zeros(2 * iHistoLength - len(d))))
 
         [D, f, t] = computeSpectrogram(d, f_s, afWindow, 2*iHistoLength, iHistoLength/4)
 
@@ -56,8 +58,8 @@ def computeBeatHisto(x, f_s, cMethod='FFT', afWindow=None, iBlockLength=1024, iH
 
         # restrict Bpm range
         Bpm = f * 60
-        lIdx = np.argwhere(Bpm < 30)[-1]
-        hIdx = np.argwhere(Bpm > 200)[0]
+        lIdx = np.argwhere(Bpm < 30)[-1, 0]
+        hIdx = np.argwhere(Bpm > 200)[0, 0]
         T = T[np.arange(lIdx, hIdx)]
         Bpm = Bpm[np.arange(lIdx, hIdx)]
     else:
@@ -5,6 +5,8 @@ import numpy as np
 from pyACA.computeFeature import computeFeature
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolViterbi import ToolViterbi
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## recognizes the chords in an audio file
@@ -18,6 +20,7 @@ from pyACA.ToolViterbi import ToolViterbi
 #    @return aiChordIdx: detected chords as indices (2 x iNumObservations)
 #    @return t: time stamps
 #    @return P_E: full matrix of chord probabilities (iNumChords x iNumObservations)
+@ToolProfile
 def computeChords(x, f_s, iBlockLength=8192, iHopLength=2048):
 
     # chord names
@@ -39,8 +42,9 @@ def computeChords(x, f_s, iBlockLength=8192, iHopLength=2048):
     v_pc, t = computeFeature('SpectralPitchChroma', x, f_s, None, iBlockLength, iHopLength)
 
     # estimate chord probabilities
-    P_E = np.matmul(T, v_pc)
-    P_E = P_E / np.sum(P_E, axis=0)
+    with ToolProfileSpan("templateMatching", v_pc.shape[1]):
+        P_E = np.matmul(T, v_pc)
+        P_E = P_E / np.sum(P_E, axis=0)
 
     # allocate space for two rows of results (one raw, one with Viterbi)
     # assign series of labels/indices starting with 0
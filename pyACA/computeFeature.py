@@ -1,12 +1,30 @@
 # -*- coding: utf-8 -*-
 
-import matplotlib.pyplot as plt
+import os
+
+import numpy as np
 
-import pyACA
 from pyACA.computeSpectrogram import computeSpectrogram
+from pyACA.FeatureTimeRms import filterSP
+from pyACA.FeatureTimeRms import getAlphaSP
+from pyACA.ToolAllocOutput import ToolAllocOutput
+from pyACA.ToolAllocOutput import ToolFlushOutput
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
+from pyACA.ToolBlockAudio import ToolBlockAudio
+from pyACA.ToolBlockAudio import ToolBlockBuffer
+from pyACA.ToolBlockSpectrum import ToolBlockSpectrum
+from pyACA.ToolBlockSpectrum import ToolBlockSpectrumChunks
 from pyACA.ToolComputeHann import ToolComputeHann
+from pyACA.ToolDownmix import ToolDownmix
+from pyACA.ToolPeakMeter import ToolPeakMeter
 from pyACA.ToolReadAudio import ToolReadAudio
+from pyACA.getFeatureList import getFeatureList
+from pyACA.ToolRegistry import ToolGetDescriptor
+from pyACA.ToolRegistry import ToolGetFunction
+from pyACA.ToolSpectralMoments import cMomentFeatures
+from pyACA.ToolSpectralMoments import ToolSpectralMoments
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes a feature from the audio data
@@ -37,57 +55,380 @@ from pyACA.ToolReadAudio import ToolReadAudio
 #    @param afWindow: FFT window of length iBlockLength (default: hann)
 #    @param iBlockLength: internal block length (default: 4096 samples)
 #    @param iHopLength: internal hop length (default: 2048 samples)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param out: output target, path of a .npy file or np.memmap, written chunk by chunk (default: None, in memory)
+#    @param bDownmix: downmix to one channel, otherwise compute the feature per channel (default: True)
 #
-#    @return v: feature value
+#    @return v: feature value, np.memmap for file targets, with a leading channel dimension for multi-channel input and bDownmix False
 #    @return t: time stamps
-def computeFeature(cFeatureName, x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048):
- 
-    # mypackage = __import__(".Feature" + cFeatureName, package="pyACA")
-    hFeatureFunc = getattr(pyACA, "Feature" + cFeatureName)
+@ToolProfile
+def computeFeature(cFeatureName, x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048, dtype=None, out=None, bDownmix=True):
+
+    hFeatureFunc = ToolGetFunction(cFeatureName)
 
     # pre-processing
-    x = ToolPreprocAudio(x)
+    x = ToolPreprocAudio(x, dtype=dtype, bDownmix=bDownmix)
 
-    if isSpectral(cFeatureName):
+    if isSpectral_I(cFeatureName):
         # compute window function for FFT
         if afWindow is None:
             afWindow = ToolComputeHann(iBlockLength)
 
         assert(afWindow.shape[0] == iBlockLength), "parameter error: invalid window dimension"
 
-        # in the real world, we would do this block by block...
-        [X, f, t] = computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
+        if out is not None:
+            # compute the feature block by block without holding the spectrogram in memory
+            x_b, afWindow, t = blockAudio_I(x, f_s, afWindow, iBlockLength, iHopLength, dtype)
+            v = computeSpectralFeaturesChunked_I([cFeatureName], x_b, f_s, afWindow, {cFeatureName: out})
+            return v[cFeatureName], t
+
+        [X, f, t] = computeSpectrogram(x, f_s, afWindow, iBlockLength, iHopLength, dtype=dtype, bDownmix=bDownmix)
 
         # compute instantaneous feature
-        v = hFeatureFunc(X, f_s)
+        with ToolProfileSpan("Feature" + cFeatureName, X.shape[-1]):
+            v = hFeatureFunc(X, f_s)
+
+    if isTemporal_I(cFeatureName):
+        with ToolProfileSpan("Feature" + cFeatureName):
+            [v, t] = hFeatureFunc(x, iBlockLength, iHopLength, f_s, dtype=dtype)
 
-    if isTemporal(cFeatureName):
-        [v, t] = hFeatureFunc(x, iBlockLength, iHopLength, f_s)
+        if out is not None:
+            v = writeOutput_I(v, out)
 
     return v, t
 
 
+## computes multiple features from the audio data with one shared pre-processing and spectrogram
+#
+#    @param cFeatureNames: list of features to compute, e.g. ['SpectralSkewness', 'TimeRms'] (default: None, all features)
+#    @param x: array with floating point audio data (dimension samples x channels)
+#    @param f_s: sample rate of audio data
+#    @param afWindow: FFT window of length iBlockLength (default: hann)
+#    @param iBlockLength: internal block length (default: 4096 samples)
+#    @param iHopLength: internal hop length (default: 2048 samples)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param out: output directory, each feature is written chunk by chunk to <out>/<feature name>.npy (default: None, in memory)
+#    @param bDownmix: downmix to one channel, otherwise compute the features per channel (default: True)
+#
+#    @return v: dict of feature values with the feature names as keys, np.memmap for file targets
+#    @return t: time stamps
+@ToolProfile
+def computeFeatures(cFeatureNames, x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048, dtype=None, out=None, bDownmix=True):
+
+    if cFeatureNames is None:
+        cFeatureNames = getFeatureList('all')
+
+    # pre-processing (once for all features)
+    x = ToolPreprocAudio(x, dtype=dtype, bDownmix=bDownmix)
+
+    cSpectralNames = [cFeatureName for cFeatureName in cFeatureNames if isSpectral_I(cFeatureName)]
+    cBlockNames = [cFeatureName for cFeatureName in cFeatureNames if isTemporal_I(cFeatureName) and "blocks" in ToolGetDescriptor(cFeatureName)["cIntermediates"]]
+    cOut = dict()
+    if out is not None:
+        cOut = {cFeatureName: os.path.join(out, cFeatureName + ".npy") for cFeatureName in cFeatureNames}
+
+    t = None
+    v = dict()
+    x_b = None
+    if cSpectralNames or cBlockNames:
+        # compute window function for FFT
+        if afWindow is None:
+            afWindow = ToolComputeHann(iBlockLength)
+
+        assert(afWindow.shape[0] == iBlockLength), "parameter error: invalid window dimension"
+
+        # block once for the spectrogram and all block based temporal features
+        x_b, afWindow, t = blockAudio_I(x, f_s, afWindow, iBlockLength, iHopLength, dtype)
+
+    if cSpectralNames:
+        if out is not None:
+            # all spectral features share each chunk of the spectrogram
+            v = computeSpectralFeaturesChunked_I(cSpectralNames, x_b, f_s, afWindow, cOut)
+        else:
+            # one spectrogram shared by all spectral features
+            X = ToolBlockSpectrum(x_b, afWindow)
+            M = computeMoments_I(cSpectralNames, X, f_s)
+
+    for cFeatureName in cFeatureNames:
+        hFeatureFunc = ToolGetFunction(cFeatureName)
+
+        # compute instantaneous feature
+        if isSpectral_I(cFeatureName) and out is None:
+            with ToolProfileSpan("Feature" + cFeatureName, X.shape[-1]):
+                v[cFeatureName] = computeSpectralFeature_I(cFeatureName, X, f_s, M)
+
+        # temporal features work on the shared blocks or directly on the signal
+        if isTemporal_I(cFeatureName):
+            with ToolProfileSpan("Feature" + cFeatureName):
+                if cFeatureName in cBlockNames:
+                    [v[cFeatureName], t] = hFeatureFunc(x, iBlockLength, iHopLength, f_s, dtype=dtype, x_b=x_b)
+                else:
+                    [v[cFeatureName], t] = hFeatureFunc(x, iBlockLength, iHopLength, f_s, dtype=dtype)
+
+            if out is not None:
+                v[cFeatureName] = writeOutput_I(v[cFeatureName], cOut[cFeatureName])
+
+    # keep the requested order
+    v = {cFeatureName: v[cFeatureName] for cFeatureName in cFeatureNames}
+
+    return v, t
+
+
+## computes features block by block from a stream of audio chunks (or spectral frames)
+# the state of features depending on previous frames or samples (spectral flux, single pole rms, PPM)
+# is carried across calls, and only one block of audio is buffered per signal, so memory does not grow
+# with the stream length; as for StreamingSpectrogram, the audio is not normalized, i.e., the output
+# equals computeFeatures for normalized input
+#
+#    @param cFeatureNames: list of features to compute, e.g. ['SpectralFlux', 'TimeRms'] (default: None, all features)
+#    @param f_s: sample rate of audio data
+#    @param afWindow: FFT window of length iBlockLength (default: hann)
+#    @param iBlockLength: internal block length (default: 4096 samples)
+#    @param iHopLength: internal hop length (default: 2048 samples)
+class StreamingFeatures:
+
+    def __init__(self, cFeatureNames, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048):
+
+        if cFeatureNames is None:
+            cFeatureNames = getFeatureList('all')
+
+        self.cFeatureNames = list(cFeatureNames)
+        self.f_s = f_s
+        self.iBlockLength = int(iBlockLength)
+        self.iHopLength = int(iHopLength)
+
+        # output dimension per feature (for chunks without a completed block)
+        self.iNumDims = {cFeatureName: ToolGetDescriptor(cFeatureName)["iNumDims"] for cFeatureName in self.cFeatureNames}
+        self.cSpectralNames = [cFeatureName for cFeatureName in self.cFeatureNames if isSpectral_I(cFeatureName)]
+
+        if afWindow is None:
+            # compute window function for FFT
+            afWindow = ToolComputeHann(self.iBlockLength)
+
+        assert(afWindow.shape[0] == self.iBlockLength), "parameter error: invalid window dimension"
+        self.afWindow = afWindow
+
+        self.blockBuffer = ToolBlockBuffer(self.iBlockLength, self.iHopLength)
+
+        # the smoothed power and the PPM are filtered sample by sample and blocked like the audio
+        self.alpha = getAlphaSP(f_s)
+        self.rmsBuffer = ToolBlockBuffer(self.iBlockLength, self.iHopLength)
+        self.peakMeter = ToolPeakMeter(f_s)
+        self.ppmBuffer = ToolBlockBuffer(self.iBlockLength, self.iHopLength)
+
+        self.reset()
+
+    ## resets the stream state
+    def reset(self):
+
+        self.blockBuffer.reset()
+        self.rmsBuffer.reset()
+        self.ppmBuffer.reset()
+        self.peakMeter.reset()
+
+        self.fSpState = 0
+        self.X_prev = None
+
+    ## adds a chunk of audio and computes the features of all blocks completed by it
+    #
+    #    @param x: array with floating point audio data (dimension samples x channels)
+    #
+    #    @return v: dict of feature values of the completed blocks with the feature names as keys
+    #    @return t: time stamps of the completed blocks
+    def push(self, x):
+
+        # down-mix only, see note on normalization above
+        return self.computeBlocks_I(ToolDownmix(np.asarray(x)))
+
+    ## adds spectral frames and computes the spectral features for them (temporal features are not supported)
+    #
+    #    @param X: magnitude spectrum (dimension iSpecLength, or iSpecLength X Observations)
+    #
+    #    @return v: dict of feature values with the feature names as keys
+    def pushSpectrum(self, X):
+
+        assert(len(self.cSpectralNames) == len(self.cFeatureNames)), "parameter error: spectral frames only support spectral features"
+
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = np.expand_dims(X, axis=1)
+
+        return self.computeSpectralFeatures_I(X)
+
+    ## zero-pads the end of the stream and computes the features of the remaining blocks
+    # afterwards, the object is ready for a new stream
+    #
+    #    @return v: dict of feature values of the remaining blocks with the feature names as keys
+    #    @return t: time stamps of the remaining blocks
+    def flush(self):
+
+        iNumRemaining = max(0, int(np.ceil(self.blockBuffer.iNumSamples / self.iHopLength)) - self.blockBuffer.iNumBlocks)
+
+        # zero-padding up to the end of the last block, it also passes the filters, e.g., the PPM decays into it as in FeatureTimePeakEnvelope
+        iNumPadding = (self.blockBuffer.iNumBlocks + iNumRemaining - 1) * self.iHopLength + self.iBlockLength - self.blockBuffer.iNumSamples if iNumRemaining else 0
+        [v, t] = self.computeBlocks_I(np.zeros(iNumPadding))
+
+        self.reset()
+
+        return v, t
+
+    ## generator computing the features of an iterable of audio chunks, including the final flush
+    #
+    #    @param chunks: iterable of arrays with floating point audio data
+    #
+    #    @return v: dict of feature values of completed blocks per chunk
+    #    @return t: time stamps of completed blocks per chunk
+    def process(self, chunks):
+
+        for x in chunks:
+            v, t = self.push(x)
+            if t.shape[0]:
+                yield v, t
+
+        v, t = self.flush()
+        if t.shape[0]:
+            yield v, t
+
+    def computeBlocks_I(self, x):
+
+        iBlockIdx = self.blockBuffer.iNumBlocks
+        x_b = self.blockBuffer.push(x)
+
+        t = (iBlockIdx + np.arange(0, x_b.shape[0])) * self.iHopLength / self.f_s + self.iBlockLength / (2*self.f_s)
+
+        # filter the stream to keep the filter states up to date
+        if "TimeRms" in self.cFeatureNames:
+            afSp = filterSP(x**2, self.alpha, self.fSpState)
+            self.fSpState = afSp[-1] if afSp.shape[0] else self.fSpState
+            afSp_b = self.rmsBuffer.push(afSp)
+        if "TimePeakEnvelope" in self.cFeatureNames:
+            afPpm_b = self.ppmBuffer.push(self.peakMeter.process(x))
+
+        if not x_b.shape[0]:
+            return self.allocEmpty_I(self.cFeatureNames), t
+
+        # spectral features
+        v = self.computeSpectralFeatures_I(ToolBlockSpectrum(x_b, self.afWindow)) if self.cSpectralNames else dict()
+
+        # temporal features
+        for cFeatureName in self.cFeatureNames:
+            if cFeatureName == "TimeRms":
+                # block rms and the maximum of the streamed single pole output
+                v[cFeatureName] = convertToDb_I(np.stack((np.sqrt(np.mean(x_b**2, axis=1)), np.sqrt(afSp_b.max(axis=1)))))
+            elif cFeatureName == "TimePeakEnvelope":
+                # block maximum and the maximum of the streamed PPM
+                v[cFeatureName] = convertToDb_I(np.stack((np.abs(x_b).max(axis=1), afPpm_b.max(axis=1))))
+            elif isTemporal_I(cFeatureName):
+                # the buffered blocks replace the blocks of the chunk, the time stamps are those of the stream
+                v[cFeatureName] = ToolGetFunction(cFeatureName)(x, self.iBlockLength, self.iHopLength, self.f_s, x_b=x_b)[0]
+
+        # keep the requested order
+        v = {cFeatureName: v[cFeatureName] for cFeatureName in self.cFeatureNames}
+
+        return v, t
+
+    def computeSpectralFeatures_I(self, X):
+
+        if not X.shape[1]:
+            return self.allocEmpty_I(self.cSpectralNames)
+
+        # prepend the last frame of the previous call as context for features depending on it (flux)
+        X_ctx = np.concatenate((X[:, :1] if self.X_prev is None else self.X_prev, X), axis=-1)
+        M = computeMoments_I(self.cSpectralNames, X_ctx, self.f_s)
+
+        v = {cFeatureName: computeSpectralFeature_I(cFeatureName, X_ctx, self.f_s, M)[..., 1:] for cFeatureName in self.cSpectralNames}
+
+        self.X_prev = X[:, -1:].copy()
+
+        return v
+
+    def allocEmpty_I(self, cFeatureNames):
+        return {cFeatureName: np.zeros([self.iNumDims[cFeatureName], 0] if self.iNumDims[cFeatureName] > 1 else [0]) for cFeatureName in cFeatureNames}
+
+
 #######################################################
 # helper functions
-def isSpectral(cName):
-    bResult = False
-    if "Spectral" in cName:
-        bResult = True
+def computeSpectralFeaturesChunked_I(cFeatureNames, x_b, f_s, afWindow, cOut):
+
+    v = dict()
+    X_prev = None
+    for i_start, X in ToolBlockSpectrumChunks(x_b, afWindow):
+        # prepend the last frame of the previous chunk as context for features depending on it (flux)
+        X_ctx = np.concatenate((X[..., :1] if X_prev is None else X_prev, X), axis=-1)
+        M = computeMoments_I(cFeatureNames, X_ctx, f_s)
+
+        for cFeatureName in cFeatureNames:
+            v_chunk = computeSpectralFeature_I(cFeatureName, X_ctx, f_s, M)[..., 1:]
+
+            if cFeatureName not in v:
+                v[cFeatureName] = ToolAllocOutput(cOut[cFeatureName], v_chunk.shape[:-1] + (x_b.shape[-2],), v_chunk.dtype)
+
+            v[cFeatureName][..., i_start:i_start + X.shape[-1]] = v_chunk
+            ToolFlushOutput(v[cFeatureName])
+
+        X_prev = X[..., -1:].copy()
+
+    return v
+
+
+# blocks the pre-processed audio (all channels) once for the spectrogram and the block based features
+def blockAudio_I(x, f_s, afWindow, iBlockLength, iHopLength, dtype):
+
+    if dtype is not None:
+        afWindow = afWindow.astype(dtype)
 
-    return bResult
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True, dtype=dtype)
 
+    return x_b, afWindow, t
 
-def isTemporal(cName):
-    bResult = False
-    if "Time" in cName:
-        bResult = True
 
-    return bResult
+# level in dB with a floor at -100 dB as in FeatureTimeRms and FeatureTimePeakEnvelope
+def convertToDb_I(v):
+
+    epsilon = 1e-5  # -100dB
+
+    return 20 * np.log10(np.maximum(v, epsilon))
+
+
+def computeMoments_I(cFeatureNames, X, f_s):
+
+    # the moment based features share one pass over the spectrogram if more than one of them is requested
+    if sum(cFeatureName in cMomentFeatures for cFeatureName in cFeatureNames) < 2:
+        return None
+
+    with ToolProfileSpan("spectralMoments", X.shape[-1]):
+        return ToolSpectralMoments(X, f_s)
+
+
+def computeSpectralFeature_I(cFeatureName, X, f_s, M):
+
+    if M is not None and cFeatureName in cMomentFeatures:
+        return np.ascontiguousarray(M[..., cMomentFeatures[cFeatureName], :])
+
+    return ToolGetFunction(cFeatureName)(X, f_s)
+
+
+def isSpectral_I(cFeatureName):
+    return ToolGetDescriptor(cFeatureName)["cDomain"] == "spectral"
+
+
+def isTemporal_I(cFeatureName):
+    return ToolGetDescriptor(cFeatureName)["cDomain"] == "temporal"
+
+
+def writeOutput_I(v, out):
+
+    v_out = ToolAllocOutput(out, v.shape, v.dtype)
+    v_out[:] = v
+    ToolFlushOutput(v_out)
+
+    return v_out
 
 
 #######################################################
 # main
 def computeFeatureCl(cPath, cFeatureName, bPlotOutput=False):
+    import matplotlib.pyplot as plt
 
     # read audio file
     [f_s, afAudioData] = ToolReadAudio(cPath)
@@ -106,6 +447,21 @@ def computeFeatureCl(cPath, cFeatureName, bPlotOutput=False):
     return v, t
 
 
+def computeFeaturesCl(cPath, cFeatureNames=None):
+
+    # read audio file
+    [f_s, afAudioData] = ToolReadAudio(cPath)
+
+    # for debugging
+    iBlockLength = 4096
+    iHopLength = 2048
+
+    # compute features
+    [v, t] = computeFeatures(cFeatureNames, afAudioData, f_s, None, iBlockLength, iHopLength)
+
+    return v, t
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -3,10 +3,13 @@
 import numpy as np
 
 from pyACA.computeSpectrogram import computeSpectrogram
+from pyACA.ToolCache import ToolCache
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolFreq2Bin import ToolFreq2Bin
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolResample import ToolResample
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes subfingerprints from audio (derived from Haitsma et al.), 256 subfingerprints comprise one fingerprint
@@ -16,6 +19,7 @@ from pyACA.ToolResample import ToolResample
 #
 #    @return F: series of subfingerprints
 #    @return t: time stamps
+@ToolProfile
 def computeFingerprint(x, f_s):
 
     # set default parameters
@@ -31,7 +35,7 @@ def computeFingerprint(x, f_s):
         x, t_x = ToolResample(x, fs_target, f_s)
     
     # initialization: generate transformation matrix for 33 frequency bands
-    H = generateBands_I(iBlockLength, fs_target)
+    H = generateBands_I(iBlockLength, fs_target, True)
     
     # initialization: generate FFT window
     afWindow = ToolComputeHann(iBlockLength)
@@ -39,11 +43,12 @@ def computeFingerprint(x, f_s):
     # in the real world, we would do this block by block...
     [X, f, tf] = computeSpectrogram(x, f_s, afWindow, iBlockLength, iHopLength)
 
-    # power spectrum
-    X = np.abs(X)**2
-    
-    # group spectral bins in bands
-    E = np.matmul(H, X)
+    with ToolProfileSpan("bandEnergies", X.shape[1]):
+        # power spectrum
+        X = np.abs(X)**2
+
+        # group spectral bins in bands
+        E = H @ X
     
     # extract fingerprint through diff (both time and freq)
     SubFingerprint = np.diff(np.diff(E, 1, axis=0), 1, axis=1)
@@ -56,7 +61,9 @@ def computeFingerprint(x, f_s):
     return SubFingerprint, tf
 
 
-def generateBands_I(iFftLength, f_s):
+@ToolCache()
+def generateBands_I(iFftLength, f_s, bSparse=False):
+    from scipy.sparse import csr_matrix
 
     # constants
     iNumBands = 33
@@ -74,7 +81,10 @@ def generateBands_I(iFftLength, f_s):
         idx[k, 0] = np.ceil(ToolFreq2Bin(f_band_bounds[k], iFftLength, f_s)).astype(int)
         idx[k, 1] = np.floor(ToolFreq2Bin(f_band_bounds[k+1], iFftLength, f_s)).astype(int)
         H[k, idx[k, 0]:idx[k, 1] + 1] = 1
-    
+
+    if bSparse:
+        H = csr_matrix(H)
+
     return H
 
 
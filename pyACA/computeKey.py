@@ -5,6 +5,8 @@ import numpy as np
 from pyACA.computeSpectrogram import computeSpectrogram
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.computeFeature import computeFeature
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes the musical key of an input audio file
@@ -16,6 +18,7 @@ from pyACA.computeFeature import computeFeature
 #    @param iHopLength: internal hop length (default: 2048 samples)
 #
 #    @return cKey: key string
+@ToolProfile
 def computeKey(x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048):
 
     # compute window function for FFT
@@ -36,14 +39,15 @@ def computeKey(x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048):
     # extract audio pitch chroma
     v_pc, t = computeFeature("SpectralPitchChroma", x, f_s, afWindow, iBlockLength, iHopLength)
 
-    # average pitch chroma
-    v_pc = v_pc.mean(axis=1)
+    with ToolProfileSpan("templateMatching", v_pc.shape[1]):
+        # average pitch chroma
+        v_pc = v_pc.mean(axis=1)
 
-    # compute manhattan distances for modes (major and minor)
-    d = np.zeros(t_pc.shape)
-    v_pc = np.concatenate((v_pc, v_pc), axis=0).reshape(2, 12)
-    for i in range(0, 12):
-        d[:, i] = np.sum(np.abs(v_pc - np.roll(t_pc, i, axis=1)), axis=1)
+        # compute manhattan distances for modes (major and minor)
+        d = np.zeros(t_pc.shape)
+        v_pc = np.concatenate((v_pc, v_pc), axis=0).reshape(2, 12)
+        for i in range(0, 12):
+            d[:, i] = np.sum(np.abs(v_pc - np.roll(t_pc, i, axis=1)), axis=1)
 
     # get unwrapped key index
     iKeyIdx = d.argmin()
@@ -2,11 +2,17 @@
 
 import numpy as np
 
-from pyACA.computeSpectrogram import computeSpectrogram
-from pyACA.ToolPreprocAudio import ToolPreprocAudio
+from pyACA.ToolAllocOutput import ToolAllocOutput
+from pyACA.ToolAllocOutput import ToolFlushOutput
+from pyACA.ToolBlockAudio import ToolBlockAudio
+from pyACA.ToolBlockSpectrum import ToolBlockSpectrumChunks
+from pyACA.ToolCache import ToolCache
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolFreq2Mel import ToolFreq2Mel
 from pyACA.ToolMel2Freq import ToolMel2Freq
+from pyACA.ToolPreprocAudio import ToolPreprocAudio
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes a mel spectrogram from the audio data
@@ -19,17 +25,20 @@ from pyACA.ToolMel2Freq import ToolMel2Freq
 #    @param iHopLength: internal hop length (default: 2048 samples)
 #    @param iNumMelBands: number of mel bands (default: 128 bands)
 #    @param fMaxInHz: maximum frequency (default: None)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param out: output target, path of a .npy file or np.memmap, written chunk by chunk (default: None, in memory)
 #
-#    @return M: Mel spectrum
+#    @return M: Mel spectrum, np.memmap for file targets
 #    @return f_c: Center frequencies of mel bands
 #    @return t: time stamps
-def computeMelSpectrogram(x, f_s, afWindow=None, bLogarithmic=True, iBlockLength=4096, iHopLength=2048, iNumMelBands=128, fMaxInHz=None):
+@ToolProfile
+def computeMelSpectrogram(x, f_s, afWindow=None, bLogarithmic=True, iBlockLength=4096, iHopLength=2048, iNumMelBands=128, fMaxInHz=None, dtype=None, out=None):
 
     if not fMaxInHz:
         fMaxInHz = f_s / 2
 
-    # Pre-process: down-mix, normalize, zero-pad
-    x = ToolPreprocAudio(x)
+    # Pre-process: down-mix, normalize
+    x = ToolPreprocAudio(x, dtype=dtype)
 
     if afWindow is None:
         # Compute window function for FFT
@@ -37,22 +46,37 @@ def computeMelSpectrogram(x, f_s, afWindow=None, bLogarithmic=True, iBlockLength
 
     assert(afWindow.shape[0] == iBlockLength), "parameter error: invalid window dimension"
 
-    # Compute spectrogram (in the real world, we would do this block by block)
-    [X, f, t] = computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
+    if dtype is not None:
+        afWindow = afWindow.astype(dtype)
+
+    # block audio data
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True, dtype=dtype)
 
-    # Compute Mel filters
-    H, f_c = generateMelFb_I(iBlockLength, f_s, iNumMelBands, fMaxInHz)
+    # Compute Mel filters (sparse, each filter only covers a few bins)
+    H, f_c = generateMelFb_I(iBlockLength, f_s, iNumMelBands, fMaxInHz, True)
+    H = H.astype(x_b.dtype)
 
-    M = np.matmul(H, X)
+    M = ToolAllocOutput(out, [iNumMelBands, x_b.shape[0]], x_b.dtype)
 
-    if bLogarithmic:
-        # Convert amplitude to level (dB)
-        M = 20 * np.log10(M + 1e-12)
+    # only one chunk of the spectrogram is held in memory at a time
+    with ToolProfileSpan("fft+melFilterbank", x_b.shape[0]):
+        for i_start, X in ToolBlockSpectrumChunks(x_b, afWindow):
+            M_chunk = H @ X
 
-    return M, f_c, t
+            if bLogarithmic:
+                # Convert amplitude to level (dB)
+                M_chunk = 20 * np.log10(M_chunk + 1e-12)
 
+            M[:, i_start:i_start + X.shape[1]] = M_chunk
+            ToolFlushOutput(M)
 
-def generateMelFb_I(iFftLength, f_s, iNumFilters, f_max):
+    # the cached center frequencies are shared and read-only
+    return M, f_c.copy(), t
+
+
+@ToolCache()
+def generateMelFb_I(iFftLength, f_s, iNumFilters, f_max, bSparse=False):
+    from scipy.sparse import csr_matrix
 
     # initialization
     f_min = 0
@@ -78,6 +102,9 @@ def generateMelFb_I(iFftLength, f_s, iNumFilters, f_max):
             np.logical_and(f_fft > f_c[c], f_fft < f_u[c]) * \
             afFilterMax[c] * (f_u[c]-f_fft) / (f_u[c]-f_c[c])
 
+    if bSparse:
+        H = csr_matrix(H)
+
     return H, f_c
 
 
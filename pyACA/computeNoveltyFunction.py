@@ -2,15 +2,14 @@
 
 import math
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.signal import filtfilt
-from scipy.signal import find_peaks
 
-import pyACA
 from pyACA.computeSpectrogram import computeSpectrogram
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolReadAudio import ToolReadAudio
+from pyACA.ToolRegistry import ToolGetFunction
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes the novelty function for onset detection
@@ -29,7 +28,10 @@ from pyACA.ToolReadAudio import ToolReadAudio
 #    @return d: novelty function
 #    @return t: time stamps
 #    @return iPeaks: indices of picked onset times
+@ToolProfile
 def computeNoveltyFunction(cNoveltyName, x, f_s, afWindow=None, iBlockLength=4096, iHopLength=512):
+    from scipy.signal import filtfilt
+    from scipy.signal import find_peaks
 
     # compute window function for FFT
     if afWindow is None:
@@ -37,7 +39,7 @@ def computeNoveltyFunction(cNoveltyName, x, f_s, afWindow=None, iBlockLength=409
 
     assert(afWindow.shape[0] == iBlockLength), "parameter error: invalid window dimension"
 
-    hNoveltyFunc = getattr(pyACA, "Novelty" + cNoveltyName)
+    hNoveltyFunc = ToolGetFunction(cNoveltyName, "Novelty")
 
     # lp initialization
     fLenSmoothLpInS = 0.07
@@ -52,20 +54,23 @@ def computeNoveltyFunction(cNoveltyName, x, f_s, afWindow=None, iBlockLength=409
     [X, f, t] = computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
 
     # novelty function
-    d = hNoveltyFunc(X, f_s)
+    with ToolProfileSpan("Novelty" + cNoveltyName, X.shape[1]):
+        d = hNoveltyFunc(X, f_s)
 
-    # smooth novelty function
-    b = np.ones(iLenSmoothLp) / iLenSmoothLp
-    d = filtfilt(b, 1, d)
-    d[d < 0] = 0
+    with ToolProfileSpan("smoothing", d.shape[0]):
+        # smooth novelty function
+        b = np.ones(iLenSmoothLp) / iLenSmoothLp
+        d = filtfilt(b, 1, d)
+        d[d < 0] = 0
 
-    # compute threshold
-    iLenThreshLp = min(iLenThreshLp, np.floor(len(d)/3))
-    b = np.ones(iLenThreshLp) / iLenThreshLp
-    G_T = .4 * np.mean(d[np.arange(1, d.shape[0])]) + filtfilt(b, 1, d)
+        # compute threshold
+        iLenThreshLp = min(iLenThreshLp, np.floor(len(d)/3))
+        b = np.ones(iLenThreshLp) / iLenThreshLp
+        G_T = .4 * np.mean(d[np.arange(1, d.shape[0])]) + filtfilt(b, 1, d)
 
     # find local maxima above the threshold
-    iPeaks = find_peaks(d - G_T, height=0)
+    with ToolProfileSpan("peakPicking", d.shape[0]):
+        iPeaks = find_peaks(d - G_T, height=0)
 
     return d, t, iPeaks[0]
 
@@ -73,6 +78,7 @@ def computeNoveltyFunction(cNoveltyName, x, f_s, afWindow=None, iBlockLength=409
 #######################################################
 # main
 def computeNoveltyFunctionCl(cPath, cNoveltyName):
+    import matplotlib.pyplot as plt
     
     [f_s, x] = ToolReadAudio(cPath)
     # afAudioData = np.sin(2*np.pi * np.arange(f_s*1)*440./f_s)
@@ -23,13 +23,15 @@ supported pitch trackers are:
       t time stamp for the frequency value
 """
 
-import matplotlib.pyplot as plt
 
-import pyACA
 from pyACA.computeSpectrogram import computeSpectrogram
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolReadAudio import ToolReadAudio
+from pyACA.ToolRegistry import ToolGetDescriptor
+from pyACA.ToolRegistry import ToolGetFunction
+from pyACA.ToolProfiler import ToolProfile
+from pyACA.ToolProfiler import ToolProfileSpan
 
 
 ## computes the fundamental frequency of (monophonic) audio
@@ -50,15 +52,15 @@ from pyACA.ToolReadAudio import ToolReadAudio
 #
 #    @return f_0: frequency
 #    @return t: time stamps
+@ToolProfile
 def computePitch(cPitchTrackName, x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048):
-    
-    # mypackage = __import__(".Pitch" + cPitchTrackName, package="pyACA")
-    hPitchFunc = getattr(pyACA, "Pitch" + cPitchTrackName)
+
+    hPitchFunc = ToolGetFunction(cPitchTrackName, "Pitch")
 
     # pre-processing
     x = ToolPreprocAudio(x)
 
-    if isSpectral(cPitchTrackName):
+    if ToolGetDescriptor(cPitchTrackName, "Pitch")["cDomain"] == "spectral":
         # compute window function for FFT
         if afWindow is None:
             afWindow = ToolComputeHann(iBlockLength)
@@ -69,35 +71,20 @@ def computePitch(cPitchTrackName, x, f_s, afWindow=None, iBlockLength=4096, iHop
         [X, f, t] = computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
 
         # compute instantaneous pitch chroma
-        f_0 = hPitchFunc(X, f_s)
+        with ToolProfileSpan("Pitch" + cPitchTrackName, X.shape[-1]):
+            f_0 = hPitchFunc(X, f_s)
 
-    if isTemporal(cPitchTrackName):
-        [f_0, t] = hPitchFunc(x, iBlockLength, iHopLength, f_s)
+    if ToolGetDescriptor(cPitchTrackName, "Pitch")["cDomain"] == "temporal":
+        with ToolProfileSpan("Pitch" + cPitchTrackName):
+            [f_0, t] = hPitchFunc(x, iBlockLength, iHopLength, f_s)
 
     return f_0, t
 
 
-#######################################################
-# helper functions
-def isSpectral(cName):
-    bResult = False
-    if "Spectral" in cName:
-        bResult = True
-
-    return bResult
-
-
-def isTemporal(cName):
-    bResult = False
-    if "Time" in cName:
-        bResult = True
-
-    return bResult
-
-
 #######################################################
 # main
 def computePitchCl(cPath, cPitchTrackName, bPlotOutput=False):
+    import matplotlib.pyplot as plt
     
     # read audio file
     [f_s, afAudioData] = ToolReadAudio(cPath)
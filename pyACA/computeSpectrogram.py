@@ -5,6 +5,9 @@ import numpy as np
 from pyACA.ToolPreprocAudio import ToolPreprocAudio
 from pyACA.ToolComputeHann import ToolComputeHann
 from pyACA.ToolBlockAudio import ToolBlockAudio
+from pyACA.ToolBlockAudio import ToolBlockBuffer
+from pyACA.ToolBlockSpectrum import ToolBlockSpectrum
+from pyACA.ToolProfiler import ToolProfile
 
 
 ## computes a spectrogram from the audio data
@@ -16,17 +19,37 @@ from pyACA.ToolBlockAudio import ToolBlockAudio
 #    @param iHopLength: internal hop length (default: 2048 samples)
 #    @param bNormalize: normalize input audio file before fft computation (default: True)
 #    @param bMagnitude: return magnitude instead of complex spectrum (default: True)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param out: output target, path of a .npy file or np.memmap, written chunk by chunk (default: None, in memory)
+#    @param bDownmix: downmix to one channel before fft computation (default: True)
+#    @param iNumThreads: number of threads transforming chunks of blocks concurrently, the result is identical for all values (default: 1)
 #
-#    @return X: spectrum
+#    @return X: spectrum (complex64 or complex128 if bMagnitude is False), np.memmap for file targets,
+#               dimension (channels x bins x frames) for multi-channel input and bDownmix False
 #    @return f: frequencies of bins
 #    @return t: time stamps
-def computeSpectrogram(x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048, bNormalize=True, bMagnitude=True):
+@ToolProfile
+def computeSpectrogram(x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048, bNormalize=True, bMagnitude=True, dtype=None, out=None, bDownmix=True, iNumThreads=1):
 
     iBlockLength = np.int_(iBlockLength)
     iHopLength = np.int_(iHopLength)
 
+    # pre-process and block audio data
+    x_b, afWindow, t = blockAudio_I(x, f_s, afWindow, iBlockLength, iHopLength, bNormalize, dtype, bDownmix)
+    
+    # windowed fft of all blocks
+    X = ToolBlockSpectrum(x_b, afWindow, bMagnitude, out, iNumThreads)
+
+    f = np.arange(0, X.shape[-2]) * f_s / iBlockLength
+
+    return X, f, t
+
+
+## pre-processes (down-mix, normalize) and blocks the audio data, returns the block matrix, window and time stamps
+def blockAudio_I(x, f_s, afWindow, iBlockLength, iHopLength, bNormalize, dtype, bDownmix=True):
+
     # Pre-process: down-mix, normalize
-    x = ToolPreprocAudio(x, bNormalize)
+    x = ToolPreprocAudio(x, bNormalize, dtype, bDownmix)
 
     if afWindow is None:
         # Compute window function for FFT
@@ -34,33 +57,102 @@ def computeSpectrogram(x, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048
 
     assert(afWindow.shape[0] == iBlockLength), "parameter error: invalid window dimension"
 
-    # block audio data
-    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s)
-    
-    # allocate memory
-    iSpecDim = np.int_([(x_b.shape[1] / 2 + 1), x_b.shape[0]])
-    X = np.zeros(iSpecDim)
-    if not bMagnitude:
-        X = X.astype(complex)
+    if dtype is not None:
+        afWindow = afWindow.astype(dtype)
 
-    norm = 2 / x_b.shape[1]
+    x_b, t = ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True, dtype=dtype)
 
-    for n in range(0, x_b.shape[0]):
-        # windowed fft
-        tmp = np.fft.fft(x_b[n, :] * afWindow) * norm
+    return x_b, afWindow, t
 
-        # remove redundant spectrum parts
-        if bMagnitude:
-            X[:, n] = abs(tmp[range(iSpecDim[0])])
-        else:
-            X[:, n] = tmp[range(iSpecDim[0])]
 
-    # let's be pedantic about normalization
-    X[[0, iSpecDim[0]-1], :] = X[[0, iSpecDim[0]-1], :] / np.sqrt(2)
+## computes a spectrogram block by block from a stream of audio chunks
+# only one block of audio is buffered, so memory does not grow with the stream length
+# note that the audio is not normalized since the stream maximum is unknown in advance,
+# i.e., the output equals computeSpectrogram with bNormalize=False
+#
+#    @param f_s: sample rate of audio data
+#    @param afWindow: FFT window of length iBlockLength (default: hann)
+#    @param iBlockLength: internal block length (default: 4096 samples)
+#    @param iHopLength: internal hop length (default: 2048 samples)
+#    @param bMagnitude: return magnitude instead of complex spectrum (default: True)
+#    @param dtype: floating point data type of the computation, e.g. np.float32 (default: None, float64)
+#    @param bDownmix: downmix to one channel before fft computation (default: True)
+class StreamingSpectrogram:
 
-    f = np.arange(0, iSpecDim[0]) * f_s / iBlockLength
+    def __init__(self, f_s, afWindow=None, iBlockLength=4096, iHopLength=2048, bMagnitude=True, dtype=None, bDownmix=True):
+
+        self.f_s = f_s
+        self.iBlockLength = np.int_(iBlockLength)
+        self.iHopLength = np.int_(iHopLength)
+        self.bMagnitude = bMagnitude
+        self.dtype = dtype
+        self.bDownmix = bDownmix
+
+        if afWindow is None:
+            # Compute window function for FFT
+            afWindow = ToolComputeHann(self.iBlockLength)
+
+        assert(afWindow.shape[0] == self.iBlockLength), "parameter error: invalid window dimension"
+        self.afWindow = afWindow if dtype is None else afWindow.astype(dtype)
+
+        # frequencies of bins
+        self.f = np.arange(0, self.iBlockLength // 2 + 1) * f_s / self.iBlockLength
+
+        self.blockBuffer = ToolBlockBuffer(self.iBlockLength, self.iHopLength, dtype)
+
+    ## adds a chunk of audio and computes the spectra of all blocks completed by it
+    #
+    #    @param x: array with floating point audio data (dimension samples x channels)
+    #
+    #    @return X: spectra of the completed blocks (dimension iSpecLength x iNumNewBlocks), (channels x iSpecLength x iNumNewBlocks) for multi-channel input and bDownmix False
+    #    @return t: time stamps of the completed blocks
+    def push(self, x):
+
+        iBlockIdx = self.blockBuffer.iNumBlocks
+
+        # no normalization, see note above
+        x_b = self.blockBuffer.push(ToolPreprocAudio(np.asarray(x), False, self.dtype, self.bDownmix))
+
+        return self.computeBlocks_I(x_b, iBlockIdx)
+
+    ## zero-pads the end of the stream and computes the spectra of the remaining blocks
+    # afterwards, the object is ready for a new stream
+    #
+    #    @return X: spectra of the remaining blocks (dimension iSpecLength x iNumNewBlocks), (channels x iSpecLength x iNumNewBlocks) for multi-channel input and bDownmix False
+    #    @return t: time stamps of the remaining blocks
+    def flush(self):
+
+        iBlockIdx = self.blockBuffer.iNumBlocks
+
+        x_b = self.blockBuffer.flush()
+
+        return self.computeBlocks_I(x_b, iBlockIdx)
+
+    ## generator computing the spectra of an iterable of audio chunks, including the final flush
+    #
+    #    @param chunks: iterable of arrays with floating point audio data
+    #
+    #    @return X: spectra of completed blocks per chunk
+    #    @return t: time stamps of completed blocks per chunk
+    def process(self, chunks):
+
+        for x in chunks:
+            X, t = self.push(x)
+            if X.shape[-1]:
+                yield X, t
+
+        X, t = self.flush()
+        if X.shape[-1]:
+            yield X, t
+
+    def computeBlocks_I(self, x_b, iBlockIdx):
+
+        X = ToolBlockSpectrum(x_b, self.afWindow, self.bMagnitude)
+
+        t = (iBlockIdx + np.arange(0, x_b.shape[-2])) * self.iHopLength / self.f_s + self.iBlockLength / (2*self.f_s)
+
+        return X, t
 
-    return X, f, t
 
 #######################################################
 # main
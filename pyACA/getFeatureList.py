@@ -1,12 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import glob
-import os
+from pyACA.ToolRegistry import registry
 
-import pyACA
 
-
-## returns a list of available features by checking for all the Feature*.py files present in the package
+## returns a list of available features from the feature registry
 #
 #    @param feature_type: (optional) type of features (valid values: 'all', 'spectral' 'temporal')
 #
@@ -14,17 +11,9 @@ import pyACA
 def getFeatureList(feature_type ='all'):
 
     feature_type = feature_type.lower()
-    if feature_type == 'all':
-        feature_type = ''
-    elif feature_type == 'spectral':
-        feature_type = 'Spectral'
-    elif feature_type == 'temporal':
-        feature_type = 'Time'
-    else:
+    if feature_type not in ['all', 'spectral', 'temporal']:
         print('Invalid feature type')
         return []
 
-    package_loc = os.path.dirname(pyACA.__file__)
-    modules = sorted(glob.glob(os.path.join(package_loc, 'Feature' + feature_type + '*.py')))
-    features = [os.path.basename(feature)[len('Feature'):-len('.py')] for feature in modules]
+    features = [feature for feature, descriptor in registry['Feature'].items() if feature_type in ['all', descriptor['cDomain']]]
     return features
@@ -51,6 +51,273 @@ class TestComputes(unittest.TestCase):
 
         npt.assert_almost_equal(X[np.int_(f0)][0], 1, decimal=7, err_msg="SP 9: magnitude spectrum incorrect")
 
+        # complex spectrum
+        [X_c, f, t] = pyACA.computeSpectrogram(x, fs, np.ones(iBlockLength), iBlockLength, iHopLength, bNormalize=True, bMagnitude=False)
+
+        self.assertEqual(np.iscomplexobj(X_c), True, "SP 10: complex spectrum type incorrect")
+        npt.assert_almost_equal(np.abs(X_c), X, decimal=12, err_msg="SP 11: complex spectrum incorrect")
+
+    def test_specgram_threads(self):
+        fs = 8000
+        iBlockLength = 4096
+        iHopLength = 64
+        np.random.seed(42)
+        x = np.random.randn(40000, 2)
+
+        # several chunks of blocks
+        [X, f, t] = pyACA.computeSpectrogram(x, fs, None, iBlockLength, iHopLength, bMagnitude=False)
+        [X_t, f_t, t_t] = pyACA.computeSpectrogram(x, fs, None, iBlockLength, iHopLength, bMagnitude=False, iNumThreads=4)
+
+        npt.assert_array_equal(X_t, X, err_msg="SPT 1: threaded spectrogram not identical")
+        npt.assert_array_equal(t_t, t, err_msg="SPT 2: threaded time vector not identical")
+
+        # spectra of shared blocks, at once and chunk by chunk
+        from pyACA.ToolPreprocAudio import ToolPreprocAudio
+        x_b, t_b = pyACA.ToolBlockAudio(ToolPreprocAudio(x), iBlockLength, iHopLength, fs)
+        afWindow = pyACA.ToolComputeHann(iBlockLength)
+        npt.assert_array_equal(pyACA.ToolBlockSpectrum(x_b, afWindow, False), X, err_msg="SPT 3: block spectrum incorrect")
+        for i_start, X_c in pyACA.ToolBlockSpectrumChunks(x_b[:500], afWindow):
+            npt.assert_allclose(X_c, np.abs(X[:, i_start:i_start + X_c.shape[-1]]), rtol=1e-12, err_msg="SPT 4: block spectrum chunk incorrect")
+        self.assertEqual(i_start + X_c.shape[-1], 500, "SPT 5: number of blocks of chunks incorrect")
+
+    def test_streaming_specgram(self):
+        fs = 8000
+        iBlockLength = 1024
+        iHopLength = 256
+        np.random.seed(42)
+        x = np.random.randn(20000)
+
+        [X, f, t] = pyACA.computeSpectrogram(x, fs, None, iBlockLength, iHopLength, bNormalize=False)
+
+        # push chunks of arbitrary size
+        hStream = pyACA.StreamingSpectrogram(fs, None, iBlockLength, iHopLength)
+        chunks = np.split(x, [1, 700, 701, 5000, 12345])
+        [X_s, t_s] = [np.hstack(r) for r in zip(*hStream.process(chunks))]
+
+        self.assertEqual(X_s.shape, X.shape, "SSP 1: spectrogram dimension incorrect")
+        npt.assert_almost_equal(X_s, X, decimal=12, err_msg="SSP 2: spectrogram content incorrect")
+        npt.assert_almost_equal(t_s, t, decimal=12, err_msg="SSP 3: time vector incorrect")
+        npt.assert_almost_equal(hStream.f, f, decimal=12, err_msg="SSP 4: frequency vector incorrect")
+
+        # all channels in float32
+        x_mc = np.stack((x, -0.5 * x), axis=1).astype(np.float32)
+        [X, f, t] = pyACA.computeSpectrogram(x_mc, fs, None, iBlockLength, iHopLength, bNormalize=False, dtype=np.float32, bDownmix=False)
+        hStream = pyACA.StreamingSpectrogram(fs, None, iBlockLength, iHopLength, dtype=np.float32, bDownmix=False)
+        [X_s, t_s] = [np.concatenate(r, axis=-1) for r in zip(*hStream.process(np.split(x_mc, [1, 700, 701, 5000, 12345])))]
+        self.assertEqual(X_s.dtype, np.float32, "SSP 5: spectrogram data type incorrect")
+        npt.assert_allclose(X_s, X, rtol=1e-5, atol=1e-4, err_msg="SSP 6: multi-channel spectrogram content incorrect")
+        npt.assert_almost_equal(t_s, t, decimal=12, err_msg="SSP 7: multi-channel time vector incorrect")
+
+        # hop longer than the block
+        hStream = pyACA.StreamingSpectrogram(fs, None, 128, 200)
+        [X, f, t] = pyACA.computeSpectrogram(x, fs, None, 128, 200, bNormalize=False)
+        [X_s, t_s] = [np.hstack(r) for r in zip(*hStream.process(chunks))]
+        npt.assert_almost_equal(X_s, X, decimal=12, err_msg="SSP 5: spectrogram content incorrect")
+
+    def test_streaming_features(self):
+        f_s = 8000
+        iBlockLength = 512
+        iHopLength = 256
+        np.random.seed(42)
+        x = np.sin(2 * np.pi * 440 * np.arange(0, f_s) / f_s) * np.linspace(0, 1, f_s) + 0.1 * np.random.randn(f_s)
+        x[3000:5000] = 0
+        x = x / np.max(np.abs(x))
+
+        cFeatureNames = pyACA.getFeatureList('all')
+        [v, t] = pyACA.computeFeatures(cFeatureNames, x, f_s, None, iBlockLength, iHopLength)
+
+        # push chunks of arbitrary size, the state is carried across chunks
+        hStream = pyACA.StreamingFeatures(cFeatureNames, f_s, None, iBlockLength, iHopLength)
+        chunks = np.split(x, [1, 700, 701, 3100, 6789])
+        results = list(hStream.process(chunks))
+
+        npt.assert_almost_equal(np.hstack([r[1] for r in results]), t, decimal=12, err_msg="SF 1: time vector incorrect")
+        for cFeatureName in cFeatureNames:
+            v_s = np.concatenate([r[0][cFeatureName] for r in results], axis=-1)
+            npt.assert_allclose(v_s, v[cFeatureName], rtol=1e-10, atol=1e-10, err_msg="SF 2: feature " + cFeatureName + " incorrect")
+
+        # temporal features with a hop length larger than the block length
+        cTemporalNames = [cFeatureName for cFeatureName in cFeatureNames if cFeatureName.startswith("Time")]
+        [v_t, t_t] = pyACA.computeFeatures(cTemporalNames, x, f_s, None, 256, 300)
+        results = list(pyACA.StreamingFeatures(cTemporalNames, f_s, None, 256, 300).process(chunks))
+        for cFeatureName in cTemporalNames:
+            v_s = np.concatenate([r[0][cFeatureName] for r in results], axis=-1)
+            npt.assert_allclose(v_s, v_t[cFeatureName], rtol=1e-10, atol=1e-10, err_msg="SF 6: feature " + cFeatureName + " with large hop incorrect")
+
+        # chunks without a completed block
+        [v_s, t_s] = hStream.push(x[:10])
+        self.assertEqual(v_s["TimeRms"].shape, (2, 0), "SF 3: empty output dimension incorrect")
+        self.assertEqual(v_s["SpectralCentroid"].shape, (0,), "SF 4: empty output dimension incorrect")
+
+        # spectral frames one at a time
+        [X, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
+        hStream = pyACA.StreamingFeatures(["SpectralFlux", "SpectralCentroid"], f_s, None, iBlockLength, iHopLength)
+        vsf = np.hstack([hStream.pushSpectrum(X[:, n])["SpectralFlux"] for n in range(0, X.shape[1])])
+        npt.assert_allclose(vsf, v["SpectralFlux"], rtol=1e-10, atol=1e-12, err_msg="SF 5: spectral frames incorrect")
+
+    def test_features(self):
+        f_s = 8000
+        iBlockLength = 512
+        iHopLength = 256
+        np.random.seed(42)
+        x = np.sin(2 * np.pi * 440 * np.arange(0, f_s) / f_s) + 0.1 * np.random.randn(f_s)
+
+        cFeatureNames = pyACA.getFeatureList('all')
+        [v, t] = pyACA.computeFeatures(cFeatureNames, x, f_s, None, iBlockLength, iHopLength)
+
+        self.assertEqual(sorted(v.keys()), sorted(cFeatureNames), "FS 1: feature names incorrect")
+        for cFeatureName in cFeatureNames:
+            [v_single, t_single] = pyACA.computeFeature(cFeatureName, x, f_s, None, iBlockLength, iHopLength)
+            npt.assert_almost_equal(v[cFeatureName], v_single, decimal=10, err_msg="FS 2: feature " + cFeatureName + " incorrect")
+            npt.assert_almost_equal(t, t_single, decimal=10, err_msg="FS 3: time vector incorrect")
+
+        # the audio is blocked once for the spectrogram and all temporal features
+        with pyACA.ToolProfiler() as hProfiler:
+            pyACA.computeFeatures(cFeatureNames, x, f_s, None, iBlockLength, iHopLength)
+        iNumBlockings = sum(result["iNumCalls"] for cPath, result in hProfiler.getResults().items() if cPath.endswith("ToolBlockAudio"))
+        self.assertEqual(iNumBlockings, 1, "FS 4: number of blockings incorrect")
+
+        # shared blocks give the same result
+        x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, f_s, bView=True)
+        for cFeatureName in ["TimeAcfCoeff", "TimeMaxAcf"]:
+            [v_b, t_b] = pyACA.ToolGetFunction(cFeatureName)(x, iBlockLength, iHopLength, f_s, x_b=x_b)
+            npt.assert_array_equal(v_b, pyACA.ToolGetFunction(cFeatureName)(x, iBlockLength, iHopLength, f_s)[0], err_msg="FS 5: feature " + cFeatureName + " with shared blocks incorrect")
+            npt.assert_array_equal(t_b, t, err_msg="FS 6: time vector with shared blocks incorrect")
+
+    def test_float32(self):
+        f_s = 8000
+        iBlockLength = 512
+        iHopLength = 256
+        np.random.seed(42)
+        x = np.sin(2 * np.pi * 440 * np.arange(0, f_s) / f_s) + 0.1 * np.random.randn(f_s)
+
+        # spectrogram
+        [X, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength, bMagnitude=False)
+        [X_32, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength, bMagnitude=False, dtype=np.float32)
+        self.assertEqual(X_32.dtype, np.complex64, "F32 1: spectrogram type incorrect")
+        npt.assert_allclose(X_32, X, rtol=1e-4, atol=1e-6, err_msg="F32 2: spectrogram incorrect")
+
+        # mel spectrogram
+        [M, f_c, t] = pyACA.computeMelSpectrogram(x, f_s, None, True, iBlockLength, iHopLength)
+        [M_32, f_c, t] = pyACA.computeMelSpectrogram(x, f_s, None, True, iBlockLength, iHopLength, dtype=np.float32)
+        self.assertEqual(M_32.dtype, np.float32, "F32 3: mel spectrogram type incorrect")
+        npt.assert_allclose(M_32, M, rtol=1e-4, atol=1e-3, err_msg="F32 4: mel spectrogram incorrect")
+
+        # features
+        [v, t] = pyACA.computeFeatures(None, x, f_s, None, iBlockLength, iHopLength)
+        [v_32, t] = pyACA.computeFeatures(None, x, f_s, None, iBlockLength, iHopLength, dtype=np.float32)
+        for cFeatureName in v.keys():
+            self.assertEqual(v_32[cFeatureName].dtype, np.float32, "F32 5: feature " + cFeatureName + " type incorrect")
+            npt.assert_allclose(v_32[cFeatureName], v[cFeatureName], rtol=1e-4, atol=1e-5, err_msg="F32 6: feature " + cFeatureName + " incorrect")
+
+        # temporal features do not upcast the signal internally
+        import tracemalloc
+        x_32 = np.tile(x, 20).astype(np.float32)
+        tracemalloc.start()
+        pyACA.FeatureTimeZeroCrossingRate(x_32, iBlockLength, iHopLength, f_s, dtype=np.float32)
+        iPeak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(iPeak, 6 * x_32.nbytes, "F32 7: zero crossing rate memory incorrect")
+
+    def test_output_target(self):
+        import os
+        import tempfile
+
+        f_s = 8000
+        iBlockLength = 4096
+        iHopLength = 64
+        np.random.seed(42)
+        x = np.random.randn(40000)
+
+        with tempfile.TemporaryDirectory() as cDir:
+            # spectrogram (several chunks)
+            [X, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength)
+            cPath = os.path.join(cDir, "X.npy")
+            [X_out, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength, out=cPath)
+            self.assertIsInstance(X_out, np.memmap, "OT 1: spectrogram output type incorrect")
+            npt.assert_array_equal(X_out, X, err_msg="OT 2: spectrogram content incorrect")
+            npt.assert_array_equal(np.load(cPath), X, err_msg="OT 3: spectrogram file incorrect")
+
+            # mel spectrogram into an existing memmap
+            [M, f_c, t] = pyACA.computeMelSpectrogram(x, f_s, None, True, iBlockLength, iHopLength)
+            M_out = np.lib.format.open_memmap(os.path.join(cDir, "M.npy"), mode='w+', dtype=M.dtype, shape=M.shape)
+            pyACA.computeMelSpectrogram(x, f_s, None, True, iBlockLength, iHopLength, out=M_out)
+            npt.assert_almost_equal(M_out, M, decimal=10, err_msg="OT 4: mel spectrogram content incorrect")
+
+            # features (flux needs context across chunks)
+            [v, t] = pyACA.computeFeatures(None, x, f_s, None, iBlockLength, iHopLength)
+            [v_out, t_out] = pyACA.computeFeatures(None, x, f_s, None, iBlockLength, iHopLength, out=cDir)
+            npt.assert_array_equal(t_out, t, err_msg="OT 5: time vector incorrect")
+            for cFeatureName in v.keys():
+                self.assertIsInstance(v_out[cFeatureName], np.memmap, "OT 6: feature " + cFeatureName + " output type incorrect")
+                npt.assert_almost_equal(v_out[cFeatureName], v[cFeatureName], decimal=10, err_msg="OT 7: feature " + cFeatureName + " incorrect")
+
+            [v_out, t_out] = pyACA.computeFeature("SpectralFlux", x, f_s, None, iBlockLength, iHopLength, out=os.path.join(cDir, "flux.npy"))
+            npt.assert_almost_equal(v_out, v["SpectralFlux"], decimal=10, err_msg="OT 8: feature output incorrect")
+
+            # release the maps before the directory is removed
+            del X_out, M_out, v_out
+
+    def test_multichannel(self):
+        f_s = 8000
+        iBlockLength = 1024
+        iHopLength = 256
+        np.random.seed(42)
+        x = np.random.randn(20000, 3)
+        x[:, 1] *= np.sin(np.arange(0, 20000) / 300)
+
+        # same maximum per channel so that per-channel and joint normalization agree
+        x /= np.max(np.abs(x), axis=0)
+
+        [X, f, t] = pyACA.computeSpectrogram(x, f_s, None, iBlockLength, iHopLength, bDownmix=False)
+        self.assertEqual(X.shape[0:2], (3, iBlockLength // 2 + 1), "MC 1: spectrogram dimension incorrect")
+        for c in range(0, x.shape[1]):
+            [X_c, f, t] = pyACA.computeSpectrogram(x[:, c], f_s, None, iBlockLength, iHopLength)
+            npt.assert_almost_equal(X[c], X_c, decimal=12, err_msg="MC 2: spectrogram content incorrect")
+
+        [v, t] = pyACA.computeFeatures(None, x, f_s, None, iBlockLength, iHopLength, bDownmix=False)
+        for cFeatureName in v.keys():
+            self.assertEqual(v[cFeatureName].shape[0], x.shape[1], "MC 3: feature " + cFeatureName + " dimension incorrect")
+            for c in range(0, x.shape[1]):
+                [v_c, t_c] = pyACA.computeFeature(cFeatureName, x[:, c], f_s, None, iBlockLength, iHopLength)
+                npt.assert_almost_equal(v[cFeatureName][c], v_c, decimal=10, err_msg="MC 4: feature " + cFeatureName + " incorrect")
+
+    def test_batch(self):
+        import os
+        import tempfile
+        from scipy.io.wavfile import write as wavwrite
+
+        f_s = 8000
+        iBlockLength = 1024
+        iHopLength = 512
+
+        with tempfile.TemporaryDirectory() as cDir:
+            cPaths = []
+            for n, fFreq in enumerate([220, 440, 880]):
+                cPaths.append(os.path.join(cDir, str(n) + ".wav"))
+                wavwrite(cPaths[-1], f_s, np.sin(2 * np.pi * fFreq * np.arange(0, f_s) / f_s).astype(np.float32))
+            cPaths.append(os.path.join(cDir, "missing.wav"))
+
+            cResults = {cPath: (result, error) for cPath, result, error in pyACA.computeBatch(cPaths, "computeFeature", 2, 2, cFeatureName="SpectralCentroid", iBlockLength=iBlockLength, iHopLength=iHopLength)}
+
+            self.assertEqual(sorted(cResults.keys()), sorted(cPaths), "BA 1: batch paths incorrect")
+            self.assertIsNone(cResults[cPaths[-1]][0], "BA 2: result of failed file incorrect")
+            self.assertIsInstance(cResults[cPaths[-1]][1], str, "BA 3: error of failed file incorrect")
+            for cPath in cPaths[:-1]:
+                [f_s, x] = pyACA.ToolReadAudio(cPath)
+                [v, t] = pyACA.computeFeature("SpectralCentroid", x, f_s, None, iBlockLength, iHopLength)
+                self.assertIsNone(cResults[cPath][1], "BA 4: error incorrect")
+                npt.assert_array_equal(cResults[cPath][0][0], v, err_msg="BA 5: batch result incorrect")
+
+            # chunks that cannot be sent to a worker fail for each of their paths
+            cResults = list(pyACA.computeBatch(cPaths, "computeFeature", 2, 2, cFeatureName=lambda: "SpectralCentroid"))
+            self.assertEqual(sorted(r[0] for r in cResults), sorted(cPaths), "BA 6: paths of failed chunks incorrect")
+            self.assertTrue(all(r[1] is None and isinstance(r[2], str) for r in cResults), "BA 7: errors of failed chunks incorrect")
+
+        # invalid tasks fail at the call
+        with self.assertRaises(AssertionError):
+            pyACA.computeBatch([], "computeNothing")
+
     def test_melspecgram(self):
         f = 400
         f_s = 40000
@@ -71,6 +338,18 @@ class TestComputes(unittest.TestCase):
         [M, f, t] = pyACA.computeMelSpectrogram(x, f_s, None, True, iBlockLength, iHopLength, iNumMelBands)
         self.assertEqual(M.shape[0], iNumMelBands, "MSP 3: number of frequency bins incorrect")
 
+    def test_beathisto(self):
+        f_s = 22050
+
+        # clicks at 120 BPM, the novelty function is shorter than the histogram length and zero-padded
+        x = np.zeros(10 * f_s)
+        x[::f_s // 2] = 1
+
+        [T, Bpm] = pyACA.computeBeatHisto(x, f_s)
+        self.assertEqual(T.shape, (Bpm.shape[0], 1), "BH 1: beat histogram dimension incorrect")
+        self.assertTrue(Bpm[0] >= 29 and Bpm[-1] <= 200, "BH 2: BPM range incorrect")
+        self.assertAlmostEqual(Bpm[np.argmax(T)], 120, delta=1, msg="BH 3: beat histogram maximum incorrect")
+
     def test_chords(self):
         fSeriesOfIntervals = 2**(np.array([[7, 12, 14, 7, 10],
                                            [4, 9, 11, 4, 6],
@@ -179,6 +179,130 @@ class TestFeatures(unittest.TestCase):
         vsf = pyACA.FeatureSpectralFlux(X, -1)
         npt.assert_almost_equal(vsf[1], np.sqrt(5) / 5, decimal=7, err_msg="SF 3: value incorrect")
 
+    def test_spectral_moments(self):
+        fs = 44100
+        rng = np.random.default_rng(7)
+
+        # broadband, narrow band, delta, and zero observations
+        X = rng.uniform(0, 1, size=(513, 6))
+        X[:, 1] = np.exp(-.5 * (np.arange(513) - 400.3)**2)
+        X[:, 2] = 0
+        X[37, 2] = 1
+        X[:, 3] = 0
+
+        k = np.arange(513)
+        for n in range(X.shape[1]):
+            norm = max(X[:, n].sum(), 1)
+            sc = np.dot(k, X[:, n]) / norm
+            ss = np.sqrt(np.dot((k - sc)**2, X[:, n]) / norm)
+            std = ss if ss > 0 else 1
+            ssk = np.dot((k - sc)**3, X[:, n]) / norm / std**3
+            sk = np.dot((k - sc)**4, X[:, n]) / norm / std**4 - 3
+
+            M = pyACA.ToolSpectralMoments(X[:, n], fs)
+            npt.assert_allclose(M, [sc * fs / 1024, ss * fs / 1024, ssk, sk], rtol=1e-10, atol=1e-10, err_msg="SM 1: moments incorrect")
+
+        # features are rows of the moments, also for multi-channel input
+        M = pyACA.ToolSpectralMoments(X, fs)
+        for iRow, cName in enumerate(['SpectralCentroid', 'SpectralSpread', 'SpectralSkewness', 'SpectralKurtosis']):
+            npt.assert_array_equal(getattr(pyACA, "Feature" + cName)(X, fs), M[iRow], err_msg="SM 2: feature incorrect")
+            npt.assert_array_equal(getattr(pyACA, "Feature" + cName)(np.stack([X, X[::-1]]), fs)[0], M[iRow], err_msg="SM 3: multi-channel incorrect")
+            npt.assert_array_equal(pyACA.ToolSpectralMoments(X, fs, cName), M[iRow], err_msg="SM 6: selected moment incorrect")
+        self.assertEqual(pyACA.FeatureSpectralKurtosis(X[:, 3], fs), -3, "SM 4: zero input incorrect")
+        self.assertEqual(pyACA.FeatureSpectralSpread(X[:, 2], fs), 0, "SM 5: delta input incorrect")
+
+        # shared moments in computeFeatures
+        x = rng.standard_normal(20000)
+        v, t = pyACA.computeFeatures(['SpectralSkewness', 'SpectralRolloff', 'SpectralCentroid'], x, fs)
+        for cName in v:
+            npt.assert_array_equal(v[cName], pyACA.computeFeature(cName, x, fs)[0], err_msg="SM 6: shared moments incorrect")
+
+    def test_spectral_mfccs(self):
+        from pyACA.FeatureSpectralMfccs import generateDctMatrix
+
+        fs = 44100
+        X = np.random.default_rng(3).uniform(0, 1, size=(2049, 1200))
+        X[:, 5] = 0
+
+        # per observation reference spanning multiple chunks
+        H = pyACA.ToolMfccFb.ToolMfccFb(2049, fs)
+        T = generateDctMatrix(H.shape[0], 13)
+        v_ref = np.stack([T @ np.log10(H @ X[:, n] + 1e-20) for n in range(X.shape[1])], axis=1)
+
+        v_mfcc = pyACA.FeatureSpectralMfccs(X, fs)
+        npt.assert_allclose(v_mfcc, v_ref, rtol=1e-10, atol=1e-10, err_msg="MFCC 1: values incorrect")
+        npt.assert_allclose(pyACA.FeatureSpectralMfccs(X[:, 7], fs), v_ref[:, 7], rtol=1e-10, atol=1e-10, err_msg="MFCC 2: spectrum input incorrect")
+
+        # parameters
+        self.assertEqual(pyACA.FeatureSpectralMfccs(X, fs, iNumCoeffs=20).shape, (20, 1200), "MFCC 3: number of coefficients incorrect")
+        npt.assert_almost_equal(pyACA.FeatureSpectralMfccs(X, fs, fLogFloor=1)[0, 5], 0, decimal=10, err_msg="MFCC 4: log floor incorrect")
+        npt.assert_allclose(pyACA.FeatureSpectralMfccs(X, fs, H=2 * H)[:, 6:], v_mfcc[:, 6:] + T @ np.full(H.shape[0], np.log10(2))[:, np.newaxis], rtol=1e-10, atol=1e-10, err_msg="MFCC 5: filterbank incorrect")
+
+    def test_block_statistics_features(self):
+        fs = 8000
+        rng = np.random.default_rng(4)
+
+        # noise, signal with offset, and signal with exact zeros; compared with the definition on the zero-padded blocks
+        for x in [rng.standard_normal(1000), 5 + 1e-3 * rng.standard_normal(1000), np.round(rng.standard_normal(1000))]:
+            for iBlockLength, iHopLength in [(256, 128), (100, 7), (16, 100)]:
+                x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, fs)
+
+                vstd, t = pyACA.FeatureTimeStd(x, iBlockLength, iHopLength, fs)
+                npt.assert_allclose(vstd, np.std(x_b, axis=1), rtol=1e-9, atol=1e-12, err_msg="BSF 1: std incorrect")
+
+                vzc, t = pyACA.FeatureTimeZeroCrossingRate(x, iBlockLength, iHopLength, fs)
+                npt.assert_allclose(vzc, 0.5 * np.mean(np.abs(np.diff(np.sign(x_b), axis=1)), axis=1), rtol=1e-12, err_msg="BSF 2: zcr incorrect")
+
+                # shared blocks
+                npt.assert_allclose(pyACA.FeatureTimeStd(x, iBlockLength, iHopLength, fs, x_b=x_b)[0], vstd, rtol=1e-9, atol=1e-12, err_msg="BSF 3: std of blocks incorrect")
+                npt.assert_allclose(pyACA.FeatureTimeZeroCrossingRate(x, iBlockLength, iHopLength, fs, x_b=x_b)[0], vzc, rtol=1e-12, err_msg="BSF 4: zcr of blocks incorrect")
+
+    def test_acf_features(self):
+        fs = 22050
+        t = np.arange(0, 15000) / fs
+        x = np.sin(2 * np.pi * 210 * t) * (1 + .3 * np.sin(2 * np.pi * 3 * t)) + .05 * np.random.default_rng(8).standard_normal(t.size)
+        x[:3000] = 0
+        iBlockLength = 1024
+        iHopLength = 256
+
+        # per block reference of the previous implementation
+        x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, fs)
+        eta_min_init = int(np.floor(fs / 2000))
+        vmax_ref = np.zeros(x_b.shape[0])
+        f_0_ref = np.zeros(x_b.shape[0])
+        vacf_ref = np.zeros(x_b.shape[0])
+        for n, block in enumerate(x_b):
+            if not block.sum():
+                continue
+            afCorr = np.correlate(block, block, "full") / np.dot(block, block)
+            vacf_ref[n] = afCorr[iBlockLength + 19]
+            afCorr = afCorr[iBlockLength:]
+            eta_min = max(eta_min_init, np.argmax(afCorr < .35), np.argmax(np.diff(afCorr) > 0))
+            vmax_ref[n] = np.max(np.abs(afCorr[eta_min + 1:]))
+            f_0_ref[n] = fs / (np.argmax(afCorr[eta_min + 1:]) + eta_min + 2)
+
+        npt.assert_allclose(pyACA.FeatureTimeAcfCoeff(x, iBlockLength, iHopLength, fs)[0][0], vacf_ref, atol=1e-12, err_msg="ACFF 1: acf coefficient incorrect")
+        npt.assert_allclose(pyACA.FeatureTimeMaxAcf(x, iBlockLength, iHopLength, fs)[0], vmax_ref, atol=1e-12, err_msg="ACFF 2: acf maximum incorrect")
+        npt.assert_array_equal(pyACA.PitchTimeAcf(x, iBlockLength, iHopLength, fs)[0], f_0_ref, err_msg="ACFF 3: acf pitch incorrect")
+
+        # spectral acf pitch
+        from scipy.signal import find_peaks
+
+        X, f, t = pyACA.computeSpectrogram(x, fs, None, iBlockLength, iHopLength)
+        X_sym = X.copy()
+        X_sym[0, :] = np.max(X_sym)
+        X_sym = np.concatenate((np.flipud(X_sym[1:, :]), X_sym[:-1, :]), axis=0)
+        f_0_ref = np.zeros(X.shape[1])
+        for n in range(0, X.shape[1]):
+            afCorr = (np.correlate(X_sym[:, n], X_sym[:, n], "full") / np.dot(X_sym[:, n], X_sym[:, n]))[X_sym.shape[0]:]
+            eta_min = int(round(300 / fs * (X_sym.shape[0] - 2))) - 1
+            iPeaks = find_peaks(afCorr, height=0)[0]
+            if iPeaks.size:
+                eta_min = max(eta_min, iPeaks[0] - 1)
+            f_0_ref[n] = (np.argmax(afCorr[eta_min:]) + 1 + eta_min) / (X_sym.shape[0] - 2) * fs
+
+        npt.assert_array_equal(pyACA.PitchSpectralAcf(X, fs), f_0_ref, err_msg="ACFF 4: spectral acf pitch incorrect")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -148,6 +148,33 @@ class TestTools(unittest.TestCase):
         dim = xb.shape
         self.assertEqual(dim[0], targetNumBlocks, "TB 6: number of blocks incorrect")
         self.assertEqual(dim[1], iBlockLength, "TB 7: block length incorrect")
+        npt.assert_array_equal(pyACA.ToolBlockTimeStamps(numSamples, iBlockLength, iHopLength, fs), t, err_msg="TB 16: time stamps without blocks incorrect")
+
+        # strided view and lazy iterator
+        [xb_view, t_view] = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, fs, bView=True)
+        npt.assert_array_equal(xb_view, xb, err_msg="TB 8: block view content incorrect")
+        npt.assert_array_equal(t_view, t, err_msg="TB 9: block view time stamp incorrect")
+        self.assertEqual(xb_view.flags.writeable, False, "TB 10: block view not read-only")
+
+        for n, (block, time) in enumerate(pyACA.ToolBlockAudioIter(x, iBlockLength, iHopLength, fs)):
+            npt.assert_array_equal(block, xb[n], err_msg="TB 11: block iterator content incorrect")
+            npt.assert_almost_equal(time, t[n], decimal=10, err_msg="TB 12: block iterator time stamp incorrect")
+        self.assertEqual(n + 1, targetNumBlocks, "TB 13: block iterator number of blocks incorrect")
+
+        # multi-channel blocks
+        x_mc = np.stack([x, -x, 2 * x], axis=1)
+        [xb_mc, t_mc] = pyACA.ToolBlockAudio(x_mc, iBlockLength, iHopLength, fs)
+        self.assertEqual(xb_mc.shape, (3, *xb.shape), "TB 14: multi-channel block dimension incorrect")
+        npt.assert_array_equal(xb_mc[2], 2 * xb, err_msg="TB 15: multi-channel block content incorrect")
+
+        # block buffer and iterator with multi-channel float32 chunks
+        x_mc = x_mc[:5000].astype(np.float32)
+        [xb_mc, t_mc] = pyACA.ToolBlockAudio(x_mc, iBlockLength, iHopLength, fs, dtype=np.float32)
+        hBuffer = pyACA.ToolBlockBuffer(iBlockLength, iHopLength, np.float32)
+        xb_s = np.concatenate([hBuffer.push(x_c) for x_c in np.split(x_mc, [1, 700, 3000])] + [hBuffer.flush()], axis=-2)
+        self.assertEqual(xb_s.dtype, np.float32, "TB 17: block buffer data type incorrect")
+        npt.assert_array_equal(xb_s, xb_mc, err_msg="TB 18: multi-channel block buffer content incorrect")
+        npt.assert_array_equal(np.stack([block for block, time in pyACA.ToolBlockAudioIter(x_mc, iBlockLength, iHopLength, fs)], axis=-2), xb_mc, err_msg="TB 19: multi-channel block iterator content incorrect")
 
     def test_freq2bin2freq(self):
 
@@ -319,6 +346,85 @@ class TestTools(unittest.TestCase):
         npt.assert_almost_equal(np.max(w), 1, decimal=7, err_msg="HN 3: window maximum incorrect")
         npt.assert_almost_equal(w[int(iBlockLength[-1]/4)], .5, decimal=7, err_msg="HN 4: window shape incorrect")
 
+    def test_cache(self):
+
+        pyACA.ToolCacheClear()
+        cName = pyACA.ToolComputeHann.__module__ + "." + pyACA.ToolComputeHann.__qualname__
+        self.assertEqual(pyACA.ToolCacheInfo()[cName].currsize, 0, "CA 1: cache not cleared")
+
+        w1 = pyACA.ToolComputeHann(256)
+        w2 = pyACA.ToolComputeHann(np.int_(256))
+        w1 *= 2
+        npt.assert_array_equal(w1, 2 * w2, err_msg="CA 2: cached result not copied")
+
+        info = pyACA.ToolCacheInfo()[cName]
+        self.assertEqual(info.hits, 1, "CA 4: cache hits incorrect")
+        self.assertEqual(info.misses, 1, "CA 5: cache misses incorrect")
+
+        pyACA.ToolCacheClear()
+        self.assertEqual(pyACA.ToolCacheInfo()[cName].currsize, 0, "CA 6: cache not cleared")
+
+        # public results are writeable, internal results are shared and read-only
+        from pyACA.ToolMfccFb import ToolMfccFb
+        from pyACA.FeatureSpectralMfccs import generateDctMatrix
+        H = ToolMfccFb(1024, 44100)
+        H *= 2
+        npt.assert_array_equal(H, 2 * ToolMfccFb(1024, 44100), err_msg="CA 7: cached filterbank not copied")
+        [M, f_c, t] = pyACA.computeMelSpectrogram(np.zeros(4096), 44100, iBlockLength=1024, iHopLength=512)
+        f_c *= 2
+        self.assertEqual(generateDctMatrix(40, 13).flags.writeable, False, "CA 8: cached result not read-only")
+
+    def test_profiler(self):
+        f_s = 8000
+        np.random.seed(42)
+        x = np.random.randn(2 * f_s)
+
+        [d, t, iPeaks] = pyACA.computeNoveltyFunction("Flux", x, f_s)
+
+        with pyACA.ToolProfiler(bMemory=True) as hProfiler:
+            [d_prof, t_prof, iPeaks_prof] = pyACA.computeNoveltyFunction("Flux", x, f_s)
+
+        # results outside the profiler are not recorded
+        pyACA.computeNoveltyFunction("Flux", x, f_s)
+
+        results = hProfiler.getResults()
+        npt.assert_array_equal(d_prof, d, err_msg="PR 1: profiled result incorrect")
+        self.assertEqual(list(results.keys())[0], "computeNoveltyFunction", "PR 2: stage order incorrect")
+        self.assertIn("computeNoveltyFunction/computeSpectrogram/fft", results, "PR 3: nested stage missing")
+        self.assertEqual(results["computeNoveltyFunction"]["iNumCalls"], 1, "PR 4: number of calls incorrect")
+        self.assertEqual(results["computeNoveltyFunction/computeSpectrogram/fft"]["iNumFrames"], len(t), "PR 5: number of frames incorrect")
+        npt.assert_almost_equal(results["computeNoveltyFunction"]["fRealTimeFactor"], results["computeNoveltyFunction"]["fTime"] / 2, decimal=10, err_msg="PR 6: real-time factor incorrect")
+        self.assertGreater(results["computeNoveltyFunction/computeSpectrogram/fft"]["iBytes"], 0, "PR 7: allocated bytes incorrect")
+
+        # spans in worker threads are nested in the span of the calling thread if the function inherits it
+        from concurrent.futures import ThreadPoolExecutor
+
+        def work(i):
+            with pyACA.ToolProfileSpan("work", 1):
+                return i
+
+        with pyACA.ToolProfiler(bMemory=True) as hProfiler:
+            with pyACA.ToolProfileSpan("outer"):
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    list(executor.map(pyACA.ToolProfileInherit(work), range(4)))
+        results = hProfiler.getResults()
+        self.assertEqual(results["outer/work"]["iNumFrames"], 4, "PR 8: span of worker threads incorrect")
+        self.assertIsNone(results["outer/work"]["iBytes"], "PR 9: memory of worker threads incorrect")
+
+    def test_sparse_filterbank(self):
+
+        from pyACA.ToolMfccFb import ToolMfccFb
+
+        H = ToolMfccFb(2049, 44100)
+        H_sparse = ToolMfccFb(2049, 44100, bSparse=True)
+
+        self.assertEqual(H_sparse.shape, H.shape, "SFB 1: filterbank dimension incorrect")
+        self.assertEqual(H_sparse.nnz < H.size / 10, True, "SFB 2: filterbank not sparse")
+        npt.assert_array_equal(H_sparse.toarray(), H, err_msg="SFB 3: filterbank content incorrect")
+
+        X = np.random.rand(2049, 3)
+        npt.assert_almost_equal(H_sparse @ X, H @ X, decimal=12, err_msg="SFB 4: filterbank product incorrect")
+
     def test_instfreq(self):
         iBlockLength = 1024
         iHopLength = 128
@@ -377,6 +483,75 @@ class TestTools(unittest.TestCase):
         npt.assert_almost_equal(diffs0, 0, decimal=1, err_msg="GMM 3: incorrect result")
         npt.assert_almost_equal(diffs1, 0, decimal=1, err_msg="GMM 4: incorrect result")
 
+    def test_readaudio(self):
+        import os
+        import tempfile
+        from scipy.io.wavfile import write as wavwrite
+
+        f_s = 8000
+        x = (np.sin(2 * np.pi * 440 * np.arange(0, f_s) / f_s) * 2**14).astype(np.int16)
+
+        with tempfile.TemporaryDirectory() as cDir:
+            cPath = os.path.join(cDir, "test.wav")
+            wavwrite(cPath, f_s, x)
+
+            [fs_out, x_out] = pyACA.ToolReadAudio(cPath)
+            [fs_out, x_32] = pyACA.ToolReadAudio(cPath, dtype=np.float32)
+
+        self.assertEqual(fs_out, f_s, "RA 1: sample rate incorrect")
+        self.assertEqual(x_out.dtype, np.float64, "RA 2: default type incorrect")
+        self.assertEqual(x_32.dtype, np.float32, "RA 3: float32 type incorrect")
+        npt.assert_almost_equal(x_out, x / 2**15, decimal=12, err_msg="RA 4: scaling incorrect")
+        npt.assert_allclose(x_32, x_out, rtol=1e-6, err_msg="RA 5: float32 scaling incorrect")
+
+    def test_readaudiochunks(self):
+        import os
+        import tempfile
+        from scipy.io.wavfile import write as wavwrite
+
+        f_s = 8000
+        iChunkLength = 3000
+        np.random.seed(42)
+        cTypes = {'uint8': np.random.randint(0, 256, [10001, 2]).astype(np.uint8),
+                  'int16': np.random.randint(-2**15, 2**15, [10001, 2]).astype(np.int16),
+                  'int32': np.random.randint(-2**31, 2**31, [10001, 2]).astype(np.int32),
+                  'float32': np.random.uniform(-1, 1, [10001, 2]).astype(np.float32)}
+
+        with tempfile.TemporaryDirectory() as cDir:
+            for cType, x in cTypes.items():
+                cPath = os.path.join(cDir, cType + ".wav")
+                wavwrite(cPath, f_s, x)
+
+                [fs_out, iNumChannels, iNumSamples] = pyACA.ToolReadAudioInfo(cPath)
+                self.assertEqual((fs_out, iNumChannels, iNumSamples), (f_s, 2, 10001), "RC 1: info incorrect for " + cType)
+
+                [fs_out, x_out] = pyACA.ToolReadAudio(cPath)
+                self.assertGreaterEqual(np.min(x_out), -1, "RC 2: range incorrect for " + cType)
+                self.assertLess(np.max(x_out), 1, "RC 3: range incorrect for " + cType)
+
+                cChunks = list(pyACA.ToolReadAudioChunks(cPath, iChunkLength))
+                self.assertEqual([c.shape[0] for c in cChunks], [3000, 3000, 3000, 1001], "RC 4: chunk lengths incorrect for " + cType)
+                npt.assert_array_equal(np.concatenate(cChunks), x_out, err_msg="RC 5: chunk content incorrect for " + cType)
+
+                cChunks = list(pyACA.ToolReadAudioChunks(cPath, iChunkLength, np.float32))
+                self.assertEqual(cChunks[0].dtype, np.float32, "RC 6: chunk type incorrect for " + cType)
+
+            # 24 bit files cannot be memory mapped and are read chunk by chunk, with another chunk before the data
+            import struct
+            x = np.random.randint(-2**23, 2**23, [10001, 2])
+            acData = x.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+            acBody = (b'WAVEfmt ' + struct.pack('<IHHIIHH', 16, 1, 2, f_s, 6 * f_s, 6, 24) + b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+                      + b'data' + struct.pack('<I', len(acData)) + acData)
+            cPath = os.path.join(cDir, "int24.wav")
+            with open(cPath, 'wb') as hFile:
+                hFile.write(b'RIFF' + struct.pack('<I', len(acBody)) + acBody)
+
+            [fs_out, iNumChannels, iNumSamples] = pyACA.ToolReadAudioInfo(cPath)
+            self.assertEqual((fs_out, iNumChannels, iNumSamples), (f_s, 2, 10001), "RC 7: info incorrect for int24")
+            cChunks = list(pyACA.ToolReadAudioChunks(cPath, iChunkLength))
+            self.assertEqual([c.shape[0] for c in cChunks], [3000, 3000, 3000, 1001], "RC 8: chunk lengths incorrect for int24")
+            npt.assert_array_equal(np.concatenate(cChunks), x / 2**23, err_msg="RC 9: chunk content incorrect for int24")
+
     def test_normalize(self):
         x = np.array([.1, .2, -.8])
 
@@ -390,3 +565,239 @@ class TestTools(unittest.TestCase):
         x_downmix = pyACA.ToolDownmix(x)
         npt.assert_almost_equal(np.mean(x_downmix), .2, decimal=7, err_msg="DM 1: incorrect result")
         npt.assert_almost_equal(np.max(x_downmix), .2, decimal=7, err_msg="DM 2: incorrect result")
+
+    def test_lazy_import(self):
+        import subprocess
+        import sys
+
+        # the plotting and scipy dependencies are only loaded by the functions using them
+        cScript = ("import sys, numpy as np, pyACA\n"
+                   "pyACA.computeSpectrogram(np.ones(8192), 44100)\n"
+                   "print(' '.join(m for m in ('matplotlib', 'scipy') if m in sys.modules))\n")
+        cModules = subprocess.run([sys.executable, "-c", cScript], capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual(cModules, "", "LI 1: heavy modules imported incorrectly")
+
+        from pyACA.computeFeature import computeFeature
+        self.assertTrue(callable(pyACA.computeFeature), "LI 2: export shadowed by submodule")
+        self.assertTrue(callable(pyACA.ToolMfccFb.ToolMfccFb), "LI 3: submodule access incorrect")
+        self.assertIn("computeKey", dir(pyACA), "LI 4: dir incorrect")
+        with self.assertRaises(AttributeError):
+            pyACA.doesNotExist
+
+        # star import binds the public functions and classes, but not the heavy dependencies
+        cScript = ("import sys\n"
+                   "from pyACA import *\n"
+                   "import pyACA\n"
+                   "print(all(callable(globals().get(c)) for c in pyACA.__all__), sorted(pyACA.__all__) == sorted(pyACA.cExports))\n"
+                   "print(' '.join(m for m in ('matplotlib', 'scipy') if m in sys.modules))\n")
+        cOutput = subprocess.run([sys.executable, "-c", cScript], capture_output=True, text=True, check=True).stdout.split("\n")
+        self.assertEqual(cOutput[0], "True True", "LI 5: star import incorrect")
+        self.assertEqual(cOutput[1], "", "LI 6: heavy modules imported incorrectly by star import")
+
+    def test_registry(self):
+        import inspect
+        import os
+
+        # the registry lists exactly the implementations in the package
+        cPackageDir = os.path.dirname(pyACA.__file__)
+        for cType in ["Feature", "Pitch", "Novelty"]:
+            cFiles = sorted(f[len(cType):-3] for f in os.listdir(cPackageDir) if f.startswith(cType) and f.endswith(".py"))
+            self.assertEqual(sorted(pyACA.ToolRegistry.registry[cType]), cFiles, "RG 1: registry incomplete for " + cType)
+
+            for cName in cFiles:
+                descriptor = pyACA.ToolGetDescriptor(cName, cType)
+                hFunc = pyACA.ToolGetFunction(cName, cType)
+                self.assertIs(hFunc, getattr(pyACA, cType + cName), "RG 2: function incorrect for " + cName)
+
+                # the default parameters match the signature
+                parameters = inspect.signature(hFunc).parameters
+                defaults = {p: v.default for p, v in parameters.items() if v.default is not inspect.Parameter.empty}
+                self.assertEqual(descriptor["defaults"], defaults, "RG 3: defaults incorrect for " + cName)
+                self.assertEqual(descriptor["cDomain"] == "spectral", "X" in parameters, "RG 4: domain incorrect for " + cName)
+
+        self.assertEqual(pyACA.getFeatureList('spectral') + pyACA.getFeatureList('temporal'), pyACA.getFeatureList('all'), "RG 5: feature list incorrect")
+        groups = pyACA.ToolGroupByIntermediate(['SpectralCentroid', 'TimeStd', 'SpectralPitchChroma', 'SpectralFlux'])
+        self.assertEqual(groups[("magnitude",)], ['SpectralCentroid', 'SpectralFlux'], "RG 6: grouping incorrect")
+        self.assertEqual(groups[("power",)], ['SpectralPitchChroma'], "RG 7: grouping incorrect")
+
+        # the output dimension matches the implementation
+        x = np.random.default_rng(1).standard_normal(8192)
+        for cName in pyACA.getFeatureList('all'):
+            v, t = pyACA.computeFeature(cName, x, 44100, iBlockLength=1024, iHopLength=512)
+            iNumDims = 1 if v.ndim == 1 else v.shape[0]
+            self.assertEqual(pyACA.ToolGetDescriptor(cName)["iNumDims"], iNumDims, "RG 8: dimension incorrect for " + cName)
+
+        with self.assertRaises(AssertionError):
+            pyACA.computeFeature("SpectralDoesNotExist", x, 44100)
+
+    def test_blockstatistics(self):
+        from pyACA.FeatureTimeRms import filterSP
+
+        rng = np.random.default_rng(5)
+        for iLength in [1, 7, 300, 1000]:
+            x = rng.standard_normal(iLength)
+            for iBlockLength, iHopLength in [(256, 128), (64, 64), (16, 100), (100, 7), (1, 1)]:
+                x_b, t = pyACA.ToolBlockAudio(x, iBlockLength, iHopLength, 1)
+                npt.assert_allclose(pyACA.ToolBlockSum(x, iBlockLength, iHopLength), x_b.sum(axis=1), rtol=1e-12, atol=1e-12, err_msg="BS 1: block sum incorrect")
+                afMax = [x[i:i + iBlockLength].max() for i in range(0, iLength, iHopLength)]
+                npt.assert_array_equal(pyACA.ToolBlockMax(x, iBlockLength, iHopLength), afMax, err_msg="BS 2: block max incorrect")
+
+        # single pole filter with carried state
+        x = rng.standard_normal(1000)**2
+        xf = filterSP(x, .1)
+        afRef = np.zeros(1000)
+        afRef[0] = .1 * x[0]
+        for i in range(1, 1000):
+            afRef[i] = .1 * x[i] + .9 * afRef[i - 1]
+        npt.assert_allclose(xf, afRef, rtol=1e-12, err_msg="BS 3: single pole filter incorrect")
+        npt.assert_allclose(np.concatenate((filterSP(x[:300], .1), filterSP(x[300:], .1, xf[299]))), xf, rtol=1e-12, err_msg="BS 4: filter state incorrect")
+
+        # all channels at once (samples x channels in, channels x blocks out)
+        x = rng.standard_normal([1000, 3])
+        for hFunc in [pyACA.ToolBlockSum, pyACA.ToolBlockMax, pyACA.ToolBlockStd]:
+            npt.assert_allclose(hFunc(x, 64, 48), np.stack([hFunc(x[:, c], 64, 48) for c in range(0, 3)]), rtol=1e-12, atol=1e-12, err_msg="BS 5: multi-channel block statistics incorrect")
+        npt.assert_allclose(filterSP(x.T, .1, [0, 1, 2])[2], filterSP(x[:, 2], .1, 2), rtol=1e-12, err_msg="BS 6: multi-channel filter incorrect")
+
+    def test_peakmeter(self):
+        f_s = 8000
+        x = np.random.default_rng(2).standard_normal([3000, 2])
+
+        # chunked processing matches processing at once
+        meter = pyACA.ToolPeakMeter(f_s, iNumChannels=2)
+        v_ppm = meter.process(x)
+        meter.reset()
+        v_chunks = np.concatenate([meter.process(x[i:i + 700]) for i in range(0, 3000, 700)])
+        npt.assert_array_equal(v_chunks, v_ppm, err_msg="PM 1: chunked processing incorrect")
+
+        # channels are independent and the attack follows the ballistics
+        npt.assert_array_equal(pyACA.ToolPeakMeter(f_s).process(x[:, 1]), v_ppm[:, 1], err_msg="PM 2: channel incorrect")
+        fAlpha = 1 - np.exp(-2.2 / (f_s * 0.01))
+        npt.assert_almost_equal(pyACA.ToolPeakMeter(f_s).process(np.ones(2)), [fAlpha, fAlpha + (1 - fAlpha) * fAlpha], decimal=12, err_msg="PM 3: attack incorrect")
+        [v_filter, fState] = pyACA.ToolPpmFilter(np.abs(x[:, 1]), 0, meter.alpha)
+        npt.assert_array_equal(v_filter, v_ppm[:, 1], err_msg="PM 6: filter incorrect")
+        self.assertEqual(fState, v_ppm[-1, 1], "PM 7: filter state incorrect")
+
+        # the block maxima of the envelope are independent of the block overlap
+        v, t = pyACA.FeatureTimePeakEnvelope(x[:, 0], 256, 256, f_s)
+        v_overlap, t = pyACA.FeatureTimePeakEnvelope(x[:, 0], 256, 64, f_s)
+        npt.assert_array_equal(v_overlap[:, ::4], v, err_msg="PM 4: block overlap incorrect")
+        self.assertEqual(pyACA.FeatureTimePeakEnvelope(x[:, 0], 64, 256, f_s)[0].shape, (2, 12), "PM 5: hop larger than block incorrect")
+
+    def test_acf(self):
+        rng = np.random.default_rng(6)
+        x_b = rng.standard_normal([5, 300])
+        x_b[1, 100:] = 0
+        x_b[2] = 0
+
+        # reference: normalized full correlation per block
+        r_ref = np.zeros([5, 300])
+        for n in range(0, 5):
+            fNorm = np.dot(x_b[n], x_b[n])
+            if fNorm:
+                r_ref[n] = np.correlate(x_b[n], x_b[n], "full")[299:] / fNorm
+
+        npt.assert_allclose(pyACA.ToolAcf(x_b), r_ref, rtol=1e-10, atol=1e-13, err_msg="ACF 1: fft acf incorrect")
+        npt.assert_allclose(pyACA.ToolAcf(x_b, 5), r_ref[:, :6], rtol=1e-10, atol=1e-13, err_msg="ACF 2: direct acf incorrect")
+        npt.assert_allclose(pyACA.ToolAcf(x_b, 150), r_ref[:, :151], rtol=1e-10, atol=1e-13, err_msg="ACF 3: maximum lag incorrect")
+        npt.assert_array_equal(pyACA.ToolAcf(x_b)[1, 100:], 0, err_msg="ACF 4: lags beyond the support not zero")
+        npt.assert_allclose(pyACA.ToolAcf(x_b, bNormalize=False)[0, 0], np.dot(x_b[0], x_b[0]), rtol=1e-12, err_msg="ACF 5: energy incorrect")
+        self.assertEqual(pyACA.ToolAcf(np.stack([x_b, x_b])).shape, (2, 5, 300), "ACF 6: dimensions incorrect")
+
+        # maximum after the main lobe of a periodic block at its period
+        x_b = np.sin(2 * np.pi * np.arange(0, 400) / 50)[np.newaxis, :]
+        [afMax, aiLag, bValid] = pyACA.ToolAcfMaxima(np.concatenate((x_b, np.zeros([1, 400]))), 0, 0.35)
+        self.assertEqual(aiLag[0], 50, "ACF 7: lag of maximum incorrect")
+        npt.assert_array_equal(bValid, [True, False], err_msg="ACF 8: valid blocks incorrect")
+        self.assertEqual(afMax[1], 0, "ACF 9: maximum of zero block incorrect")
+
+    def test_peakmask(self):
+        from scipy.signal import find_peaks
+
+        # integer data contains many plateaus, also at the borders
+        rng = np.random.default_rng(7)
+        X = rng.integers(0, 4, [25, 400]).astype(float)
+
+        for fMinHeight in [None, 2]:
+            bPeaks = pyACA.ToolPeakMask(X, fMinHeight)
+            for n in range(0, X.shape[1]):
+                npt.assert_array_equal(np.flatnonzero(bPeaks[:, n]), find_peaks(X[:, n], height=fMinHeight)[0], err_msg="PK 1: peaks incorrect")
+
+        npt.assert_array_equal(pyACA.ToolPeakMask(X[:, 3], 2), bPeaks[:, 3], err_msg="PK 2: vector input incorrect")
+        npt.assert_array_equal(np.flatnonzero(pyACA.ToolPeakMask(np.array([0, 1, 1, 1, 1, 0, 2, 2, 3]))), [2], err_msg="PK 3: plateau incorrect")
+        self.assertFalse(pyACA.ToolPeakMask(np.array([1, 0])).any(), "PK 4: short input incorrect")
+
+        # the tonal power ratio sums the power of the peaks above the threshold
+        X = np.abs(rng.standard_normal([129, 20]))
+        X[:, 0] = 0
+        vtpr = pyACA.FeatureSpectralTonalPowerRatio(X, 44100)
+        afRef = [(X[find_peaks(X[:, n]**2, height=5e-4)[0], n]**2).sum() / (X[:, n]**2).sum() for n in range(1, 20)]
+        npt.assert_allclose(vtpr[1:], afRef, rtol=1e-12, err_msg="PK 5: tonal power ratio incorrect")
+        self.assertEqual(vtpr[0], 0, "PK 6: zero spectrum incorrect")
+
+    def test_feature_summary(self):
+        rng = np.random.default_rng(8)
+        V = np.vstack([50 * rng.standard_normal(5001), np.exp(rng.standard_normal(5001)), np.zeros(5001)])
+        V[2, ::7] = 3
+
+        # chunk by chunk
+        summary = pyACA.ToolFeatureSummary()
+        for v in np.array_split(V, 7, axis=1):
+            summary.update(v)
+        result = summary.getSummary()
+
+        npt.assert_allclose(result["mean"], V.mean(axis=1), rtol=1e-12, atol=1e-12, err_msg="FSU 1: mean incorrect")
+        npt.assert_allclose(result["std"], V.std(axis=1), rtol=1e-12, atol=1e-12, err_msg="FSU 2: std incorrect")
+        npt.assert_array_equal(result["min"], V.min(axis=1), err_msg="FSU 3: min incorrect")
+        npt.assert_array_equal(result["max"], V.max(axis=1), err_msg="FSU 4: max incorrect")
+        npt.assert_allclose(result["delta_mean"], np.diff(V, axis=1).mean(axis=1), rtol=1e-12, atol=1e-12, err_msg="FSU 5: delta mean incorrect")
+        npt.assert_allclose(result["delta_std"], np.diff(V, axis=1).std(axis=1), rtol=1e-12, atol=1e-12, err_msg="FSU 6: delta std incorrect")
+
+        # the quantiles are within the relative accuracy of the sketch
+        Q = np.quantile(V, [0.1, 0.5, 0.9], axis=1, method="lower").T
+        npt.assert_allclose(result["quantiles"], Q, rtol=0.01, err_msg="FSU 7: quantiles incorrect")
+
+        # merging the summaries of consecutive parts equals the summary of the whole
+        merged = pyACA.ToolFeatureSummary()
+        for v in np.array_split(V, 3, axis=1):
+            part = pyACA.ToolFeatureSummary()
+            part.update(v)
+            merged.merge(part)
+        for cKey in ["mean", "std", "min", "max", "quantiles", "delta_mean", "delta_std"]:
+            npt.assert_allclose(merged.getSummary()[cKey], result[cKey], rtol=1e-12, atol=1e-12, err_msg="FSU 8: merged " + cKey + " incorrect")
+
+        self.assertEqual(summary.getFeatureVector().shape, (3 * 9,), "FSU 9: feature vector dimension incorrect")
+        self.assertEqual(pyACA.ToolFeatureSummary().getSummary()["iNumFrames"], 0, "FSU 10: empty summary incorrect")
+
+        # summary of a feature stream without storing the frames
+        f_s = 8000
+        x = np.sin(2 * np.pi * 440 * np.arange(0, f_s) / f_s) + 0.1 * rng.standard_normal(f_s)
+        x = x / np.max(np.abs(x))
+        [v, t] = pyACA.computeFeature("TimeRms", x, f_s, None, 512, 256)
+        summary = pyACA.ToolFeatureSummary()
+        for v_s, t_s in pyACA.StreamingFeatures(["TimeRms"], f_s, None, 512, 256).process(np.array_split(x, 10)):
+            summary.update(v_s["TimeRms"])
+        npt.assert_allclose(summary.getSummary()["mean"], v.mean(axis=1), rtol=1e-10, err_msg="FSU 11: stream summary incorrect")
+
+        # frames with non-finite values are dropped
+        summary = pyACA.ToolFeatureSummary()
+        summary.update([1, np.nan, np.nan, np.nan])
+        npt.assert_allclose(summary.getQuantiles(), [[1, 1, 1]], rtol=0.01, err_msg="FSU 12: quantiles with NaN incorrect")
+        summary = pyACA.ToolFeatureSummary()
+        summary.update([1, 2, np.inf])
+        result = summary.getSummary()
+        npt.assert_allclose(summary.getQuantiles([0, 1]), [[1, 2]], rtol=0.01, err_msg="FSU 13: quantiles with inf incorrect")
+        self.assertEqual((result["mean"][0], result["max"][0], result["iNumFrames"], result["iNumDropped"]), (1.5, 2, 2, 1), "FSU 14: summary with inf incorrect")
+
+        # merging another file does not add a delta at the boundary
+        first = pyACA.ToolFeatureSummary()
+        first.update([0, 0, 0])
+        second = pyACA.ToolFeatureSummary()
+        second.update([5, 5])
+        first.merge(second, bConsecutive=False)
+        npt.assert_array_equal(first.getSummary()["delta_std"], [0], err_msg="FSU 15: delta of merged file incorrect")
+        self.assertEqual(first.iNumDeltas, 3, "FSU 16: number of deltas of merged file incorrect")
+
+        # the stream continues after the last frame of its own, not of the merged file
+        first.update([0])
+        npt.assert_array_equal(first.getSummary()["delta_std"], [0], err_msg="FSU 17: delta after merged file incorrect")
+        self.assertEqual(first.iNumDeltas, 4, "FSU 18: number of deltas after merged file incorrect")